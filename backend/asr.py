@@ -0,0 +1,168 @@
+import os
+import re
+from functools import lru_cache
+
+from audio_source import AudioSource
+from logs import get_logger
+
+logger = get_logger("asr")
+
+# Preset name or "<runtime>:<model>[:<compute type>]", e.g. "faster-whisper:base:int8"
+ASR_BACKEND_ENV = "ASR_BACKEND"
+DEFAULT_PRESET = "small"
+ASR_SAMPLE_RATE = 16000
+
+# name -> (runtime, model id, compute type)
+ASR_PRESETS = {
+    # Hugging Face pipeline, full precision (the original transcribe_audio setup is "small")
+    'small': ('hf', 'openai/whisper-small', None),
+    'base': ('hf', 'openai/whisper-base', None),
+    'tiny': ('hf', 'openai/whisper-tiny', None),
+    'distil-small.en': ('hf', 'distil-whisper/distil-small.en', None),
+    # Hugging Face pipeline with int8 dynamic quantization of the Linear layers (CPU)
+    'small-int8': ('hf-int8', 'openai/whisper-small', None),
+    'base-int8': ('hf-int8', 'openai/whisper-base', None),
+    # CTranslate2 runtime through faster-whisper
+    'ct2-small-int8': ('faster-whisper', 'small', 'int8'),
+    'ct2-base-int8': ('faster-whisper', 'base', 'int8'),
+    'ct2-tiny-int8': ('faster-whisper', 'tiny', 'int8'),
+}
+
+
+def resolve_preset(preset=None):
+    """
+    Resolve an ASR preset name (or explicit "runtime:model[:compute]" spec).
+
+    Args:
+        preset (str): Preset name; defaults to ASR_BACKEND or 'small'
+
+    Returns:
+        spec (tuple): (runtime, model id, compute type)
+    """
+    preset = preset or os.environ.get(ASR_BACKEND_ENV, DEFAULT_PRESET)
+    if preset in ASR_PRESETS:
+        return ASR_PRESETS[preset]
+    parts = preset.split(":")
+    if len(parts) in (2, 3) and parts[0] in ('hf', 'hf-int8', 'faster-whisper'):
+        return parts[0], parts[1], parts[2] if len(parts) == 3 else None
+    raise ValueError(f"Unknown ASR preset '{preset}', expected one of {sorted(ASR_PRESETS)} "
+                     f"or 'hf|hf-int8|faster-whisper:<model>[:<compute type>]'")
+
+
+def _hf_transcriber(model_id, quantize):
+    from transformers import pipeline
+
+    if not quantize:
+        asr = pipeline("automatic-speech-recognition", model=model_id, chunk_length_s=30)
+    else:
+        import torch
+        from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor
+
+        processor = AutoProcessor.from_pretrained(model_id)
+        model = AutoModelForSpeechSeq2Seq.from_pretrained(model_id).eval()
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        asr = pipeline("automatic-speech-recognition", model=model, tokenizer=processor.tokenizer,
+                       feature_extractor=processor.feature_extractor, chunk_length_s=30, device=-1)
+
+    def transcribe(audio):
+        return asr({"raw": audio, "sampling_rate": ASR_SAMPLE_RATE})["text"]
+    return transcribe
+
+
+def _ct2_transcriber(model_size, compute_type):
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(model_size, device="cpu", compute_type=compute_type or "int8")
+
+    def transcribe(audio):
+        segments, _ = model.transcribe(audio, beam_size=1)
+        return "".join(segment.text for segment in segments)
+    return transcribe
+
+
+def load_asr(preset=None):
+    """
+    Load (once per resolved model) a transcriber taking a 16 kHz float32 array.
+
+    The preset is resolved on every call, so a changed ASR_BACKEND takes
+    effect; presets resolving to the same spec share one loaded model.
+
+    Args:
+        preset (str): See resolve_preset
+
+    Returns:
+        transcribe (callable): audio (np.array at 16 kHz) -> text
+    """
+    return _load_asr(*resolve_preset(preset))
+
+
+@lru_cache(maxsize=None)
+def _load_asr(runtime, model_id, compute_type):
+    logger.info("🗣️ Loading ASR model %s (%s%s)", model_id, runtime, f", {compute_type}" if compute_type else "")
+    if runtime == 'faster-whisper':
+        return _ct2_transcriber(model_id, compute_type)
+    return _hf_transcriber(model_id, quantize=runtime == 'hf-int8')
+
+
+def transcribe_audio(audio_path, preset=None):
+    """
+    Transcribe audio to text with the selected ASR backend.
+
+    Args:
+        audio_path (str or AudioSource): Audio file, or a shared AudioSource
+        preset (str): ASR preset; defaults to ASR_BACKEND or 'small'
+
+    Returns:
+        text (str): Transcript
+    """
+    source = audio_path if isinstance(audio_path, AudioSource) else AudioSource(audio_path)
+    return load_asr(preset)(source.at(ASR_SAMPLE_RATE)).strip()
+
+
+def normalize_transcript(text):
+    """Lowercase, drop punctuation and collapse whitespace for WER scoring."""
+    text = re.sub(r"[^a-z0-9'\s]", " ", text.lower())
+    return text.split()
+
+
+def word_errors(reference, hypothesis):
+    """
+    Word-level edit distance between normalized transcripts.
+
+    Args:
+        reference (str): Reference transcript
+        hypothesis (str): ASR output
+
+    Returns:
+        errors (int): Substitutions + deletions + insertions
+        ref_words (int): Words in the normalized reference
+    """
+    ref = normalize_transcript(reference)
+    hyp = normalize_transcript(hypothesis)
+
+    # Single-row Levenshtein over words
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word error rate (substitutions + deletions + insertions) / reference words.
+
+    Args:
+        reference (str): Reference transcript
+        hypothesis (str): ASR output
+
+    Returns:
+        wer (float): Word error rate (0.0 is perfect; can exceed 1.0)
+    """
+    errors, ref_words = word_errors(reference, hypothesis)
+    if not ref_words:
+        return float(errors > 0)
+    return errors / ref_words
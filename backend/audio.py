@@ -1,13 +1,18 @@
-import librosa
-import librosa.display
-import noisereduce as nr
 import numpy as np
-import soundfile as sf
-from pydub import AudioSegment
-import matplotlib.pyplot as plt
-from scipy import signal
 import os
 import json
+import logging
+from audio_source import AudioSource
+from logs import configure_logging, env_verbose, get_logger
+from profiling import StageProfiler, activate, profiled_stage
+from results import PreprocessResult
+from risk_rules import default_rules
+from vad import detect_speech
+from parallel_features import PYIN_PARAMS, parallel_denoise, parallel_pyin, split_points
+from prosody import segment_prosody
+from waveform import FIGSIZE, draw_audio_with_segments, render_audio_with_segments
+
+logger = get_logger("audio")
 
 class AudioPreprocessor:
     """
@@ -15,55 +20,79 @@ class AudioPreprocessor:
     Preserves gaps/silences for sentiment and behavioral analysis with pitch extraction.
     """
     
-    def __init__(self, target_sr=16000, min_silence_duration=0.5):
+    def __init__(self, target_sr=16000, min_silence_duration=0.5, profile=True, trace_memory=False, timing_sink=None, risk_rules=None,
+                 vad='top_db', parallel_workers=None, parallel_min_duration=120.0):
         """
         Initialize the preprocessor.
         
         Args:
             target_sr (int): Target sample rate (16000Hz or 22050Hz recommended for speech)
             min_silence_duration (float): Minimum silence duration in seconds to consider as meaningful gap
+            profile (bool): Record per-stage timings into result['timings']
+            trace_memory (bool): Also record per-stage peak memory (tracemalloc); off by
+                default because tracing slows the pipeline by well over a third
+            timing_sink: Optional sink (JsonLinesSink, PrometheusTextSink) receiving the timings of each run
+            risk_rules (RiskRuleSet): Compiled risk rules; defaults to the shared default_rules()
+            vad (str): Silence detection: 'top_db' (librosa.effects.split, fixed threshold
+                below the peak; the risk thresholds are calibrated on it) or 'adaptive'
+                (percentile noise floor with hysteresis, see vad.py; not yet validated on
+                real recordings)
+            parallel_workers (int): Denoise and pyin a long recording in this many processes
+                (pyin chunks are split at long pauses, see parallel_features.py); None runs in-process
+            parallel_min_duration (float): Recordings shorter than this (seconds) always run in-process
         """
         self.target_sr = target_sr
         self.min_silence_duration = min_silence_duration
-        
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.timing_sink = timing_sink
+        self.risk_rules = risk_rules if risk_rules is not None else default_rules()
+        self.vad = vad
+        self.parallel_workers = parallel_workers
+        self.parallel_min_duration = parallel_min_duration
+        
+    @profiled_stage('load')
     def load_audio(self, file_path):
         """
         Load audio file (MP3 or WAV) and convert to standardized format.
         
+        The file is decoded once through an AudioSource; passing the same
+        AudioSource to several preprocessors (or to pitch/ASR code) reuses the
+        decoded signal and any resampled view already produced for this rate.
+        
         Args:
-            file_path (str): Path to audio file
+            file_path (str or AudioSource): Path to audio file, or a shared AudioSource
             
         Returns:
             audio (np.array): Audio time series
             sr (int): Sample rate
         """
         try:
-            # Check file extension
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            if file_ext == '.mp3':
-                # For MP3 files, use pydub for better compatibility
-                audio = AudioSegment.from_mp3(file_path)
-                audio = audio.set_channels(1)  # Convert to mono
-                audio = audio.set_frame_rate(self.target_sr)  # Resample
+            source = file_path if isinstance(file_path, AudioSource) else AudioSource(file_path)
+            audio_data = source.at(self.target_sr)
+            sr = self.target_sr
                 
-                # Export to temporary WAV and load with librosa
-                temp_path = "temp_audio.wav"
-                audio.export(temp_path, format="wav")
-                audio_data, sr = librosa.load(temp_path, sr=self.target_sr)
-                os.remove(temp_path)  # Clean up temp file
-                
-            else:  # WAV and other formats
-                audio_data, sr = librosa.load(file_path, sr=self.target_sr, mono=True)
-                
-            print(f"✅ Loaded audio: {file_path}")
-            print(f"   Duration: {len(audio_data)/sr:.2f}s, Sample rate: {sr}Hz")
+            logger.info("✅ Loaded audio: %s (duration: %.2fs, sample rate: %dHz)",
+                        file_path, len(audio_data) / sr, sr,
+                        extra={'stage': 'load', 'duration': len(audio_data) / sr, 'sample_rate': sr})
             return audio_data, sr
             
         except Exception as e:
-            print(f"❌ Error loading audio file: {e}")
+            logger.error("❌ Error loading audio file: %s", e, extra={'stage': 'load'})
             return None, None
     
+    def _run_parallel(self, audio, sr):
+        """Whether denoise and pyin should be spread over parallel_workers processes."""
+        return bool(self.parallel_workers) and self.parallel_workers > 1 and len(audio) / sr >= self.parallel_min_duration
+
+    def _parallel_bounds(self, audio, sr, segments):
+        """pyin chunk boundaries at long pauses, or None when pyin runs in-process."""
+        if not segments or not self._run_parallel(audio, sr):
+            return None
+        bounds = split_points(segments, len(audio), self.parallel_workers, sr)
+        return bounds if len(bounds) > 2 else None
+
+    @profiled_stage('denoise')
     def remove_background_noise(self, audio, sr, method='nonstationary'):
         """
         Remove background noise from audio while preserving speech gaps.
@@ -77,6 +106,15 @@ class AudioPreprocessor:
             cleaned_audio (np.array): Denoised audio with preserved gaps
         """
         try:
+            import noisereduce as nr
+
+            if self._run_parallel(audio, sr):
+                # Same blocks as noisereduce's own chunking, so the result is identical
+                cleaned_audio = parallel_denoise(audio, sr, self.parallel_workers, method)
+                logger.info("✅ Noise reduction applied (%s method, %d processes)", method, self.parallel_workers,
+                            extra={'stage': 'denoise'})
+                return cleaned_audio
+
             if method == 'stationary':
                 # Requires a noise sample (use a segment with only background noise)
                 noise_duration = min(int(0.5 * sr), len(audio) // 3)
@@ -86,22 +124,28 @@ class AudioPreprocessor:
                 # Non-stationary noise reduction - preserves silence/gap structure
                 cleaned_audio = nr.reduce_noise(y=audio, sr=sr, stationary=False)
             
-            print(f"✅ Noise reduction applied ({method} method)")
+            logger.info("✅ Noise reduction applied (%s method)", method, extra={'stage': 'denoise'})
             return cleaned_audio
             
         except Exception as e:
-            print(f"❌ Error in noise reduction: {e}")
+            logger.error("❌ Error in noise reduction: %s", e, extra={'stage': 'denoise'})
             return audio
     
-    def analyze_silence_patterns(self, audio, sr, top_db=25):
+    @profiled_stage('silence')
+    def analyze_silence_patterns(self, audio, sr, top_db=25, vad=None, min_silence_duration=None):
         """
         Analyze silence patterns without removing them.
         Returns timestamps and durations of speech and silence segments.
         
+        With the adaptive detector, pauses shorter than
+        min_silence_duration are treated as part of the surrounding speech.
+        
         Args:
             audio (np.array): Input audio signal
             sr (int): Sample rate
-            top_db (int): Threshold in dB below reference for silence
+            top_db (int): Threshold in dB below reference for silence (vad='top_db' only)
+            vad (str): Overrides the instance's vad setting
+            min_silence_duration (float): Overrides the instance's min_silence_duration
             
         Returns:
             segments (list): List of segments with type and timing information
@@ -109,9 +153,20 @@ class AudioPreprocessor:
         """
         try:
             # Find non-silent intervals (speech segments)
-            non_silent_intervals = librosa.effects.split(
-                audio, top_db=top_db, frame_length=1024, hop_length=256
-            )
+            vad = vad or self.vad
+            if min_silence_duration is None:
+                min_silence_duration = self.min_silence_duration
+            if vad == 'top_db':
+                import librosa
+
+                non_silent_intervals = librosa.effects.split(
+                    audio, top_db=top_db, frame_length=1024, hop_length=256
+                )
+            else:
+                non_silent_intervals = detect_speech(
+                    audio, sr, frame_length=1024, hop_length=256,
+                    min_silence_duration=min_silence_duration
+                )
             
             segments = []
             silence_durations = []
@@ -160,14 +215,16 @@ class AudioPreprocessor:
                 'longest_speech': max(speech_durations) if speech_durations else 0
             }
             
-            print(f"✅ Silence pattern analysis complete")
-            print(f"   Speech segments: {len(speech_durations)}, Silence segments: {len(silence_durations)}")
-            print(f"   Total speech: {silence_stats['total_speech_time']:.2f}s, Total silence: {silence_stats['total_silence_time']:.2f}s")
+            logger.info("✅ Silence pattern analysis complete: %d speech / %d silence segments, "
+                        "%.2fs speech, %.2fs silence",
+                        len(speech_durations), len(silence_durations),
+                        silence_stats['total_speech_time'], silence_stats['total_silence_time'],
+                        extra={'stage': 'silence'})
             
             return segments, silence_stats
             
         except Exception as e:
-            print(f"❌ Error in silence pattern analysis: {e}")
+            logger.error("❌ Error in silence pattern analysis: %s", e, extra={'stage': 'silence'})
             return [], {}
     
     def clean_audio_preserving_gaps(self, audio, sr):
@@ -196,13 +253,14 @@ class AudioPreprocessor:
             # Normalize the audio
             normalized_audio = self.normalize_audio(filtered_audio)
             
-            print("✅ Audio cleaned while preserving gap structure")
+            logger.info("✅ Audio cleaned while preserving gap structure")
             return normalized_audio, segments, silence_stats
             
         except Exception as e:
-            print(f"❌ Error in gap-preserving cleaning: {e}")
+            logger.error("❌ Error in gap-preserving cleaning: %s", e)
             return audio, [], {}
     
+    @profiled_stage('normalize')
     def normalize_audio(self, audio, method='peak'):
         """
         Normalize audio amplitude.
@@ -229,13 +287,14 @@ class AudioPreprocessor:
                 else:
                     normalized_audio = audio
             
-            print(f"✅ Audio normalized ({method} method)")
+            logger.info("✅ Audio normalized (%s method)", method, extra={'stage': 'normalize'})
             return normalized_audio
             
         except Exception as e:
-            print(f"❌ Error in audio normalization: {e}")
+            logger.error("❌ Error in audio normalization: %s", e, extra={'stage': 'normalize'})
             return audio
     
+    @profiled_stage('bandpass')
     def apply_bandpass_filter(self, audio, sr, lowcut=80, highcut=4000):
         """
         Apply bandpass filter to focus on human speech frequencies.
@@ -250,6 +309,8 @@ class AudioPreprocessor:
             filtered_audio (np.array): Bandpass filtered audio
         """
         try:
+            from scipy import signal
+
             # Design bandpass filter
             nyquist = 0.5 * sr
             low = lowcut / nyquist
@@ -259,97 +320,131 @@ class AudioPreprocessor:
             b, a = signal.butter(4, [low, high], btype='band')
             filtered_audio = signal.filtfilt(b, a, audio)
             
-            print(f"✅ Bandpass filter applied ({lowcut}-{highcut}Hz)")
+            logger.info("✅ Bandpass filter applied (%s-%sHz)", lowcut, highcut, extra={'stage': 'bandpass'})
             return filtered_audio
             
         except Exception as e:
-            print(f"❌ Error in bandpass filtering: {e}")
+            logger.error("❌ Error in bandpass filtering: %s", e, extra={'stage': 'bandpass'})
             return audio
     
-    def extract_pitch_features(self, audio, sr):
+    @profiled_stage('pyin')
+    def pitch_track(self, audio, sr, segments=None, fmin=PYIN_PARAMS['fmin'], fmax=PYIN_PARAMS['fmax']):
         """
-        Extract comprehensive pitch features for depression detection.
+        Fundamental frequency per pyin frame.
         
         Args:
             audio (np.array): Audio signal
             sr (int): Sample rate
+            segments (list): Silence analysis of `audio`; enables the parallel mode (parallel_workers)
+            fmin (float): Lowest f0 searched (default 75 Hz: typical adult speech range)
+            fmax (float): Highest f0 searched (default 300 Hz)
             
         Returns:
-            pitch_features (dict): Dictionary of pitch metrics
+            f0 (np.array): f0 per frame, 0 where unvoiced (empty on error)
         """
         try:
-            # Extract fundamental frequency
-            f0, voiced_flag, voiced_probs = librosa.pyin(
-                audio, 
-                fmin=75, 
-                fmax=300,  # Typical adult speech range
-                frame_length=2048,
-                hop_length=512,
-                fill_na=0.0  # Fill unvoiced segments with 0
-            )
+            bounds = self._parallel_bounds(audio, sr, segments)
+            if bounds is not None:
+                # Chunks are merged onto the single-pass frame grid, so the statistics
+                # below are computed over the whole recording as before
+                f0 = parallel_pyin(audio, sr, bounds, self.parallel_workers, params={'fmin': fmin, 'fmax': fmax})
+            else:
+                import librosa
+
+                f0, voiced_flag, voiced_probs = librosa.pyin(audio, **{**PYIN_PARAMS, 'fmin': fmin, 'fmax': fmax})
+            return f0
             
-            # Get voiced segments only (remove zeros/unvoiced)
-            voiced_mask = (f0 > 0) & (~np.isnan(f0))
-            f0_voiced = f0[voiced_mask]
-            
-            if len(f0_voiced) < 2:
-                print("⚠️ Insufficient voiced segments for pitch analysis")
-                return {}
-            
-            # Calculate pitch features
-            pitch_features = {
-                # Basic statistics
-                'f0_mean': float(np.mean(f0_voiced)),
-                'f0_std': float(np.std(f0_voiced)),
-                'f0_median': float(np.median(f0_voiced)),
-                'f0_range': float(np.ptp(f0_voiced)),
-                
-                # Variability measures (crucial for depression)
-                'f0_coeff_variation': float(np.std(f0_voiced) / np.mean(f0_voiced)) if np.mean(f0_voiced) > 0 else 0,
-                'f0_iqr': float(np.percentile(f0_voiced, 75) - np.percentile(f0_voiced, 25)),
-                
-                # Dynamic features
-                'f0_slope_mean': float(np.mean(np.abs(np.diff(f0_voiced)))),
-                'f0_slope_std': float(np.std(np.diff(f0_voiced))),
-                
-                # Voicing characteristics
-                'voiced_ratio': float(np.sum(voiced_mask) / len(voiced_mask)),
-                'voiced_frames': int(np.sum(voiced_mask)),
-                
-                # Extreme values
-                'f0_max': float(np.max(f0_voiced)),
-                'f0_min': float(np.min(f0_voiced)),
-                
-                # Percentiles
-                'f0_q1': float(np.percentile(f0_voiced, 25)),
-                'f0_q3': float(np.percentile(f0_voiced, 75)),
-                'f0_q90': float(np.percentile(f0_voiced, 90)),
-                
-                # Depression-specific metrics
-                'pitch_monotony_index': float(1 - (np.std(f0_voiced) / np.mean(f0_voiced))) if np.mean(f0_voiced) > 0 else 1.0,
-                'pitch_dynamic_range': float((np.max(f0_voiced) - np.min(f0_voiced)) / np.mean(f0_voiced)) if np.mean(f0_voiced) > 0 else 0,
-            }
+        except Exception as e:
+            logger.error("❌ Error in pitch extraction: %s", e, extra={'stage': 'pyin'})
+            return np.zeros(0)
+    
+    def extract_pitch_features(self, audio, sr, segments=None, f0=None):
+        """
+        Extract comprehensive pitch features for depression detection.
+        
+        Args:
+            audio (np.array): Audio signal
+            sr (int): Sample rate
+            segments (list): Silence analysis of `audio` (see pitch_track)
+            f0 (np.array): pitch_track output, if already computed
             
-            print("✅ Pitch features extracted successfully")
-            return pitch_features
+        Returns:
+            pitch_features (dict): Dictionary of pitch metrics
+        """
+        if f0 is None:
+            f0 = self.pitch_track(audio, sr, segments=segments)
+        return self.pitch_features_from_f0(f0)
+    
+    def pitch_features_from_f0(self, f0):
+        """
+        Pitch statistics of an f0 track (one value per pyin frame, 0 when unvoiced).
+        
+        Args:
+            f0 (np.array): Fundamental frequency per frame
             
-        except Exception as e:
-            print(f"❌ Error in pitch extraction: {e}")
+        Returns:
+            pitch_features (dict): Dictionary of pitch metrics (empty if too little is voiced)
+        """
+        # Get voiced segments only (remove zeros/unvoiced)
+        voiced_mask = (f0 > 0) & (~np.isnan(f0))
+        f0_voiced = f0[voiced_mask]
+        
+        if len(f0_voiced) < 2:
+            logger.warning("⚠️ Insufficient voiced segments for pitch analysis", extra={'stage': 'pyin'})
             return {}
+        
+        # Calculate pitch features
+        pitch_features = {
+            # Basic statistics
+            'f0_mean': float(np.mean(f0_voiced)),
+            'f0_std': float(np.std(f0_voiced)),
+            'f0_median': float(np.median(f0_voiced)),
+            'f0_range': float(np.ptp(f0_voiced)),
+            
+            # Variability measures (crucial for depression)
+            'f0_coeff_variation': float(np.std(f0_voiced) / np.mean(f0_voiced)) if np.mean(f0_voiced) > 0 else 0,
+            'f0_iqr': float(np.percentile(f0_voiced, 75) - np.percentile(f0_voiced, 25)),
+            
+            # Dynamic features
+            'f0_slope_mean': float(np.mean(np.abs(np.diff(f0_voiced)))),
+            'f0_slope_std': float(np.std(np.diff(f0_voiced))),
+            
+            # Voicing characteristics
+            'voiced_ratio': float(np.sum(voiced_mask) / len(voiced_mask)),
+            'voiced_frames': int(np.sum(voiced_mask)),
+            
+            # Extreme values
+            'f0_max': float(np.max(f0_voiced)),
+            'f0_min': float(np.min(f0_voiced)),
+            
+            # Percentiles
+            'f0_q1': float(np.percentile(f0_voiced, 25)),
+            'f0_q3': float(np.percentile(f0_voiced, 75)),
+            'f0_q90': float(np.percentile(f0_voiced, 90)),
+            
+            # Depression-specific metrics
+            'pitch_monotony_index': float(1 - (np.std(f0_voiced) / np.mean(f0_voiced))) if np.mean(f0_voiced) > 0 else 1.0,
+            'pitch_dynamic_range': float((np.max(f0_voiced) - np.min(f0_voiced)) / np.mean(f0_voiced)) if np.mean(f0_voiced) > 0 else 0,
+        }
+        
+        logger.info("✅ Pitch features extracted successfully", extra={'stage': 'pyin'})
+        return pitch_features
     
-    def extract_all_acoustic_features(self, audio, sr):
+    def extract_all_acoustic_features(self, audio, sr, segments=None, f0=None):
         """
         Extract comprehensive acoustic features including pitch, jitter, shimmer, etc.
         
         Args:
             audio (np.array): Audio signal
             sr (int): Sample rate
+            segments (list): Silence analysis of `audio` (see pitch_track)
+            f0 (np.array): pitch_track output, if already computed
             
         Returns:
             acoustic_features (dict): Combined acoustic features
         """
         # Pitch features
-        pitch_features = self.extract_pitch_features(audio, sr)
+        pitch_features = self.extract_pitch_features(audio, sr, segments=segments, f0=f0)
         
         # Additional acoustic features (placeholders for now)
         acoustic_features = {
@@ -363,92 +458,64 @@ class AudioPreprocessor:
         
         return acoustic_features
     
+    @profiled_stage('prosody')
+    def extract_segment_prosody(self, audio, sr, segments, f0):
+        """
+        Per-segment pitch, energy and duration, to follow prosody within a session.
+        
+        Args:
+            audio (np.array): Audio signal
+            sr (int): Sample rate
+            segments (list): Segments from analyze_silence_patterns
+            f0 (np.array): pitch_track output for `audio`
+            
+        Returns:
+            segment_prosody (dict): Column lists aligned with `segments` (see prosody.SegmentTable)
+        """
+        try:
+            table = segment_prosody(segments, f0, audio, sr, pyin_hop=PYIN_PARAMS['hop_length'])
+            logger.info("✅ Prosody computed for %d segments", len(table), extra={'stage': 'prosody'})
+            return table.to_dict()
+        except Exception as e:
+            logger.error("❌ Error in segment prosody: %s", e, extra={'stage': 'prosody'})
+            return {}
+    
+    @profiled_stage('risk')
     def analyze_depression_indicators(self, acoustic_features, silence_stats):
         """
         Analyze features specifically relevant to depression detection.
         
+        Thresholds come from the compiled rule set (risk_rules.json, or the
+        file named by RISK_RULES_PATH), so they can be tuned without code changes.
+        
         Args:
             acoustic_features (dict): Acoustic feature dictionary
             silence_stats (dict): Silence pattern statistics
+            
+        Returns:
+            assessment (dict): overall_risk, risk_factors, high_risk_count,
+                moderate_risk_count and the weighted risk_score
         """
-        print("\n🎯 DEPRESSION INDICATOR ANALYSIS:")
-        print("=" * 50)
-        
-        # Pitch-based indicators
-        f0_cv = acoustic_features.get('f0_coeff_variation', 0)
-        monotony_index = acoustic_features.get('pitch_monotony_index', 0)
-        voiced_ratio = acoustic_features.get('voiced_ratio', 0)
-        
-        print("\n📊 PITCH ANALYSIS:")
-        print(f"   Pitch variability (CV): {f0_cv:.3f}")
-        print(f"   Monotony index: {monotony_index:.3f}")
-        print(f"   Voiced ratio: {voiced_ratio:.3f}")
-        
-        risk_factors = []
-        
-        # Pitch risk assessment
-        if f0_cv < 0.15:
-            print("🔴 HIGH RISK: Very low pitch variability (monotone speech)")
-            risk_factors.append("monotone_speech")
-        elif f0_cv < 0.25:
-            print("🟡 MODERATE RISK: Reduced pitch variability")
-            risk_factors.append("reduced_pitch_variability")
-        else:
-            print("🟢 NORMAL: Good pitch variability")
-        
-        if monotony_index > 0.85:
-            print("🔴 HIGH RISK: High pitch monotony detected")
-            risk_factors.append("high_monotony")
-        
-        if voiced_ratio < 0.6:
-            print("🟡 MODERATE RISK: Low voiced speech ratio")
-            risk_factors.append("low_voiced_ratio")
-        
-        # Silence-based indicators
-        avg_pause_duration = silence_stats.get('average_silence_duration', 0)
-        speech_silence_ratio = silence_stats.get('speech_to_silence_ratio', 0)
-        
-        print("\n⏱️  SPEECH RHYTHM ANALYSIS:")
-        print(f"   Average pause duration: {avg_pause_duration:.2f}s")
-        print(f"   Speech-to-silence ratio: {speech_silence_ratio:.2f}")
-        
-        if avg_pause_duration > 1.5:
-            print("🔴 HIGH RISK: Long average pause duration (>1.5s)")
-            risk_factors.append("long_pauses")
-        elif avg_pause_duration > 1.0:
-            print("🟡 MODERATE RISK: Extended pause duration")
-            risk_factors.append("extended_pauses")
-        
-        if speech_silence_ratio < 1.5:
-            print("🔴 HIGH RISK: Very high proportion of silence")
-            risk_factors.append("high_silence_ratio")
-        elif speech_silence_ratio < 2.5:
-            print("🟡 MODERATE RISK: Elevated proportion of silence")
-            risk_factors.append("elevated_silence")
-        
-        # Overall risk assessment
-        print(f"\n📈 OVERALL RISK ASSESSMENT:")
-        high_risk_count = sum(1 for factor in risk_factors if "HIGH" in factor or factor in ["monotone_speech", "high_monotony", "long_pauses", "high_silence_ratio"])
-        moderate_risk_count = len(risk_factors) - high_risk_count
-        
-        if high_risk_count >= 2:
-            print("🔴🔴 HIGH DEPRESSION RISK: Multiple strong indicators detected")
-            overall_risk = "high"
-        elif high_risk_count >= 1 or moderate_risk_count >= 2:
-            print("🟡🟡 MODERATE DEPRESSION RISK: Several indicators present")
-            overall_risk = "moderate"
-        else:
-            print("🟢🟢 LOW DEPRESSION RISK: Few or mild indicators")
-            overall_risk = "low"
-        
-        return {
-            'overall_risk': overall_risk,
-            'risk_factors': risk_factors,
-            'high_risk_count': high_risk_count,
-            'moderate_risk_count': moderate_risk_count
-        }
+        assessment = self.risk_rules.evaluate(acoustic_features, silence_stats)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🎯 DEPRESSION INDICATOR ANALYSIS:")
+            logger.debug("📊 PITCH ANALYSIS: variability (CV) %.3f, monotony index %.3f, voiced ratio %.3f",
+                         acoustic_features.get('f0_coeff_variation', 0),
+                         acoustic_features.get('pitch_monotony_index', 0),
+                         acoustic_features.get('voiced_ratio', 0))
+            logger.debug("⏱️  SPEECH RHYTHM ANALYSIS: average pause %.2fs, speech-to-silence ratio %.2f",
+                         silence_stats.get('average_silence_duration', 0),
+                         silence_stats.get('speech_to_silence_ratio', 0))
+            for factor in assessment['risk_factors']:
+                logger.debug(self.risk_rules.message(factor))
+            logger.debug("📈 OVERALL RISK ASSESSMENT: %s (%d high, %d moderate indicators)",
+                         assessment['overall_risk'].upper(), assessment['high_risk_count'],
+                         assessment['moderate_risk_count'])
+        
+        return assessment
     
-    def preprocess_audio(self, file_path, preserve_gaps=True, extract_features=True, steps=['load', 'denoise', 'normalize', 'filter']):
+    def preprocess_audio(self, file_path, preserve_gaps=True, extract_features=True, steps=['load', 'denoise', 'normalize', 'filter'], as_result=False):
         """
         Complete preprocessing pipeline for audio files with feature extraction.
         
@@ -457,14 +524,38 @@ class AudioPreprocessor:
             preserve_gaps (bool): Whether to preserve silence gaps for analysis
             extract_features (bool): Whether to extract acoustic features
             steps (list): List of preprocessing steps to apply
+            as_result (bool): Return a typed PreprocessResult instead of a dict
             
         Returns:
-            result (dict): Dictionary containing processed audio and metadata
+            result (dict): Dictionary containing processed audio, metadata and
+                per-stage `timings` (wall_time, cpu_time, peak_memory, calls);
+                a PreprocessResult when as_result is True
         """
-        print(f"🎯 Starting preprocessing pipeline for: {file_path}")
-        print(f"📝 Gap preservation: {'ENABLED' if preserve_gaps else 'DISABLED'}")
-        print(f"🔬 Feature extraction: {'ENABLED' if extract_features else 'DISABLED'}")
-        print("-" * 60)
+        result = self._preprocess_with_timings(file_path, preserve_gaps, extract_features, steps)
+        if as_result and result is not None:
+            return PreprocessResult.from_dict(result)
+        return result
+    
+    def _preprocess_with_timings(self, file_path, preserve_gaps, extract_features, steps):
+        """Run the pipeline under a fresh StageProfiler and attach its timings."""
+        if not self.profile:
+            return self._run_pipeline(file_path, preserve_gaps, extract_features, steps)
+        
+        # The profiler lives in the calling context, not on the instance, so
+        # threads sharing this preprocessor keep separate timings
+        with activate(StageProfiler(trace_memory=self.trace_memory)) as profiler:
+            with profiler.stage('total'):
+                result = self._run_pipeline(file_path, preserve_gaps, extract_features, steps)
+        if result is not None:
+            result['timings'] = profiler.timings
+        profiler.emit(self.timing_sink, {'file': os.path.basename(str(file_path))})
+        return result
+    
+    def _run_pipeline(self, file_path, preserve_gaps, extract_features, steps):
+        """Run the preprocessing stages; see preprocess_audio."""
+        logger.info("🎯 Starting preprocessing pipeline for: %s (gap preservation: %s, feature extraction: %s)",
+                    file_path, 'ENABLED' if preserve_gaps else 'DISABLED',
+                    'ENABLED' if extract_features else 'DISABLED')
         
         result = {
             'original_audio': None,
@@ -473,11 +564,13 @@ class AudioPreprocessor:
             'segments': [],
             'silence_stats': {},
             'acoustic_features': {},
+            'segment_prosody': {},
             'depression_analysis': {},
             'processing_steps': [],
             'duration_original': 0,
             'duration_processed': 0,
-            'preserve_gaps': preserve_gaps
+            'preserve_gaps': preserve_gaps,
+            'timings': {}
         }
         
         try:
@@ -515,32 +608,34 @@ class AudioPreprocessor:
             
             # Step 3: Extract features if requested
             if extract_features:
-                acoustic_features = self.extract_all_acoustic_features(current_audio, sr)
+                f0 = self.pitch_track(current_audio, sr, segments=result['segments'])
+                acoustic_features = self.extract_all_acoustic_features(current_audio, sr, f0=f0)
                 result['acoustic_features'] = acoustic_features
+                if result['segments'] and len(f0):
+                    result['segment_prosody'] = self.extract_segment_prosody(current_audio, sr, result['segments'], f0)
                 
                 # Perform depression analysis
                 depression_analysis = self.analyze_depression_indicators(acoustic_features, result['silence_stats'])
                 result['depression_analysis'] = depression_analysis
             
-            print("-" * 60)
-            print(f"✅ Preprocessing completed!")
-            print(f"📊 Original duration: {result['duration_original']:.2f}s")
-            print(f"📊 Processed duration: {result['duration_processed']:.2f}s")
-            print(f"🔧 Steps applied: {', '.join(result['processing_steps'])}")
-            
-            if preserve_gaps:
-                print(f"🎯 Gap analysis: {len(result['segments'])} segments")
-                print(f"   Speech-to-Silence ratio: {result['silence_stats'].get('speech_to_silence_ratio', 0):.2f}")
-            
-            if extract_features:
-                print(f"🎵 Acoustic features: {len(result['acoustic_features'])} metrics extracted")
-                if 'depression_analysis' in result:
-                    print(f"📈 Depression risk: {result['depression_analysis'].get('overall_risk', 'unknown').upper()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Preprocessing completed! Original duration: %.2fs, processed duration: %.2fs, "
+                            "steps applied: %s",
+                            result['duration_original'], result['duration_processed'],
+                            ', '.join(result['processing_steps']))
+                if preserve_gaps:
+                    logger.info("🎯 Gap analysis: %d segments, speech-to-silence ratio: %.2f",
+                                len(result['segments']),
+                                result['silence_stats'].get('speech_to_silence_ratio', 0))
+                if extract_features:
+                    logger.info("🎵 Acoustic features: %d metrics extracted, depression risk: %s",
+                                len(result['acoustic_features']),
+                                result['depression_analysis'].get('overall_risk', 'unknown').upper())
             
             return result
             
         except Exception as e:
-            print(f"❌ Error in preprocessing pipeline: {e}")
+            logger.error("❌ Error in preprocessing pipeline: %s", e)
             return None
     
     def save_processed_audio(self, processed_audio, sr, output_path):
@@ -553,15 +648,19 @@ class AudioPreprocessor:
             output_path (str): Output file path
         """
         try:
+            import soundfile as sf
+
             sf.write(output_path, processed_audio, sr)
-            print(f"💾 Processed audio saved to: {output_path}")
+            logger.info("💾 Processed audio saved to: %s", output_path)
         except Exception as e:
-            print(f"❌ Error saving audio: {e}")
+            logger.error("❌ Error saving audio: %s", e)
     
     def visualize_audio_with_segments(self, original_audio, processed_audio, segments, sr, title="Audio Analysis"):
         """
         Visualize original vs processed audio with segment annotations.
         
+        Opens an interactive window; use render_audio_with_segments for image bytes.
+        
         Args:
             original_audio (np.array): Original audio signal
             processed_audio (np.array): Processed audio signal
@@ -569,45 +668,44 @@ class AudioPreprocessor:
             sr (int): Sample rate
             title (str): Plot title
         """
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
-        
-        # Plot original audio
-        times_orig = np.arange(len(original_audio)) / sr
-        ax1.plot(times_orig, original_audio, alpha=0.7, color='blue', label='Original')
-        ax1.set_title(f'{title} - Original Audio with Segment Analysis')
-        ax1.set_ylabel('Amplitude')
-        ax1.grid(True)
-        ax1.legend()
-        
-        # Plot processed audio with segment annotations
-        times_proc = np.arange(len(processed_audio)) / sr
-        ax2.plot(times_proc, processed_audio, alpha=0.7, color='orange', label='Processed')
-        
-        # Add segment annotations
-        speech_label_added = False
-        silence_label_added = False
-        
-        for segment in segments:
-            start_time = segment['start'] / sr
-            end_time = segment['end'] / sr
-            if segment['type'] == 'speech':
-                label = 'Speech' if not speech_label_added else ""
-                ax2.axvspan(start_time, end_time, alpha=0.3, color='green', label=label)
-                speech_label_added = True
-            else:
-                label = 'Silence' if not silence_label_added else ""
-                ax2.axvspan(start_time, end_time, alpha=0.3, color='red', label=label)
-                silence_label_added = True
-        
-        ax2.set_title('Processed Audio with Speech/Silence Segments')
-        ax2.set_xlabel('Time (s)')
-        ax2.set_ylabel('Amplitude')
-        ax2.grid(True)
-        ax2.legend()
+        # Plotting is optional; workers without matplotlib skip it
+        try:
+            import matplotlib.pyplot as plt
+        except ImportError:
+            logger.warning("⚠️ matplotlib not installed; skipping visualization")
+            return
         
-        plt.tight_layout()
+        fig = plt.figure(figsize=FIGSIZE)
+        draw_audio_with_segments(fig, original_audio, processed_audio, segments, sr, title)
         plt.show()
     
+    def render_audio_with_segments(self, original_audio, processed_audio, segments, sr, title="Audio Analysis", fmt='png'):
+        """
+        Render the segment visualization headlessly (Agg) for serving.
+        
+        Signals are decimated to a min/max envelope at the image width, so
+        rendering time doesn't depend on the recording length.
+        
+        Args:
+            original_audio (np.array): Original audio signal
+            processed_audio (np.array): Processed audio signal
+            segments (list): Segment information
+            sr (int): Sample rate
+            title (str): Plot title
+            fmt (str): 'png' or 'svg'
+            
+        Returns:
+            image (bytes): Encoded image, or None if rendering failed
+        """
+        try:
+            return render_audio_with_segments(original_audio, processed_audio, segments, sr, title, fmt=fmt)
+        except ImportError:
+            logger.warning("⚠️ matplotlib not installed; skipping visualization")
+            return None
+        except Exception as e:
+            logger.error("❌ Error rendering visualization: %s", e)
+            return None
+    
     def export_analysis_report(self, result, output_path="depression_analysis_report.json"):
         """
         Export comprehensive analysis results to JSON file.
@@ -627,19 +725,23 @@ class AudioPreprocessor:
                 'silence_analysis': result.get('silence_stats', {}),
                 'acoustic_features': result.get('acoustic_features', {}),
                 'depression_risk': result.get('depression_analysis', {}),
-                'processing_steps': result.get('processing_steps', [])
+                'processing_steps': result.get('processing_steps', []),
+                'timings': result.get('timings', {})
             }
             
             with open(output_path, 'w') as f:
                 json.dump(report, f, indent=2)
-            print(f"💾 Comprehensive analysis report exported to: {output_path}")
+            logger.info("💾 Comprehensive analysis report exported to: %s", output_path)
         except Exception as e:
-            print(f"❌ Error exporting analysis report: {e}")
+            logger.error("❌ Error exporting analysis report: %s", e)
 
 # Example usage and testing
 def main():
     """Example usage of the AudioPreprocessor class."""
     
+    # Interactive run: show the pipeline's progress output on the console
+    configure_logging(verbose=env_verbose(default=True))
+    
     # Initialize preprocessor
     preprocessor = AudioPreprocessor(target_sr=16000)
     
@@ -0,0 +1,131 @@
+import os
+import threading
+from math import gcd
+
+import numpy as np
+
+from logs import get_logger
+
+logger = get_logger("audio_source")
+
+
+class AudioSource:
+    """
+    An audio file decoded once at its native rate, with cached resampled views.
+
+    Every consumer in a request (AudioPreprocessor.load_audio, pitch analysis,
+    ASR) asks the same source for the rate it needs via `at(sr)`; the file is
+    decoded on first use and each target rate is produced once with a
+    polyphase resampler and then shared.
+    """
+
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): Path to an audio file (WAV, FLAC, OGG, MP3, ...)
+        """
+        self.path = os.fspath(file_path)
+        self._native = None
+        self._native_sr = None
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return self.path
+
+    def __repr__(self):
+        cached = sorted(self._views)
+        return f"AudioSource({self.path!r}, native_sr={self._native_sr}, cached={cached})"
+
+    def __fspath__(self):
+        return self.path
+
+    def _decode(self):
+        """Decode to mono float32 at the file's native sample rate."""
+        import soundfile as sf
+
+        try:
+            data, sr = sf.read(self.path, dtype='float32', always_2d=True)
+            return data.mean(axis=1, dtype=np.float32) if data.shape[1] > 1 else data[:, 0], sr
+        except Exception as e:
+            # Older libsndfile builds can't read MP3; pydub/ffmpeg decodes in memory instead
+            if os.path.splitext(self.path)[1].lower() != '.mp3':
+                raise
+            logger.debug("soundfile could not decode %s (%s); falling back to pydub", self.path, e)
+
+        from pydub import AudioSegment
+
+        segment = AudioSegment.from_file(self.path).set_channels(1)
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+        samples /= float(1 << (8 * segment.sample_width - 1))
+        return samples, segment.frame_rate
+
+    @property
+    def native_sr(self):
+        self._ensure_decoded()
+        return self._native_sr
+
+    @property
+    def duration(self):
+        """Duration in seconds."""
+        self._ensure_decoded()
+        return len(self._native) / self._native_sr
+
+    def _ensure_decoded(self):
+        if self._native is not None:
+            return
+        with self._lock:
+            if self._native is None:
+                audio, sr = self._decode()
+                self._native_sr = int(sr)
+                self._views[self._native_sr] = audio
+                self._native = audio
+                logger.debug("Decoded %s at native rate %dHz (%d samples)", self.path, sr, len(audio))
+
+    def at(self, sr=None):
+        """
+        Get the signal at a given sample rate (cached per rate).
+
+        The returned array is shared between callers; copy it before modifying in place.
+
+        Args:
+            sr (int): Target sample rate; None for the native rate
+
+        Returns:
+            audio (np.array): Mono float32 signal
+        """
+        self._ensure_decoded()
+        if sr is None:
+            return self._native
+
+        sr = int(sr)
+        view = self._views.get(sr)
+        if view is not None:
+            return view
+
+        with self._lock:
+            view = self._views.get(sr)
+            if view is None:
+                view = self._resample(self._native, self._native_sr, sr)
+                self._views[sr] = view
+        return view
+
+    @staticmethod
+    def _resample(audio, orig_sr, target_sr):
+        from scipy import signal
+
+        # Polyphase filtering by the reduced rational factor (e.g. 44.1k -> 16k = 160/441)
+        g = gcd(orig_sr, target_sr)
+        up, down = target_sr // g, orig_sr // g
+        return signal.resample_poly(audio, up, down).astype(np.float32, copy=False)
+
+    def release(self, keep=()):
+        """
+        Drop cached resampled views to free memory (the native signal is kept).
+
+        Args:
+            keep (iterable): Sample rates to keep cached
+        """
+        keep = {int(sr) for sr in keep} | {self._native_sr}
+        with self._lock:
+            self._views = {sr: v for sr, v in self._views.items() if sr in keep}
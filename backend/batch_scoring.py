@@ -0,0 +1,203 @@
+import numpy as np
+
+from risk_rules import default_rules
+
+
+def features_table(records, rules=None):
+    """
+    Build a columnar feature table from stored session results.
+
+    Args:
+        records (list): Dicts with 'acoustic_features' and 'silence_stats' sections
+            (preprocess_audio results or exported analysis reports)
+        rules (RiskRuleSet): Rule set defining the feature columns; defaults to default_rules()
+
+    Returns:
+        table (dict): {column: float64 array}; missing features are 0 and None/NaN values
+            NaN, like in the per-record scorer
+    """
+    rules = rules or default_rules()
+    n = len(records)
+    table = {}
+    for column, section in zip(rules.feature_names, rules.feature_sections):
+        values = np.zeros(n, dtype=np.float64)
+        for i, record in enumerate(records):
+            value = (record.get(section) or {}).get(column, 0)
+            values[i] = np.nan if value is None else value
+        table[column] = values
+    return table
+
+
+def _column(table, name, n):
+    if name not in table:
+        return np.zeros(n, dtype=np.float64)
+    column = table[name]
+    # pandas Series/DataFrame columns expose to_numpy; plain sequences go through asarray.
+    # Missing cells stay NaN: comparisons with NaN are False, so no rule fires on them,
+    # as in RiskRuleSet.evaluate for a None/NaN feature
+    if hasattr(column, 'to_numpy'):
+        return column.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(column, dtype=np.float64)
+
+
+def score_batch(table, rules=None):
+    """
+    Vectorized equivalent of AudioPreprocessor.analyze_depression_indicators.
+
+    Applies the same compiled rules as array masks over every row at once.
+
+    Args:
+        table: pandas DataFrame or dict of equal-length arrays with the rule
+            feature columns (f0_coeff_variation, pitch_monotony_index, voiced_ratio,
+            average_silence_duration, speech_to_silence_ratio); missing columns count as 0,
+            missing cells (NaN) never trigger a rule
+        rules (RiskRuleSet): Rule set to apply; defaults to default_rules()
+
+    Returns:
+        scores (dict): 'overall_risk' (object array of level names), 'overall_risk_code',
+            'risk_factors' (uint32 bitmask, bit i = rules.factors[i]), 'high_risk_count',
+            'moderate_risk_count' and 'risk_score'
+    """
+    rules = rules or default_rules()
+    columns = list(table.columns) if hasattr(table, 'columns') else list(table)
+    n = len(table[columns[0]]) if columns else 0
+    X = np.empty((n, len(rules.feature_names)), dtype=np.float64)
+    for j, name in enumerate(rules.feature_names):
+        X[:, j] = _column(table, name, n)
+    return rules.evaluate_matrix(X)
+
+
+def decode_risk_factors(mask, rules=None):
+    """
+    Expand a risk factor bitmask into the per-record factor list.
+
+    Args:
+        mask (int): Bitmask from score_batch()['risk_factors']
+        rules (RiskRuleSet): Rule set that produced the mask; defaults to default_rules()
+
+    Returns:
+        factors (list): Factor names in rule order
+    """
+    return (rules or default_rules()).decode(mask)
+
+
+def _reference_indicators(acoustic_features, silence_stats):
+    """The original hard-coded if-chain, kept as the parity reference for the default rules."""
+    f0_cv = acoustic_features.get('f0_coeff_variation', 0)
+    monotony_index = acoustic_features.get('pitch_monotony_index', 0)
+    voiced_ratio = acoustic_features.get('voiced_ratio', 0)
+    avg_pause_duration = silence_stats.get('average_silence_duration', 0)
+    speech_silence_ratio = silence_stats.get('speech_to_silence_ratio', 0)
+
+    risk_factors = []
+    if f0_cv < 0.15:
+        risk_factors.append("monotone_speech")
+    elif f0_cv < 0.25:
+        risk_factors.append("reduced_pitch_variability")
+    if monotony_index > 0.85:
+        risk_factors.append("high_monotony")
+    if voiced_ratio < 0.6:
+        risk_factors.append("low_voiced_ratio")
+    if avg_pause_duration > 1.5:
+        risk_factors.append("long_pauses")
+    elif avg_pause_duration > 1.0:
+        risk_factors.append("extended_pauses")
+    if speech_silence_ratio < 1.5:
+        risk_factors.append("high_silence_ratio")
+    elif speech_silence_ratio < 2.5:
+        risk_factors.append("elevated_silence")
+
+    high_risk_count = sum(1 for factor in risk_factors if factor in ["monotone_speech", "high_monotony", "long_pauses", "high_silence_ratio"])
+    moderate_risk_count = len(risk_factors) - high_risk_count
+    if high_risk_count >= 2:
+        overall_risk = "high"
+    elif high_risk_count >= 1 or moderate_risk_count >= 2:
+        overall_risk = "moderate"
+    else:
+        overall_risk = "low"
+
+    return {
+        'overall_risk': overall_risk,
+        'risk_factors': risk_factors,
+        'high_risk_count': high_risk_count,
+        'moderate_risk_count': moderate_risk_count
+    }
+
+
+def check_parity(n=5000, seed=0, nan_fraction=0.05):
+    """
+    Check batch scoring against per-record scoring on random rows.
+
+    Every row is compared with both AudioPreprocessor.analyze_depression_indicators
+    (the single-record rule path) and the original hard-coded thresholds.
+    Values are drawn around every threshold, including exact boundary values,
+    so each branch is exercised; a share of cells is NaN (missing feature).
+
+    Args:
+        n (int): Number of random rows
+        seed (int): Random seed
+        nan_fraction (float): Share of cells replaced by NaN
+
+    Returns:
+        mismatches (int): Number of rows whose outputs differ
+    """
+    from audio import AudioPreprocessor
+
+    rng = np.random.default_rng(seed)
+    table = {
+        'f0_coeff_variation': rng.choice([0.15, 0.25, *rng.uniform(0, 0.4, 50)], n),
+        'pitch_monotony_index': rng.choice([0.85, *rng.uniform(0.6, 1.0, 50)], n),
+        'voiced_ratio': rng.choice([0.6, *rng.uniform(0.3, 0.9, 50)], n),
+        'average_silence_duration': rng.choice([1.0, 1.5, *rng.uniform(0, 3, 50)], n),
+        'speech_to_silence_ratio': rng.choice([1.5, 2.5, np.inf, *rng.uniform(0, 5, 50)], n),
+    }
+    for values in table.values():
+        values[rng.random(n) < nan_fraction] = np.nan
+    scores = score_batch(table)
+
+    preprocessor = AudioPreprocessor(profile=False)
+    mismatches = 0
+    for i in range(n):
+        acoustic = {k: float(table[k][i]) for k in ('f0_coeff_variation', 'pitch_monotony_index', 'voiced_ratio')}
+        silence = {k: float(table[k][i]) for k in ('average_silence_duration', 'speech_to_silence_ratio')}
+        single = preprocessor.analyze_depression_indicators(acoustic, silence)
+        reference = _reference_indicators(acoustic, silence)
+        got = {
+            'overall_risk': scores['overall_risk'][i],
+            'risk_factors': decode_risk_factors(scores['risk_factors'][i]),
+            'high_risk_count': int(scores['high_risk_count'][i]),
+            'moderate_risk_count': int(scores['moderate_risk_count'][i]),
+        }
+        single.pop('risk_score')
+        if got != single or got != reference:
+            mismatches += 1
+    return mismatches
+
+
+if __name__ == "__main__":
+    import time
+
+    mismatches = check_parity()
+    print(f"{'✅' if mismatches == 0 else '❌'} Parity with per-record scoring: {mismatches} mismatching rows")
+
+    rng = np.random.default_rng(1)
+    rows = 1_000_000
+    table = {
+        'f0_coeff_variation': rng.uniform(0, 0.4, rows),
+        'pitch_monotony_index': rng.uniform(0.6, 1.0, rows),
+        'voiced_ratio': rng.uniform(0.3, 0.9, rows),
+        'average_silence_duration': rng.uniform(0, 3, rows),
+        'speech_to_silence_ratio': rng.uniform(0, 5, rows),
+    }
+    start = time.perf_counter()
+    score_batch(table)
+    print(f"⏱️  Scored {rows:,} rows in {time.perf_counter() - start:.3f}s")
+
+    rules = default_rules()
+    record = ({'f0_coeff_variation': 0.2, 'pitch_monotony_index': 0.9, 'voiced_ratio': 0.5},
+              {'average_silence_duration': 1.2, 'speech_to_silence_ratio': 2.0})
+    calls = 20_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        rules.evaluate(*record)
+    print(f"⏱️  Single-record evaluate: {(time.perf_counter() - start) / calls * 1e6:.1f}µs per call")
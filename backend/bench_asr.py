@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from asr import ASR_PRESETS, ASR_SAMPLE_RATE, load_asr, word_errors
+from audio_source import AudioSource
+
+DEFAULT_MANIFEST = "asr_reference.json"
+
+
+def load_manifest(path):
+    """
+    Load a local ASR reference set.
+
+    The manifest is a JSON list of {"audio": <path>, "text": <reference transcript>};
+    relative audio paths are resolved against the manifest's directory.
+
+    Args:
+        path (str): Manifest path
+
+    Returns:
+        items (list): [(audio path, reference text), ...]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    return [(os.path.join(base, e['audio']), e['text']) for e in entries]
+
+
+def benchmark_preset(preset, items):
+    """
+    Measure real-time factor and WER of one ASR preset on the reference set.
+
+    Decoding and resampling are done before timing so only recognition is measured.
+
+    Args:
+        preset (str): ASR preset name
+        items (list): [(audio path, reference text), ...]
+
+    Returns:
+        report (dict): rtf (processing time / audio time), wer (corpus-level),
+            audio_seconds, load_seconds
+    """
+    start = time.perf_counter()
+    transcribe = load_asr(preset)
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up on the first clip so one-time graph/kernel setup isn't counted
+    audio = [AudioSource(path).at(ASR_SAMPLE_RATE) for path, _ in items]
+    transcribe(audio[0][:ASR_SAMPLE_RATE * 5])
+
+    total_audio = 0.0
+    total_time = 0.0
+    errors = 0
+    ref_words = 0
+    for samples, (_, reference) in zip(audio, items):
+        start = time.perf_counter()
+        hypothesis = transcribe(samples)
+        total_time += time.perf_counter() - start
+        total_audio += len(samples) / ASR_SAMPLE_RATE
+        # Corpus WER: total edits over total normalized reference words
+        n_errors, n_words = word_errors(reference, hypothesis)
+        errors += n_errors
+        ref_words += n_words
+
+    return {
+        'rtf': total_time / total_audio if total_audio else 0.0,
+        'wer': errors / ref_words if ref_words else 0.0,
+        'audio_seconds': total_audio,
+        'load_seconds': load_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ASR presets on a local reference set")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST,
+                        help='JSON list of {"audio": path, "text": reference}')
+    parser.add_argument("--presets", default="small,small-int8,base,ct2-small-int8,ct2-base-int8")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the report")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.manifest):
+        print(f"⚠️ Reference set not found: {args.manifest}")
+        print('💡 Create a JSON list of {"audio": "clip.wav", "text": "reference transcript"} entries')
+        return 1
+
+    items = load_manifest(args.manifest)
+    report = {}
+    print(f"{'preset':>16} | {'RTF':>6} | {'WER':>6} | {'load s':>6}")
+    for preset in args.presets.split(","):
+        if preset not in ASR_PRESETS and ":" not in preset:
+            print(f"⚠️ Skipping unknown preset: {preset}")
+            continue
+        try:
+            r = benchmark_preset(preset, items)
+        except ImportError as e:
+            print(f"⚠️ Skipping {preset}: {e}")
+            continue
+        report[preset] = r
+        print(f"{preset:>16} | {r['rtf']:>6.3f} | {r['wer']:>6.2%} | {r['load_seconds']:>6.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+from synthetic_speech import CORPUS_DURATIONS, corpus_file
+
+DEFAULT_DURATIONS = [5, 30, 120]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _run_case(path, duration, sr, verbose=False):
+    """Run one full preprocessing pass in a fresh process and return its measurements."""
+    from logs import configure_logging
+
+    if not verbose:
+        configure_logging(verbose=False)
+        return _measure(path, duration, sr)
+    with open(os.devnull, 'w') as devnull:
+        configure_logging(verbose=True, stream=devnull)
+        try:
+            return _measure(path, duration, sr)
+        finally:
+            # No handler may keep writing to the closed stream
+            configure_logging(verbose=False)
+
+
+def _measure(path, duration, sr):
+    from audio import AudioPreprocessor
+
+    # Memory tracing is kept off so it doesn't distort the CPU numbers;
+    # peak RSS of the isolated process is reported instead
+    preprocessor = AudioPreprocessor(target_sr=sr, trace_memory=False)
+    start = time.perf_counter()
+    result = preprocessor.preprocess_audio(path, preserve_gaps=True, extract_features=True)
+    wall = time.perf_counter() - start
+    if result is None:
+        raise RuntimeError(f"preprocess_audio failed on {path}")
+
+    stages = {}
+    for stage, values in result['timings'].items():
+        cpu = values['cpu_time']
+        stages[stage] = {
+            'wall_time': values['wall_time'],
+            'cpu_time': cpu,
+            'throughput': duration / cpu if cpu > 0 else float('inf'),
+        }
+    return {'wall_time': wall, 'peak_rss': _peak_rss_bytes(), 'stages': stages}
+
+
+def run_benchmarks(durations, sr=16000, seed=0, repeat=1, corpus_dir="bench_corpus", verbose=False):
+    """
+    Time every AudioPreprocessor stage and the full preprocess_audio on the synthetic corpus.
+
+    Each run executes in a freshly spawned process so that peak RSS is per case
+    and model/library caches from earlier cases don't leak into later ones.
+
+    Args:
+        durations (list): Corpus durations in seconds
+        sr (int): Sample rate of the corpus and the preprocessor
+        seed (int): Corpus seed
+        repeat (int): Runs per duration; the fastest CPU time per stage is kept
+        corpus_dir (str): Directory caching the generated WAV files
+        verbose (bool): Run with verbose pipeline logging (rendered to /dev/null),
+            to measure the cost of console output against the quiet default
+
+    Returns:
+        results (dict): {'meta': ..., 'cases': {duration: {...}}}
+    """
+    ctx = multiprocessing.get_context('spawn')
+    cases = {}
+    for duration in durations:
+        path = corpus_file(duration, output_dir=corpus_dir, sr=sr, seed=seed)
+        best = None
+        for _ in range(repeat):
+            with ctx.Pool(1) as pool:
+                run = pool.apply(_run_case, (path, duration, sr, verbose))
+            if best is None:
+                best = run
+                continue
+            best['peak_rss'] = max(best['peak_rss'], run['peak_rss'])
+            best['wall_time'] = min(best['wall_time'], run['wall_time'])
+            for stage, values in run['stages'].items():
+                if values['cpu_time'] < best['stages'][stage]['cpu_time']:
+                    best['stages'][stage] = values
+        cases[str(duration)] = {'audio_seconds': duration, **best}
+        total = best['stages'].get('total', {})
+        print(f"⏱️  {duration:>6}s audio: {total.get('cpu_time', 0):.2f}s CPU, "
+              f"{total.get('throughput', 0):.1f} audio-s/CPU-s, peak RSS {best['peak_rss'] / 2**20:.0f} MiB")
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'sample_rate': sr,
+            'seed': seed,
+            'verbose': verbose,
+        },
+        'cases': cases,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Compare benchmark results against a saved baseline.
+
+    A stage regresses when its throughput drops by more than `tolerance`
+    (relative) and a case regresses when its peak RSS grows by more than `tolerance`.
+
+    Args:
+        results (dict): Output of run_benchmarks
+        baseline (dict): Previously saved output of run_benchmarks
+        tolerance (float): Allowed relative slowdown / memory growth
+
+    Returns:
+        regressions (list): Human-readable descriptions of every regression
+    """
+    regressions = []
+    for key, case in results['cases'].items():
+        base_case = baseline.get('cases', {}).get(key)
+        if base_case is None:
+            continue
+        for stage, values in case['stages'].items():
+            base_stage = base_case['stages'].get(stage)
+            if base_stage is None or not base_stage['throughput']:
+                continue
+            ratio = values['throughput'] / base_stage['throughput']
+            if ratio < 1 - tolerance:
+                regressions.append(
+                    f"{key}s/{stage}: throughput {values['throughput']:.2f} vs baseline "
+                    f"{base_stage['throughput']:.2f} audio-s/CPU-s ({(1 - ratio) * 100:.0f}% slower)"
+                )
+        if base_case['peak_rss'] and case['peak_rss'] > base_case['peak_rss'] * (1 + tolerance):
+            regressions.append(
+                f"{key}s: peak RSS {case['peak_rss'] / 2**20:.0f} MiB vs baseline "
+                f"{base_case['peak_rss'] / 2**20:.0f} MiB"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the audio preprocessing pipeline on synthetic speech")
+    parser.add_argument("--durations", type=str, default=",".join(map(str, DEFAULT_DURATIONS)),
+                        help="Comma-separated corpus durations in seconds")
+    parser.add_argument("--full", action="store_true", help=f"Run the full corpus {CORPUS_DURATIONS}")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sr", type=int, default=16000)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Enable verbose pipeline logging to compare against the quiet default")
+    args = parser.parse_args()
+
+    durations = CORPUS_DURATIONS if args.full else [float(d) if '.' in d else int(d) for d in args.durations.split(",")]
+    results = run_benchmarks(durations, sr=args.sr, seed=args.seed, repeat=args.repeat, verbose=args.verbose)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results written to: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # Without a baseline nothing can be checked; fail rather than pass silently
+        print(f"❌ No baseline at {args.baseline}; run with --save-baseline on a reference machine to create one")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} performance regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+
+    print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
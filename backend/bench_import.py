@@ -0,0 +1,88 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules a worker imports before serving its first request
+DEFAULT_MODULES = ("audio", "pitch", "asr", "batch_scoring", "trends")
+# Cold-start import budget per module (cumulative, ms)
+DEFAULT_BUDGET_MS = 100.0
+
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        rows (list): (module, self ms, cumulative ms) in import order
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def _importtime(code, cwd):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+    return parse_importtime(proc.stderr)
+
+
+def measure_import(module, cwd=None):
+    """
+    Import a module in a fresh interpreter and time it.
+
+    Args:
+        module (str): Module name
+        cwd (str): Directory to import from (defaults to this directory)
+
+    Returns:
+        report (dict): total_ms (cumulative for the module), heaviest
+            [(module, cumulative ms)] of its top-level dependencies
+    """
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+    # Interpreter start-up imports (site, encodings, ...) are not the module's cost
+    startup = {name for name, _, _ in _importtime("pass", cwd)}
+    rows = _importtime(f"import {module}", cwd)
+    total = next(cumulative for name, _, cumulative in reversed(rows) if name == module)
+    # Top-level packages only; "numpy.core" etc. are already counted in "numpy"
+    top_level = [(name, cumulative) for name, _, cumulative in rows
+                 if "." not in name and name != module and name not in startup]
+    top_level.sort(key=lambda r: r[1], reverse=True)
+    return {'total_ms': total, 'heaviest': top_level[:5]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure module import time for worker cold start")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail if any module takes longer than this to import")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is reported")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':>14} | {'import ms':>9} | heaviest dependencies")
+    for module in args.modules.split(","):
+        try:
+            runs = [measure_import(module) for _ in range(args.repeat)]
+        except ImportError as e:
+            print(f"{module:>14} | {'-':>9} | ⚠️ {e}")
+            failed = True
+            continue
+        best = min(runs, key=lambda r: r['total_ms'])
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in best['heaviest'])
+        over = best['total_ms'] > args.budget_ms
+        failed |= over
+        print(f"{module:>14} | {best['total_ms']:>9.1f} | {heaviest}{'  ❌ over budget' if over else ''}")
+
+    print(f"\nBudget: {args.budget_ms:.0f} ms per module")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from job_queue import DONE, FAILED, JobQueue, run_worker
+
+
+def _bench_job(payload):
+    # Stand-in job: fixed work time, optionally failing to exercise retries
+    time.sleep(payload['seconds'])
+    if random.random() < payload['fail_rate']:
+        raise RuntimeError("injected failure")
+    return {'ok': True}
+
+
+def _worker(path, worker_id, stop_when_empty_after):
+    queue = JobQueue(path, lease_seconds=30.0, backoff_base=0.05, backoff_max=0.5)
+    stop = threading.Event()
+
+    def watchdog():
+        # Exit once nothing is queued or running for a while
+        idle_since = None
+        while not stop.is_set():
+            counts = queue.counts()
+            busy = counts.get('queued', 0) + counts.get('running', 0)
+            if busy:
+                idle_since = None
+            elif idle_since is None:
+                idle_since = time.time()
+            elif time.time() - idle_since > stop_when_empty_after:
+                stop.set()
+            time.sleep(0.05)
+
+    threading.Thread(target=watchdog, daemon=True).start()
+    run_worker(queue, {'bench': _bench_job}, worker_id=worker_id, poll_interval=0.01, stop=stop)
+
+
+def benchmark(n_jobs=2000, workers=8, job_ms=0.0, fail_rate=0.0, path=None):
+    """
+    Enqueue n_jobs and drain them with local worker processes.
+
+    Args:
+        n_jobs (int): Jobs enqueued before the workers start
+        workers (int): Worker processes
+        job_ms (float): Simulated work per job
+        fail_rate (float): Probability an attempt raises (retried with backoff)
+        path (str): Database file (a temporary one by default)
+
+    Returns:
+        report (dict): enqueue_per_s, jobs_per_s, done, failed, attempts
+    """
+    tmp = None
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "bench_jobs.db")
+    queue = JobQueue(path, max_attempts=5)
+
+    start = time.perf_counter()
+    ids = [queue.enqueue({'seconds': job_ms / 1000, 'fail_rate': fail_rate}, kind='bench') for _ in range(n_jobs)]
+    enqueue_seconds = time.perf_counter() - start
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_worker, args=(path, f"bench-{i}", 0.3)) for i in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    while True:
+        counts = queue.counts()
+        if counts.get(DONE, 0) + counts.get(FAILED, 0) >= n_jobs:
+            break
+        time.sleep(0.01)
+    drain_seconds = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    attempts = sum(queue.status(job_id)['attempts'] for job_id in ids)
+    report = {
+        'enqueue_per_s': n_jobs / enqueue_seconds,
+        'jobs_per_s': n_jobs / drain_seconds,
+        'done': counts.get(DONE, 0),
+        'failed': counts.get(FAILED, 0),
+        'attempts': attempts,
+    }
+    if tmp is not None:
+        tmp.cleanup()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite job queue throughput with local workers")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--job-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} | {'enqueue/s':>9} | {'jobs/s':>8} | {'done':>5} | {'failed':>6} | {'attempts':>8}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        r = benchmark(args.jobs, workers, args.job_ms, args.fail_rate)
+        print(f"{workers:>7} | {r['enqueue_per_s']:>9.0f} | {r['jobs_per_s']:>8.0f} | "
+              f"{r['done']:>5} | {r['failed']:>6} | {r['attempts']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
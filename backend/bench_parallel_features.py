@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from parallel_features import PYIN_PARAMS, parallel_denoise, parallel_pyin, split_points
+from synthetic_speech import corpus_file
+
+
+def _serial(audio, sr):
+    import librosa
+    import noisereduce as nr
+
+    start = time.perf_counter()
+    cleaned = nr.reduce_noise(y=audio, sr=sr, stationary=False)
+    denoise_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    f0, _, _ = librosa.pyin(cleaned, **PYIN_PARAMS)
+    return cleaned, f0, denoise_seconds, time.perf_counter() - start
+
+
+def _feature_diff(preprocessor, f0, reference):
+    a, b = preprocessor.pitch_features_from_f0(f0), preprocessor.pitch_features_from_f0(reference)
+    return max((abs(a[k] - b[k]) / abs(b[k]) if b[k] else abs(a[k]) for k in b), default=0.0)
+
+
+def benchmark(duration=3600, worker_counts=(1, 2, 4, 8), sr=16000, corpus_dir="bench_corpus"):
+    """
+    Wall-clock time of denoise + pyin on one recording, in-process vs. chunked across processes.
+
+    Parallel pyin runs on the serial denoised signal, so the f0 comparison
+    isolates the effect of chunking on pyin.
+
+    Returns:
+        rows (list): Per worker count: chunks, denoise/pyin/total seconds, speedup,
+            max |Δ| of the denoised signal, f0 frames that differ, max relative feature difference
+    """
+    from audio import AudioPreprocessor
+
+    preprocessor = AudioPreprocessor(target_sr=sr, profile=False)
+    audio, sr = preprocessor.load_audio(corpus_file(duration, output_dir=corpus_dir, sr=sr))
+    segments, _ = preprocessor.analyze_silence_patterns(audio, sr)
+    # Warm-up: librosa's numba kernels compile on first use
+    _serial(audio[:5 * sr], sr)
+
+    cleaned, f0, denoise_seconds, pyin_seconds = _serial(audio, sr)
+    serial_total = denoise_seconds + pyin_seconds
+    rows = [{'workers': 'serial', 'chunks': 1, 'denoise_s': denoise_seconds, 'pyin_s': pyin_seconds,
+             'total_s': serial_total, 'speedup': 1.0, 'denoise_max_diff': 0.0, 'f0_frames_differ': 0,
+             'feature_max_rel_diff': 0.0}]
+    for workers in worker_counts:
+        bounds = split_points(segments, len(audio), workers, sr)
+        start = time.perf_counter()
+        parallel_cleaned = parallel_denoise(audio, sr, workers)
+        parallel_denoise_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel_f0 = parallel_pyin(cleaned, sr, bounds, workers)
+        parallel_pyin_seconds = time.perf_counter() - start
+        total = parallel_denoise_seconds + parallel_pyin_seconds
+        rows.append({
+            'workers': workers,
+            'chunks': len(bounds) - 1,  # pyin chunks
+            'denoise_s': parallel_denoise_seconds,
+            'pyin_s': parallel_pyin_seconds,
+            'total_s': total,
+            'speedup': serial_total / total,
+            'denoise_max_diff': float(np.max(np.abs(parallel_cleaned - cleaned))),
+            'f0_frames_differ': int(np.sum(~np.isclose(parallel_f0, f0))),
+            'feature_max_rel_diff': _feature_diff(preprocessor, parallel_f0, f0),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked parallel denoise + pyin vs. a single process")
+    parser.add_argument("--duration", type=int, default=3600, help="Synthetic recording length (s)")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--corpus-dir", default="bench_corpus")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.duration}s recording")
+    print(f"{'workers':>7} | {'chunks':>6} | {'denoise s':>9} | {'pyin s':>8} | {'total s':>8} | {'speedup':>7} | "
+          f"{'max |Δx|':>8} | {'f0 Δ frames':>11} | {'feat Δ':>8}")
+    for r in benchmark(args.duration, [int(w) for w in args.workers.split(",")], corpus_dir=args.corpus_dir):
+        print(f"{r['workers']:>7} | {r['chunks']:>6} | {r['denoise_s']:>9.1f} | {r['pyin_s']:>8.1f} | "
+              f"{r['total_s']:>8.1f} | {r['speedup']:>6.2f}x | {r['denoise_max_diff']:>8.2e} | "
+              f"{r['f0_frames_differ']:>11} | {r['feature_max_rel_diff']:>8.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
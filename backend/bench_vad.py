@@ -0,0 +1,113 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from synthetic_speech import generate_speech_like
+from vad import detect_speech
+
+DEFAULT_DURATIONS = [30, 600, 3600]
+
+
+def _gaps(intervals, n):
+    """Silence intervals between (and around) speech intervals."""
+    bounds = np.concatenate(([0], np.asarray(intervals).reshape(-1), [n])).reshape(-1, 2)
+    return [(int(s), int(e)) for s, e in bounds if e > s]
+
+
+def pause_scores(intervals, truth_pauses, n, sr, min_silence_duration=0.5):
+    """
+    Match detected silences to ground-truth pauses.
+
+    A true pause (at least min_silence_duration long) counts as found when a
+    detected silence covers at least half of it; a detected silence counts as
+    correct when it lies at least half inside a true pause.
+
+    Returns:
+        scores (dict): precision, recall, f1, detected, expected
+    """
+    min_len = int(min_silence_duration * sr)
+    expected = [(s, e) for s, e in truth_pauses if e - s >= min_len]
+    detected = [(s, e) for s, e in _gaps(intervals, n) if e - s >= min_len]
+
+    def overlap(a, b):
+        return max(0, min(a[1], b[1]) - max(a[0], b[0]))
+
+    found = sum(any(overlap(p, d) >= 0.5 * (p[1] - p[0]) for d in detected) for p in expected)
+    correct = sum(any(overlap(d, p) >= 0.5 * (d[1] - d[0]) for p in truth_pauses) for d in detected)
+    precision = correct / len(detected) if detected else 0.0
+    recall = found / len(expected) if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': precision, 'recall': recall, 'f1': f1,
+            'detected': len(detected), 'expected': len(expected)}
+
+
+def _time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def compare(duration, sr=16000, seed=0, snr_db=20.0, clicks=0, repeat=3, min_silence_duration=0.5):
+    """
+    Time and score librosa.effects.split (top_db=25) against the adaptive detector.
+
+    Args:
+        duration (float): Signal length in seconds
+        sr (int): Sample rate
+        seed (int): Corpus seed
+        snr_db (float): Noise level of the synthetic signal
+        clicks (int): Full-scale single-sample clicks inserted inside pauses
+        repeat (int): Timing runs; the fastest is kept
+        min_silence_duration (float): Pause length that counts as silence
+
+    Returns:
+        report (dict): {'top_db': {...}, 'adaptive': {...}} with seconds and pause scores
+    """
+    import librosa
+
+    audio, truth = generate_speech_like(duration, sr=sr, seed=seed, snr_db=snr_db)
+    pauses = truth['pauses']
+    rng = np.random.default_rng(seed)
+    for start, end in (pauses[i] for i in rng.choice(len(pauses), size=min(clicks, len(pauses)), replace=False)):
+        audio[(start + end) // 2] = 1.0
+
+    # Warm-up so one-time JIT compilation and caches aren't timed
+    librosa.effects.split(audio[:sr], top_db=25, frame_length=1024, hop_length=256)
+    detect_speech(audio[:sr], sr)
+
+    fixed, fixed_s = _time(lambda: librosa.effects.split(audio, top_db=25, frame_length=1024, hop_length=256), repeat)
+    adaptive, adaptive_s = _time(lambda: detect_speech(audio, sr, min_silence_duration=min_silence_duration), repeat)
+    return {
+        'top_db': {'seconds': fixed_s, **pause_scores(fixed, pauses, len(audio), sr, min_silence_duration)},
+        'adaptive': {'seconds': adaptive_s, **pause_scores(adaptive, pauses, len(audio), sr, min_silence_duration)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive VAD vs librosa.effects.split")
+    parser.add_argument("--durations", default=",".join(str(d) for d in DEFAULT_DURATIONS))
+    parser.add_argument("--snr-db", type=float, default=20.0)
+    parser.add_argument("--clicks", type=int, default=0, help="Clicks inserted into pauses")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'duration':>8} | {'method':>8} | {'seconds':>8} | {'x faster':>8} | "
+          f"{'precision':>9} | {'recall':>6} | {'F1':>5}")
+    for duration in (float(d) for d in args.durations.split(",")):
+        report = compare(duration, seed=args.seed, snr_db=args.snr_db, clicks=args.clicks, repeat=args.repeat)
+        speedup = report['top_db']['seconds'] / report['adaptive']['seconds']
+        for method, r in report.items():
+            print(f"{duration:>7.0f}s | {method:>8} | {r['seconds']:>8.3f} | "
+                  f"{(speedup if method == 'adaptive' else 1.0):>8.1f} | "
+                  f"{r['precision']:>9.2%} | {r['recall']:>6.2%} | {r['f1']:>5.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
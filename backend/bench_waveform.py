@@ -0,0 +1,90 @@
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+
+from waveform import DPI, FIGSIZE, render_audio_with_segments
+
+
+def synthetic_recording(duration, sr=16000, seed=0):
+    """Noise with a slow loudness swell and alternating 0.3-3 s speech/silence segments."""
+    rng = np.random.default_rng(seed)
+    n = int(duration * sr)
+    audio = (rng.normal(0, 0.1, n) * np.sin(np.arange(n) / sr / 20)).astype(np.float32)
+    segments, position, speech = [], 0, True
+    while position < n:
+        end = min(n, position + int(sr * rng.uniform(0.3, 3.0)))
+        segments.append({'type': 'speech' if speech else 'silence', 'start': position, 'end': end})
+        position, speech = end, not speech
+    return audio, segments
+
+
+def render_full(original_audio, processed_audio, segments, sr, fmt='png'):
+    """Reference: the previous plot (every sample, one axvspan per segment) rendered with Agg."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=FIGSIZE, dpi=DPI)
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(2, 1)
+    ax1.plot(np.arange(len(original_audio)) / sr, original_audio, alpha=0.7, color='blue', label='Original')
+    ax1.legend()
+    ax2.plot(np.arange(len(processed_audio)) / sr, processed_audio, alpha=0.7, color='orange', label='Processed')
+    for segment in segments:
+        ax2.axvspan(segment['start'] / sr, segment['end'] / sr, alpha=0.3,
+                    color='green' if segment['type'] == 'speech' else 'red')
+    ax2.legend()
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def benchmark(duration, fmt='png', repeat=3, full=True, sr=16000):
+    """
+    Render time of the decimated renderer, and optionally of the full-resolution plot.
+
+    Returns:
+        report (dict): segments, decimated_ms, full_ms (None when skipped), image_kb
+    """
+    audio, segments = synthetic_recording(duration, sr)
+
+    def best(fn):
+        times, image = [], None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            image = fn(audio, audio, segments, sr, fmt=fmt)
+            times.append(time.perf_counter() - start)
+        return image, min(times) * 1000
+
+    # Warm-up: font cache and backend imports
+    render_audio_with_segments(audio[:sr], audio[:sr], [], sr, fmt=fmt)
+    image, decimated_ms = best(render_audio_with_segments)
+    full_ms = best(render_full)[1] if full else None
+    return {'segments': len(segments), 'decimated_ms': decimated_ms, 'full_ms': full_ms,
+            'image_kb': len(image) / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decimated headless waveform rendering vs. plotting every sample")
+    parser.add_argument("--durations", default="60,600,3600", help="Comma-separated recording lengths (s)")
+    parser.add_argument("--format", default="png", choices=("png", "svg"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--full-max", type=int, default=600,
+                        help="Longest recording (s) also rendered at full resolution")
+    args = parser.parse_args()
+
+    print(f"{'duration':>8} | {'segments':>8} | {'decimated ms':>12} | {'full ms':>9} | {'speedup':>7} | {'KiB':>6}")
+    for duration in (int(d) for d in args.durations.split(",")):
+        r = benchmark(duration, args.format, args.repeat, full=duration <= args.full_max)
+        full = f"{r['full_ms']:>9.0f}" if r['full_ms'] is not None else f"{'-':>9}"
+        speedup = f"{r['full_ms'] / r['decimated_ms']:>6.0f}x" if r['full_ms'] is not None else f"{'-':>7}"
+        print(f"{duration:>8} | {r['segments']:>8} | {r['decimated_ms']:>12.0f} | {full} | {speedup} | "
+              f"{r['image_kb']:>6.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from logs import get_logger
+
+logger = get_logger("jobs")
+
+JOB_DB_ENV = "JOB_QUEUE_DB"
+DEFAULT_DB = "jobs.db"
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 2,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, available_at);
+"""
+
+
+class JobQueue:
+    """
+    Durable job queue in a single SQLite file (WAL mode, safe across processes).
+
+    Workers claim jobs with a time-limited lease. A job whose worker dies is
+    claimed again once the lease expires; failures are retried with exponential
+    backoff up to max_attempts, after which the job is marked failed. Results
+    are stored as JSON and looked up by job id.
+    """
+
+    def __init__(self, path=None, lease_seconds=300.0, max_attempts=3, backoff_base=2.0, backoff_max=300.0):
+        """
+        Args:
+            path (str): Database file; defaults to JOB_QUEUE_DB or jobs.db
+            lease_seconds (float): How long a claim is valid without a heartbeat
+            max_attempts (int): Attempts before a job is marked failed
+            backoff_base (float): Retry delay is backoff_base ** attempts seconds (with jitter)
+            backoff_max (float): Upper bound on the retry delay
+        """
+        self.path = path or os.environ.get(JOB_DB_ENV, DEFAULT_DB)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def enqueue(self, payload, kind="audio", priority=2, max_attempts=None):
+        """
+        Add a job and return its id immediately.
+
+        Args:
+            payload (dict): JSON-serializable job input (e.g. {'path': upload path})
+            kind (str): Handler name
+            priority (int): Lower runs first (scheduler.PRIORITIES values)
+            max_attempts (int): Overrides the queue default
+
+        Returns:
+            job_id (str)
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, payload, priority, status, max_attempts, available_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload), priority, QUEUED, max_attempts or self.max_attempts, now, now, now),
+        )
+        return job_id
+
+    def claim(self, worker_id, kinds=None):
+        """
+        Lease the next ready job (highest priority, then oldest).
+
+        Queued jobs whose backoff has elapsed and running jobs whose lease has
+        expired are both eligible. BEGIN IMMEDIATE takes the write lock up
+        front, so two workers can never claim the same job.
+
+        Args:
+            worker_id (str): Lease owner
+            kinds (list): Only claim these job kinds
+
+        Returns:
+            job (dict) or None: id, kind, payload, attempts
+        """
+        db = self._connect()
+        now = time.time()
+        kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # A crashed worker's last attempt: give up instead of re-running forever
+            db.execute(
+                "UPDATE jobs SET status = ?, error = 'lease expired', lease_owner = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (FAILED, now, RUNNING, now),
+            )
+            row = db.execute(
+                "SELECT id, kind, payload, attempts FROM jobs "
+                "WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?)) "
+                f"{kind_filter} ORDER BY priority, available_at LIMIT 1",
+                (QUEUED, now, RUNNING, now, *(kinds or ())),
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                "updated_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + self.lease_seconds, now, row['id']),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return {'id': row['id'], 'kind': row['kind'], 'payload': json.loads(row['payload']),
+                'attempts': row['attempts'] + 1}
+
+    def heartbeat(self, job_id, worker_id):
+        """Extend a lease; returns False if the worker no longer owns the job."""
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+            (now + self.lease_seconds, now, job_id, worker_id, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        """Store a job's result; ignored (returns False) if the lease was lost to another worker."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = ?",
+            (DONE, json.dumps(result), time.time(), job_id, worker_id, RUNNING),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Record a failed attempt: requeue with backoff, or mark failed after max_attempts.
+
+        Returns:
+            status (str): QUEUED or FAILED (None if the lease was lost)
+        """
+        db = self._connect()
+        row = db.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ?",
+                         (job_id, worker_id)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if row['attempts'] >= row['max_attempts']:
+            status, available_at = FAILED, now
+        else:
+            # Exponential backoff with jitter so retries of a burst don't collide
+            delay = min(self.backoff_max, self.backoff_base ** row['attempts'])
+            status, available_at = QUEUED, now + delay * random.uniform(0.5, 1.0)
+        db.execute(
+            "UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (status, str(error), available_at, now, job_id, worker_id),
+        )
+        return status
+
+    def status(self, job_id):
+        """
+        Job state for polling clients.
+
+        Returns:
+            job (dict) or None: id, status, attempts, result (when done), error
+        """
+        row = self._connect().execute(
+            "SELECT id, status, attempts, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row['id'],
+            'status': row['status'],
+            'attempts': row['attempts'],
+            'result': json.loads(row['result']) if row['result'] is not None else None,
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at'],
+        }
+
+    def counts(self):
+        rows = self._connect().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def wait(self, job_id, timeout=None, poll_interval=0.5):
+        """Block until a job is done or failed (for local callers and tests)."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None or job['status'] in (DONE, FAILED):
+                return job
+            if deadline is not None and time.time() > deadline:
+                return job
+            time.sleep(poll_interval)
+
+
+def analyze_audio_job(payload):
+    """Default 'audio' handler: run the preprocessing pipeline and return its JSON-safe report."""
+    from audio import AudioPreprocessor
+
+    result = AudioPreprocessor().preprocess_audio(payload['path'], as_result=True)
+    if result is None:
+        raise RuntimeError(f"preprocess_audio failed for {payload['path']}")
+    return json.loads(result.to_json())
+
+
+HANDLERS = {'audio': analyze_audio_job}
+
+
+def run_worker(queue, handlers=None, worker_id=None, poll_interval=0.5, stop=None, max_jobs=None):
+    """
+    Claim and run jobs until stopped.
+
+    A background thread renews the lease every lease_seconds / 3 while a job
+    runs, so long recordings keep their lease and a dead worker's job is
+    picked up by another worker shortly after it stops renewing.
+
+    Args:
+        queue (JobQueue): Queue to pull from
+        handlers (dict): kind -> callable(payload) returning a JSON-serializable result
+        worker_id (str): Lease owner name (defaults to host:pid)
+        poll_interval (float): Sleep when the queue is empty
+        stop (threading.Event): Set to stop after the current job
+        max_jobs (int): Stop after this many jobs (None = unlimited)
+
+    Returns:
+        processed (int): Jobs run by this worker
+    """
+    handlers = handlers or HANDLERS
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set() and (max_jobs is None or processed < max_jobs):
+        job = queue.claim(worker_id, kinds=list(handlers))
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+
+        done = threading.Event()
+
+        def renew(job_id=job['id']):
+            while not done.wait(queue.lease_seconds / 3):
+                if not queue.heartbeat(job_id, worker_id):
+                    return
+
+        renewer = threading.Thread(target=renew, daemon=True)
+        renewer.start()
+        try:
+            result = handlers[job['kind']](job['payload'])
+        except Exception as e:
+            status = queue.fail(job['id'], worker_id, e)
+            logger.warning("⚠️ Job %s attempt %d failed (%s): %s", job['id'], job['attempts'], status, e)
+        else:
+            queue.complete(job['id'], worker_id, result)
+            logger.info("✅ Job %s done", job['id'])
+        finally:
+            done.set()
+            renewer.join()
+        processed += 1
+    return processed
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import sys
+
+# All pipeline loggers live under this namespace so one call configures them
+ROOT_LOGGER = "depression"
+
+# Set to 1/true to get the console progress output without code changes
+VERBOSE_ENV = "DEPRESSION_VERBOSE"
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {'message', 'asctime'}
+
+# Silent by default: nothing below WARNING reaches the console unless configured
+logging.getLogger(ROOT_LOGGER).addHandler(logging.NullHandler())
+
+
+def get_logger(name):
+    """
+    Get a pipeline logger.
+
+    Args:
+        name (str): Component name (e.g. 'audio'); nested under the 'depression' namespace
+
+    Returns:
+        logger (logging.Logger): Logger instance
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including any `extra=` fields."""
+
+    def format(self, record):
+        payload = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+def env_verbose(default=False):
+    """Whether verbose console output was requested through the environment (default when unset)."""
+    value = os.environ.get(VERBOSE_ENV)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def configure_logging(verbose=None, structured=False, stream=None):
+    """
+    Configure the pipeline loggers.
+
+    Verbose mode shows the interactive console output (progress lines and
+    per-item score bars) as plain messages; otherwise only warnings and errors
+    are emitted. Structured mode writes JSON lines instead, for log shippers.
+
+    Args:
+        verbose (bool): Show DEBUG output; defaults to the DEPRESSION_VERBOSE env var
+        structured (bool): Emit JSON lines instead of plain messages
+        stream: Output stream (defaults to stdout for verbose, stderr otherwise)
+
+    Returns:
+        logger (logging.Logger): The configured root pipeline logger
+    """
+    if verbose is None:
+        verbose = env_verbose()
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if getattr(handler, '_depression_handler', False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or (sys.stdout if verbose else sys.stderr))
+    handler._depression_handler = True
+    handler.setFormatter(StructuredFormatter() if structured else logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+    logger.propagate = False
+    return logger
+
@@ -0,0 +1,192 @@
+import multiprocessing
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# pyin settings of AudioPreprocessor.extract_pitch_features; chunked runs must use the same grid
+PYIN_PARAMS = {'fmin': 75, 'fmax': 300, 'frame_length': 2048, 'hop_length': 512, 'fill_na': 0.0}
+
+# noisereduce.reduce_noise defaults: block size and per-side context of its own chunked filtering
+NR_CHUNK_SIZE = 600000
+NR_PADDING = 30000
+
+# Pauses at least this long are candidate pyin cut points
+LONG_PAUSE = 1.0
+# Audio on each side of a pyin chunk that is processed but discarded, so the
+# Viterbi path has settled before the frames that are kept
+CONTEXT_SECONDS = 2.0
+
+
+def split_points(segments, n_samples, n_chunks, sr, hop_length=PYIN_PARAMS['hop_length'], min_pause=LONG_PAUSE):
+    """
+    Chunk boundaries in the middle of long pauses, close to an even split.
+
+    Args:
+        segments (list): analyze_silence_patterns segments ('type', 'start', 'end' in samples)
+        n_samples (int): Signal length
+        n_chunks (int): Wanted number of chunks (fewer are returned if there are not enough pauses)
+        sr (int): Sample rate
+        hop_length (int): Boundaries are multiples of this, so every chunk starts on a pyin frame
+        min_pause (float): Shortest pause (seconds) that may be cut
+
+    Returns:
+        bounds (list): Increasing sample positions [0, cut_1, ..., n_samples]
+    """
+    candidates = sorted({
+        (segment['start'] + segment['end']) // 2 // hop_length * hop_length
+        for segment in segments
+        if segment['type'] == 'silence' and segment['duration'] >= min_pause
+        and segment['start'] > 0 and segment['end'] < n_samples
+    })
+    candidates = np.array([c for c in candidates if 0 < c < n_samples], dtype=np.int64)
+    cuts = []
+    for i in range(1, n_chunks):
+        available = candidates[candidates > (cuts[-1] if cuts else 0)]
+        if not len(available):
+            break
+        target = i * n_samples / n_chunks
+        cuts.append(int(available[np.argmin(np.abs(available - target))]))
+    return [0, *sorted(set(cuts)), n_samples]
+
+
+@contextmanager
+def _shared(array=None, like=None):
+    """Name of a SharedMemory block holding a copy of `array` (or zeros sized like `like`); unlinked on exit."""
+    template = array if array is not None else like
+    shm = shared_memory.SharedMemory(create=True, size=max(1, template.nbytes))
+    try:
+        view = np.ndarray(template.shape, dtype=template.dtype, buffer=shm.buf)
+        view[:] = array if array is not None else 0
+        # No array may still reference the buffer when it is closed
+        del view
+        yield shm.name
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _with_attached(fn, names, n, dtype, *args):
+    """Call fn(*views, *args) with arrays over the named blocks; fn must not return a view."""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        return fn(*(np.ndarray((n,), dtype=dtype, buffer=block.buf) for block in blocks), *args)
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _pool(workers):
+    # fork: workers inherit the imported libraries instead of re-importing them
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method).Pool(workers)
+
+
+def _denoise_block(task):
+    import noisereduce as nr
+
+    source, target, n, dtype, start, end, sr, method, noise_length = task
+
+    def run(audio, out):
+        # The block as noisereduce itself reads it: NR_PADDING samples of context on
+        # each side, zeros beyond the signal, float64
+        padded = np.zeros(end - start + 2 * NR_PADDING)
+        lo, hi = max(0, start - NR_PADDING), min(n, end + NR_PADDING)
+        padded[lo - (start - NR_PADDING):hi - (start - NR_PADDING)] = audio[lo:hi]
+        kwargs = {'y_noise': audio[:noise_length], 'stationary': True} if method == 'stationary' else {}
+        cleaned = nr.reduce_noise(y=padded, sr=sr, chunk_size=None, padding=0, **kwargs)
+        keep = min(end, n) - start
+        out[start:start + keep] = cleaned[NR_PADDING:NR_PADDING + keep]
+        return keep
+    return _with_attached(run, (source, target), n, dtype)
+
+
+def _pyin_chunk(task):
+    source, n, dtype, start, end, context, last, params = task
+    hop = params['hop_length']
+
+    def run(audio):
+        import librosa
+
+        lo = max(0, start - context)
+        hi = n if last else min(n, end + context)
+        f0, _, _ = librosa.pyin(audio[lo:hi], **params)
+        # Frame j of the slice is centered on sample lo + j * hop, i.e. global frame lo // hop + j
+        first = (start - lo) // hop
+        return start // hop, f0[first:] if last else f0[first:first + (end - start) // hop]
+    return _with_attached(run, (source,), n, dtype)
+
+
+def _context_samples(sr, context_seconds):
+    hop = PYIN_PARAMS['hop_length']
+    # At least one pyin frame of context, on the hop grid so slices stay frame-aligned
+    context = max(int(context_seconds * sr), PYIN_PARAMS['frame_length'])
+    return -(-context // hop) * hop
+
+
+def denoise_blocks(n_samples):
+    """The fixed blocks noisereduce filters independently (one block for short signals)."""
+    if n_samples <= NR_CHUNK_SIZE:
+        return [(0, n_samples)]
+    return [(start, start + NR_CHUNK_SIZE) for start in range(0, n_samples, NR_CHUNK_SIZE)]
+
+
+def parallel_denoise(audio, sr, workers, method='nonstationary'):
+    """
+    noisereduce across worker processes, bit-identical to one nr.reduce_noise call.
+
+    noisereduce already filters the signal in fixed blocks of NR_CHUNK_SIZE
+    samples, each with NR_PADDING samples of context, independently of each
+    other. Those blocks are the unit of work here. Input and output live in
+    shared memory and every worker writes only its own blocks. Cutting at
+    pauses instead would change the blocks and therefore the output.
+
+    Args:
+        audio (np.array): Signal
+        sr (int): Sample rate
+        workers (int): Worker processes
+        method (str): 'stationary' or 'nonstationary' (see remove_background_noise)
+
+    Returns:
+        cleaned_audio (np.array): Denoised signal
+    """
+    # Same noise sample as the single-process stationary path: the start of the recording
+    noise_length = min(int(0.5 * sr), len(audio) // 3)
+    with _shared(audio) as source, _shared(like=audio) as target:
+        tasks = [(source, target, len(audio), audio.dtype.str, start, end, sr, method, noise_length)
+                 for start, end in denoise_blocks(len(audio))]
+        with _pool(min(workers, len(tasks))) as pool:
+            pool.map(_denoise_block, tasks, chunksize=1)
+        return _with_attached(np.copy, (target,), len(audio), audio.dtype.str)
+
+
+def parallel_pyin(audio, sr, bounds, workers, context_seconds=CONTEXT_SECONDS, params=None):
+    """
+    pyin f0 over chunks in worker processes, merged onto the single-pass frame grid.
+
+    Boundaries are multiples of the pyin hop, so each chunk's frames map to
+    global frame indices directly; the merged array has the same length and
+    frame positions as one librosa.pyin call over the whole signal.
+
+    Args:
+        audio (np.array): Signal
+        sr (int): Sample rate (only used to size the context)
+        bounds (list): Chunk boundaries from split_points
+        workers (int): Worker processes
+        context_seconds (float): Context processed on each side of a chunk
+        params (dict): Overrides of PYIN_PARAMS (e.g. fmin, fmax)
+
+    Returns:
+        f0 (np.array): Fundamental frequency per frame (0 where unvoiced)
+    """
+    params = {**PYIN_PARAMS, **(params or {})}
+    hop = params['hop_length']
+    context = _context_samples(sr, context_seconds)
+    f0 = np.zeros(1 + len(audio) // hop)
+    with _shared(audio) as source:
+        tasks = [(source, len(audio), audio.dtype.str, start, end, context, i == len(bounds) - 2, params)
+                 for i, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))]
+        with _pool(min(workers, len(tasks))) as pool:
+            for first_frame, chunk_f0 in pool.imap_unordered(_pyin_chunk, tasks):
+                f0[first_frame:first_frame + len(chunk_f0)] = chunk_f0
+    return f0
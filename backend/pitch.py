@@ -1,22 +1,33 @@
-import librosa
+from functools import lru_cache
+
 import numpy as np
-from transformers import pipeline
 
-# Load RoBERTa emotion classification model
-emotion_pipeline = pipeline("text-classification", model="j-hartmann/emotion-english-distilroberta-base", return_all_scores=True)
+import asr
+from audio_source import AudioSource
 
-def transcribe_audio(audio_path):
-    """Transcribe audio to text using Whisper (you can replace with any ASR model)."""
+EMOTION_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+
+@lru_cache(maxsize=None)
+def get_emotion_pipeline():
+    """Load the RoBERTa emotion classification model on first use (cached per process)."""
     from transformers import pipeline
-    asr = pipeline("automatic-speech-recognition", model="openai/whisper-small")
-    result = asr(audio_path)
-    return result["text"]
+
+    return pipeline("text-classification", model=EMOTION_MODEL, return_all_scores=True)
+
+def transcribe_audio(audio_path):
+    """Transcribe audio to text using Whisper (ASR_BACKEND selects the model/runtime, see asr.py)."""
+    # The shared 16 kHz view is handed to the model, so Whisper doesn't decode and resample again
+    return asr.transcribe_audio(audio_path)
 
 def analyze_pitch(audio_path):
     """Extracts pitch from an audio file and classifies emotion based on pitch."""
     
-    # Load audio
-    y, sr = librosa.load(audio_path, sr=16000)
+    # Load audio (shared 16 kHz view when given an AudioSource)
+    source = audio_path if isinstance(audio_path, AudioSource) else AudioSource(audio_path)
+    sr = 16000
+    y = source.at(sr)
+
+    import librosa
 
     # Extract fundamental frequency (f0) using librosa's Yin algorithm
     f0 = librosa.yin(y, fmin=85, fmax=300)
@@ -38,11 +49,14 @@ def analyze_pitch(audio_path):
 def analyze_combined_emotion(audio_path):
     """Combines pitch and text-based emotion analysis."""
     
+    # Decode once; ASR and pitch analysis share the 16 kHz view
+    audio_path = audio_path if isinstance(audio_path, AudioSource) else AudioSource(audio_path)
+    
     # Step 1: Transcribe Speech to Text
     text = transcribe_audio(audio_path)
     
     # Step 2: Analyze Text Emotion
-    text_emotion_scores = emotion_pipeline(text)
+    text_emotion_scores = get_emotion_pipeline()(text)
     text_emotion = max(text_emotion_scores[0], key=lambda x: x["score"])["label"]
     
     # Step 3: Analyze Pitch Emotion
@@ -59,11 +73,12 @@ def analyze_combined_emotion(audio_path):
         "final_emotion": final_emotion
     }
 
-# Example usage
-audio_path = "input.mp3"
-result = analyze_combined_emotion(audio_path)
-print(f"\nTranscribed Text: {result['transcribed_text']}")
-print(f"Text-based Emotion: {result['text_emotion']}")
-print(f"Estimated Pitch: {result['pitch']:.2f} Hz")
-print(f"Pitch-based Emotion: {result['pitch_emotion']}")
-print(f"Final Emotion Analysis: {result['final_emotion']}")
\ No newline at end of file
+if __name__ == "__main__":
+    # Example usage
+    audio_path = "input.mp3"
+    result = analyze_combined_emotion(audio_path)
+    print(f"\nTranscribed Text: {result['transcribed_text']}")
+    print(f"Text-based Emotion: {result['text_emotion']}")
+    print(f"Estimated Pitch: {result['pitch']:.2f} Hz")
+    print(f"Pitch-based Emotion: {result['pitch_emotion']}")
+    print(f"Final Emotion Analysis: {result['final_emotion']}")
@@ -0,0 +1,323 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from logs import configure_logging, get_logger
+
+logger = get_logger("prefork")
+
+LSTM_MODEL_ENV = "LSTM_MODEL_PATH"
+DEFAULT_LSTM_MODEL = "mental_health_model.h5"
+# Architecture + one .npy per weight, exported once and memory-mapped by every worker
+LSTM_WEIGHTS_ENV = "LSTM_WEIGHTS_DIR"
+
+# name -> loaded model; filled in the parent before fork so workers share the pages
+MODELS = {}
+
+
+def _load_emotion():
+    from pitch import get_emotion_pipeline
+
+    return get_emotion_pipeline()
+
+
+def _load_asr():
+    from asr import load_asr
+
+    return load_asr()
+
+
+def _lstm_paths():
+    model_path = os.environ.get(LSTM_MODEL_ENV, DEFAULT_LSTM_MODEL)
+    return model_path, os.environ.get(LSTM_WEIGHTS_ENV) or f"{model_path}.weights"
+
+
+def _export_lstm(model_path, directory):
+    # Runs in a spawned process, so TensorFlow is never initialized in the forking parent
+    import numpy as np
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(model_path)
+    os.makedirs(directory, exist_ok=True)
+    weights = model.get_weights()
+    for i, weight in enumerate(weights):
+        np.save(os.path.join(directory, f"{i:03d}.npy"), weight)
+    with open(os.path.join(directory, "architecture.json"), "w") as f:
+        f.write(model.to_json())
+    stat = os.stat(model_path)
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump({'source': os.path.abspath(model_path), 'size': stat.st_size,
+                   'mtime_ns': stat.st_mtime_ns, 'weights': len(weights)}, f)
+
+
+def _lstm_manifest(model_path, directory):
+    try:
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    stat = os.stat(model_path)
+    if (manifest.get('size'), manifest.get('mtime_ns')) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return manifest
+
+
+def prepare_lstm():
+    """
+    Export the LSTM's weights to a memory-mappable store unless it is up to date.
+
+    Returns:
+        directory (str): Store with architecture.json and one .npy per weight
+    """
+    model_path, directory = _lstm_paths()
+    if _lstm_manifest(model_path, directory) is None:
+        start = time.perf_counter()
+        process = multiprocessing.get_context("spawn").Process(target=_export_lstm, args=(model_path, directory))
+        process.start()
+        process.join()
+        if process.exitcode != 0 or _lstm_manifest(model_path, directory) is None:
+            raise RuntimeError(f"Exporting LSTM weights from {model_path} failed (exit code {process.exitcode})")
+        logger.info("📦 Exported LSTM weights to %s in %.1fs", directory, time.perf_counter() - start)
+    return directory
+
+
+def _load_lstm():
+    import numpy as np
+    import tensorflow as tf
+
+    model_path, directory = _lstm_paths()
+    manifest = _lstm_manifest(model_path, directory)
+    if manifest is None:
+        return tf.keras.models.load_model(model_path)
+    with open(os.path.join(directory, "architecture.json")) as f:
+        model = tf.keras.models.model_from_json(f.read())
+    # Read-only views of the page cache, shared by all workers; set_weights copies
+    # them into the worker's own TensorFlow variables
+    model.set_weights([np.load(os.path.join(directory, f"{i:03d}.npy"), mmap_mode='r')
+                       for i in range(manifest['weights'])])
+    return model
+
+
+LOADERS = {
+    'emotion': _load_emotion,
+    'asr': _load_asr,
+    'lstm': _load_lstm,
+}
+
+# Loaded inside each worker instead: TensorFlow's runtime thread pools don't survive fork.
+# Their source weights are memory-mapped (shared), but the framework's variables are
+# per-worker copies; memory_report lists them under private_models.
+POST_FORK = frozenset({'lstm'})
+# Run in the parent before forking for post-fork models
+PREPARE = {'lstm': prepare_lstm}
+
+
+def memory_usage(pid=None):
+    """
+    Memory of one process from /proc/<pid>/smaps_rollup (Linux 4.14+).
+
+    USS (private pages) is what the process would free on exit; shared
+    copy-on-write model pages show up in PSS split across processes, not in USS.
+
+    Args:
+        pid (int): Process id (defaults to the current process)
+
+    Returns:
+        usage (dict): rss_mb, pss_mb, uss_mb, shared_mb (None when not available)
+    """
+    pid = pid or os.getpid()
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    except OSError:
+        return {'rss_mb': None, 'pss_mb': None, 'uss_mb': None, 'shared_mb': None}
+
+    return {
+        'rss_mb': fields.get('Rss'),
+        'pss_mb': fields.get('Pss'),
+        'uss_mb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared_mb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def get_model(name):
+    """Model loaded by the pool (call from worker tasks)."""
+    return MODELS[name]
+
+
+def _worker_init(post_fork, threads):
+    # One intra-op thread per worker; the pool itself provides the parallelism
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    for name in post_fork:
+        MODELS[name] = LOADERS[name]()
+
+
+def _ready(_):
+    return os.getpid()
+
+
+class PreforkPool:
+    """
+    Worker pool that loads models once in the parent and forks after warm-up.
+
+    Model weights are inherited copy-on-write, so N workers hold one physical
+    copy instead of N. Post-fork models (the Keras LSTM) are the exception:
+    their weights are read from a shared memory-mapped store, but each worker
+    still holds its own TensorFlow variables. The GC is frozen before forking
+    so collections in the workers don't write to (and thereby copy) pages
+    holding the parent's objects.
+    """
+
+    def __init__(self, models=("emotion", "asr"), workers=None, threads_per_worker=1, warmup=None):
+        """
+        Args:
+            models (iterable): Names from LOADERS
+            workers (int): Worker processes (defaults to the CPU count)
+            threads_per_worker (int): torch intra-op threads per worker
+            warmup (callable): Called with MODELS in the parent before forking,
+                e.g. to run one inference so lazily allocated buffers are shared too
+        """
+        unknown = set(models) - set(LOADERS)
+        if unknown:
+            raise ValueError(f"Unknown models {sorted(unknown)}, expected some of {sorted(LOADERS)}")
+        self.models = tuple(models)
+        self.workers = workers or os.cpu_count()
+        self.threads_per_worker = threads_per_worker
+        self.warmup = warmup
+        self._pool = None
+
+    def start(self):
+        """Load shared models, warm up, freeze the GC and fork the workers."""
+        for name in self.models:
+            if name in POST_FORK:
+                if name in PREPARE:
+                    PREPARE[name]()
+                continue
+            start = time.perf_counter()
+            MODELS[name] = LOADERS[name]()
+            logger.info("📦 Loaded %s in %.1fs", name, time.perf_counter() - start)
+        if self.warmup is not None:
+            self.warmup(MODELS)
+
+        gc.collect()
+        gc.freeze()
+        post_fork = [name for name in self.models if name in POST_FORK]
+        context = multiprocessing.get_context("fork")
+        self._pool = context.Pool(self.workers, initializer=_worker_init,
+                                  initargs=(post_fork, self.threads_per_worker))
+        # Block until every worker has started (and loaded its post-fork models)
+        self._pool.map(_ready, range(self.workers), chunksize=1)
+        logger.info("🍴 Forked %d workers", self.workers)
+        return self
+
+    def map(self, func, items, chunksize=1):
+        """Run func (a module-level function using get_model) over items in the workers."""
+        return self._pool.map(func, items, chunksize)
+
+    def apply_async(self, func, args=(), callback=None):
+        return self._pool.apply_async(func, args, callback=callback)
+
+    def worker_pids(self):
+        return [process.pid for process in self._pool._pool]
+
+    def memory_report(self):
+        """
+        Per-process memory of the parent and every worker.
+
+        Returns:
+            report (dict): parent usage, workers {pid: usage}, totals: uss_mb
+                (sum of private memory) and pss_mb (fair share of everything), and
+                private_models: models every worker holds its own copy of
+        """
+        workers = {pid: memory_usage(pid) for pid in self.worker_pids()}
+        processes = [memory_usage()] + list(workers.values())
+        return {
+            'parent': processes[0],
+            'workers': workers,
+            'total_uss_mb': sum(p['uss_mb'] or 0 for p in processes),
+            'total_pss_mb': sum(p['pss_mb'] or 0 for p in processes),
+            'private_models': [name for name in self.models if name in POST_FORK],
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        gc.unfreeze()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _classify(text):
+    classifier = get_model('emotion')
+    return max(classifier(text)[0], key=lambda e: e['score'])['label']
+
+
+def _touch_synthetic(index):
+    # Read the shared weights (as inference would) without writing to them
+    weights = get_model('synthetic')
+    return float(weights[index % len(weights)].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork worker pool: shared model memory report")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--models", default="emotion", help=f"Comma-separated, from {sorted(LOADERS)}")
+    parser.add_argument("--synthetic-mb", type=int, default=0,
+                        help="Use a synthetic weight block of this size instead of real models")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    configure_logging(verbose=args.verbose)
+
+    if args.synthetic_mb:
+        import numpy as np
+
+        rows = args.synthetic_mb * 1024 * 1024 // (4 * 1024)
+        LOADERS['synthetic'] = lambda: np.random.default_rng(0).random((rows, 1024), dtype=np.float32)
+        models, task, items = ('synthetic',), _touch_synthetic, range(args.workers * 8)
+    else:
+        models = tuple(args.models.split(","))
+        task = _classify if 'emotion' in models else None
+        items = ["I feel very sad and anxious today."] * (args.workers * 2)
+
+    baseline = memory_usage()
+    pool = PreforkPool(models, workers=args.workers)
+    with pool:
+        loaded = memory_usage()
+        if task is not None:
+            pool.map(task, items)
+        report = pool.memory_report()
+
+    model_mb = (loaded['rss_mb'] or 0) - (baseline['rss_mb'] or 0)
+    print(f"Models in parent: {model_mb:.0f} MB RSS")
+    print(f"{'process':>10} | {'RSS MB':>8} | {'PSS MB':>8} | {'USS MB':>8} | {'shared MB':>9}")
+    rows = [('parent', report['parent'])] + [(str(pid), u) for pid, u in report['workers'].items()]
+    for name, u in rows:
+        print(f"{name:>10} | {u['rss_mb'] or 0:>8.0f} | {u['pss_mb'] or 0:>8.0f} | "
+              f"{u['uss_mb'] or 0:>8.0f} | {u['shared_mb'] or 0:>9.0f}")
+    print(f"\nTotal USS: {report['total_uss_mb']:.0f} MB, total PSS: {report['total_pss_mb']:.0f} MB "
+          f"(separate copies would need ~{model_mb * (args.workers + 1):.0f} MB for the models alone)")
+    if report['private_models']:
+        print(f"Per-worker copies (not shared): {', '.join(report['private_models'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
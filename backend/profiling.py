@@ -0,0 +1,220 @@
+import cProfile
+import contextvars
+import functools
+import json
+import os
+import re
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Set to a directory path to dump one cProfile file per stage run
+PROFILE_DIR_ENV = "AUDIO_PROFILE_DIR"
+
+# Profiler of the run in progress; per thread/task, so concurrent runs on one
+# preprocessor don't record into each other's timings
+_active_profiler = contextvars.ContextVar("stage_profiler", default=None)
+
+
+class StageProfiler:
+    """
+    Records wall time, CPU time and peak traced memory for named pipeline stages.
+    Stages may be nested; a parent's peak memory includes its children's peaks.
+    """
+
+    def __init__(self, trace_memory=False, profile_dir=None):
+        """
+        Initialize the profiler.
+
+        Args:
+            trace_memory (bool): Record peak memory per stage with tracemalloc
+                (slows allocation-heavy stages considerably; tracing is process-wide)
+            profile_dir (str): Directory for per-stage cProfile dumps
+                (defaults to the AUDIO_PROFILE_DIR environment variable)
+        """
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir if profile_dir is not None else os.environ.get(PROFILE_DIR_ENV)
+        self.timings = {}
+        self._peak_stack = []
+        self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Context manager timing one stage. Repeated stages accumulate.
+
+        Args:
+            name (str): Stage name (e.g. 'load', 'denoise', 'pitch')
+        """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        if self.trace_memory:
+            # Fold the parent's peak so far before resetting for this stage
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peak_stack:
+                self._peak_stack[-1] = max(self._peak_stack[-1], peak)
+            tracemalloc.reset_peak()
+            self._peak_stack.append(current)
+            mem_start = current
+
+        profiler = cProfile.Profile() if self.profile_dir else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+
+            peak_bytes = 0
+            if self.trace_memory:
+                stage_peak = max(self._peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+                peak_bytes = max(stage_peak - mem_start, 0)
+                if self._peak_stack:
+                    self._peak_stack[-1] = max(self._peak_stack[-1], stage_peak)
+                elif self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+
+            if profiler is not None:
+                self._dump_profile(profiler, name)
+
+            entry = self.timings.setdefault(name, {
+                'wall_time': 0.0, 'cpu_time': 0.0, 'peak_memory': 0, 'calls': 0
+            })
+            entry['wall_time'] += wall
+            entry['cpu_time'] += cpu
+            entry['peak_memory'] = max(entry['peak_memory'], peak_bytes)
+            entry['calls'] += 1
+
+    def _dump_profile(self, profiler, name):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        path = os.path.join(self.profile_dir, f"{safe_name}_{os.getpid()}_{time.time_ns()}.prof")
+        profiler.dump_stats(path)
+
+    def reset(self):
+        """Clear all recorded timings."""
+        self.timings = {}
+
+    def emit(self, sink, labels=None):
+        """
+        Send the recorded timings to a sink.
+
+        Args:
+            sink: Object with a write(timings, labels) method
+            labels (dict): Extra labels attached to every record (e.g. file name)
+        """
+        if sink is not None and self.timings:
+            sink.write(self.timings, labels or {})
+
+
+@contextmanager
+def activate(profiler):
+    """
+    Make profiler the one @profiled_stage methods record into, for this context.
+
+    Args:
+        profiler (StageProfiler): Profiler for the current run (None disables timing)
+    """
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
+
+
+def active_profiler():
+    """The StageProfiler activated for the current context, or None."""
+    return _active_profiler.get()
+
+
+def profiled_stage(name):
+    """
+    Decorator timing a function as a stage when a profiler is active (see activate).
+
+    Without an active profiler the function runs without instrumentation.
+
+    Args:
+        name (str): Stage name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class JsonLinesSink:
+    """Appends one JSON record per stage to a .jsonl file (or any writable stream)."""
+
+    def __init__(self, path_or_stream):
+        self.path_or_stream = path_or_stream
+
+    def write(self, timings, labels):
+        lines = []
+        timestamp = time.time()
+        for stage, values in timings.items():
+            record = {'timestamp': timestamp, 'stage': stage, **labels, **values}
+            lines.append(json.dumps(record))
+        payload = "\n".join(lines) + "\n"
+
+        if hasattr(self.path_or_stream, 'write'):
+            self.path_or_stream.write(payload)
+        else:
+            with open(self.path_or_stream, 'a') as f:
+                f.write(payload)
+
+
+class PrometheusTextSink:
+    """
+    Renders timings in the Prometheus text exposition format.
+    The latest rendering is kept in `text`; if a path is given it is rewritten
+    on every write (suitable for the node_exporter textfile collector).
+    """
+
+    METRICS = [
+        ('wall_time', 'audio_stage_wall_seconds', 'Wall-clock time spent in a pipeline stage'),
+        ('cpu_time', 'audio_stage_cpu_seconds', 'Process CPU time spent in a pipeline stage'),
+        ('peak_memory', 'audio_stage_peak_memory_bytes', 'Peak traced memory allocated by a pipeline stage'),
+        ('calls', 'audio_stage_calls', 'Number of times the stage ran'),
+    ]
+
+    def __init__(self, path=None):
+        self.path = path
+        self.text = ""
+
+    @staticmethod
+    def _format_labels(labels):
+        escaped = []
+        for key, value in labels.items():
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{key}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    def write(self, timings, labels):
+        lines = []
+        for key, metric, help_text in self.METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for stage, values in timings.items():
+                metric_labels = self._format_labels({**labels, 'stage': stage})
+                lines.append(f"{metric}{metric_labels} {values[key]}")
+        self.text = "\n".join(lines) + "\n"
+
+        if self.path:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(self.text)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from vad import frame_energy_db
+
+# Frame grids: pyin frames are centered on k * hop (center=True); energy frames
+# from vad.frame_energy_db cover [k * hop, k * hop + frame_length)
+PYIN_HOP = 512
+ENERGY_FRAME = 2048
+ENERGY_HOP = 512
+
+# Columns after the segment schema (type, start, end, duration)
+PROSODY_COLUMNS = ('voiced_frames', 'voiced_ratio', 'f0_mean', 'f0_std', 'f0_min', 'f0_max',
+                   'energy_db', 'energy_db_std')
+
+
+def frame_ranges(starts, ends, n_frames, hop_length, center_offset=0):
+    """
+    Frames belonging to each segment, as half-open [first, last) index ranges.
+
+    A frame belongs to the segment that contains its center sample
+    (k * hop_length + center_offset). Computed once per frame grid with two
+    searchsorted calls; segments must be sorted and non-overlapping.
+
+    Args:
+        starts (np.array): Segment start samples
+        ends (np.array): Segment end samples
+        n_frames (int): Frames in the grid
+        hop_length (int): Frame hop in samples
+        center_offset (int): Sample offset of frame 0's center
+
+    Returns:
+        first (np.array), last (np.array): Frame index ranges per segment (empty when first == last)
+    """
+    centers = np.arange(n_frames, dtype=np.int64) * hop_length + center_offset
+    return np.searchsorted(centers, starts, side='left'), np.searchsorted(centers, ends, side='left')
+
+
+def _reduce(ufunc, values, first, last):
+    """ufunc.reduce over values[first[i]:last[i]] for every segment in one reduceat call."""
+    # Interleaved [first, last) pairs: even slots are the segments, odd slots the gaps
+    # between them (discarded). The appended element keeps last == len(values) a valid index.
+    # For empty ranges reduceat returns values[first]; callers mask those by frame count.
+    padded = np.append(values, 0)
+    return ufunc.reduceat(padded, np.column_stack((first, last)).ravel())[::2]
+
+
+@dataclass(slots=True)
+class SegmentTable:
+    """
+    Per-segment prosody, one row per entry of the segments list (same order).
+
+    Columns are NumPy arrays: the segment schema (type, start, end, duration)
+    followed by PROSODY_COLUMNS. Pitch columns are NaN for segments without
+    voiced frames; energy columns are NaN when no energy frame is centered in the segment.
+    """
+    columns: dict
+
+    def __len__(self):
+        return len(self.columns['start'])
+
+    def to_dict(self):
+        """Column-oriented plain lists (NaN -> None), for result JSON."""
+        data = {}
+        for name, values in self.columns.items():
+            if values.dtype.kind == 'f':
+                data[name] = [None if np.isnan(v) else v for v in values.tolist()]
+            else:
+                data[name] = values.tolist()
+        return data
+
+    def rows(self):
+        """One dict per segment: the segment fields plus its prosody (NaN -> None)."""
+        data = self.to_dict()
+        return [dict(zip(data, values)) for values in zip(*data.values())]
+
+
+def segment_prosody(segments, f0, audio=None, sr=16000, pyin_hop=PYIN_HOP, energy=None):
+    """
+    Pitch and energy statistics for every segment in one vectorized pass.
+
+    pyin frames and energy frames are mapped to segment ranges once
+    (frame_ranges); sums, sums of squares, minima and maxima are then single
+    reduceat calls over the whole track instead of per-segment NumPy calls.
+
+    Args:
+        segments (list): analyze_silence_patterns segments ('type', 'start', 'end', 'duration')
+        f0 (np.array): pyin f0 per frame (0 or NaN when unvoiced), centered frames at pyin_hop
+        audio (np.array): Signal for the energy columns (ignored when `energy` is given)
+        sr (int): Sample rate
+        pyin_hop (int): pyin hop length
+        energy (np.array): Precomputed frame_energy_db(audio, ENERGY_FRAME, ENERGY_HOP)
+
+    Returns:
+        table (SegmentTable): Rows aligned with `segments`
+    """
+    n = len(segments)
+    starts = np.fromiter((s['start'] for s in segments), dtype=np.int64, count=n)
+    ends = np.fromiter((s['end'] for s in segments), dtype=np.int64, count=n)
+    columns = {
+        'type': np.array([s['type'] for s in segments], dtype=object),
+        'start': starts,
+        'end': ends,
+        'duration': (ends - starts) / sr,
+    }
+
+    f0 = np.asarray(f0, dtype=np.float64)
+    voiced = (f0 > 0) & np.isfinite(f0)
+    f0_voiced = np.where(voiced, f0, 0.0)
+    first, last = frame_ranges(starts, ends, len(f0), pyin_hop)
+    frames = last - first
+    count = _reduce(np.add, voiced.astype(np.float64), first, last)
+    count[frames == 0] = 0
+    total = _reduce(np.add, f0_voiced, first, last)
+    squares = _reduce(np.add, f0_voiced * f0_voiced, first, last)
+    f0_min = _reduce(np.minimum, np.where(voiced, f0, np.inf), first, last)
+    f0_max = _reduce(np.maximum, np.where(voiced, f0, -np.inf), first, last)
+    has_pitch = count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(has_pitch, total / count, np.nan)
+        # Population std (as np.std in the global features); clipped against rounding below zero
+        std = np.where(has_pitch, np.sqrt(np.maximum(squares / count - mean * mean, 0.0)), np.nan)
+        columns['voiced_frames'] = count.astype(np.int64)
+        columns['voiced_ratio'] = np.where(frames > 0, count / frames, np.nan)
+    columns['f0_mean'] = mean
+    columns['f0_std'] = std
+    columns['f0_min'] = np.where(has_pitch, f0_min, np.nan)
+    columns['f0_max'] = np.where(has_pitch, f0_max, np.nan)
+
+    if energy is None and audio is not None:
+        energy = frame_energy_db(audio, frame_length=ENERGY_FRAME, hop_length=ENERGY_HOP)
+    if energy is None:
+        columns['energy_db'] = columns['energy_db_std'] = np.full(n, np.nan)
+    else:
+        energy = np.asarray(energy, dtype=np.float64)
+        first, last = frame_ranges(starts, ends, len(energy), ENERGY_HOP, center_offset=ENERGY_FRAME // 2)
+        frames = last - first
+        power = _reduce(np.add, 10.0 ** (energy / 10.0), first, last)
+        db_sum = _reduce(np.add, energy, first, last)
+        db_squares = _reduce(np.add, energy * energy, first, last)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Mean power of the segment in dB, and the spread of its frame levels
+            columns['energy_db'] = np.where(frames > 0, 10.0 * np.log10(power / frames + 1e-12), np.nan)
+            db_mean = db_sum / frames
+            db_std = np.sqrt(np.maximum(db_squares / frames - db_mean ** 2, 0.0))
+            columns['energy_db_std'] = np.where(frames > 0, db_std, np.nan)
+    return SegmentTable(columns)
+
+
+def segment_prosody_loop(segments, f0, audio=None, sr=16000, pyin_hop=PYIN_HOP, energy=None):
+    """Reference implementation: the same table from a Python loop over segments (for benchmarks)."""
+    f0 = np.asarray(f0, dtype=np.float64)
+    if energy is None and audio is not None:
+        energy = frame_energy_db(audio, frame_length=ENERGY_FRAME, hop_length=ENERGY_HOP)
+    pitch_centers = np.arange(len(f0)) * pyin_hop
+    energy_centers = None if energy is None else np.arange(len(energy)) * ENERGY_HOP + ENERGY_FRAME // 2
+    rows = {name: [] for name in ('type', 'start', 'end', 'duration', *PROSODY_COLUMNS)}
+    for segment in segments:
+        start, end = segment['start'], segment['end']
+        values = f0[(pitch_centers >= start) & (pitch_centers < end)]
+        voiced = values[(values > 0) & np.isfinite(values)]
+        rows['type'].append(segment['type'])
+        rows['start'].append(start)
+        rows['end'].append(end)
+        rows['duration'].append((end - start) / sr)
+        rows['voiced_frames'].append(len(voiced))
+        rows['voiced_ratio'].append(len(voiced) / len(values) if len(values) else np.nan)
+        rows['f0_mean'].append(np.mean(voiced) if len(voiced) else np.nan)
+        rows['f0_std'].append(np.std(voiced) if len(voiced) else np.nan)
+        rows['f0_min'].append(np.min(voiced) if len(voiced) else np.nan)
+        rows['f0_max'].append(np.max(voiced) if len(voiced) else np.nan)
+        levels = np.array([]) if energy is None else energy[(energy_centers >= start) & (energy_centers < end)]
+        rows['energy_db'].append(10 * np.log10(np.mean(10 ** (levels / 10)) + 1e-12) if len(levels) else np.nan)
+        rows['energy_db_std'].append(np.std(levels) if len(levels) else np.nan)
+    columns = {name: np.array(values, dtype=object if name == 'type' else None) for name, values in rows.items()}
+    columns['start'] = columns['start'].astype(np.int64)
+    columns['end'] = columns['end'].astype(np.int64)
+    columns['voiced_frames'] = columns['voiced_frames'].astype(np.int64)
+    for name in ('duration', 'voiced_ratio', 'f0_mean', 'f0_std', 'f0_min', 'f0_max', 'energy_db', 'energy_db_std'):
+        columns[name] = columns[name].astype(np.float64)
+    return SegmentTable(columns)
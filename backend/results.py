@@ -0,0 +1,321 @@
+import io
+import json
+import math
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:
+    # Binary transport falls back to NumPy's .npz container
+    msgpack = None
+
+# Wire format tags for to_bytes/from_bytes
+_MSGPACK_MAGIC = b'DDR1'
+_NPZ_MAGIC = b'PK'
+
+
+def _finite_or_none(value):
+    """JSON has no Infinity/NaN (e.g. speech_to_silence_ratio with no silence); send null instead."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _plain_dict(obj):
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+def _json_safe(data):
+    return {k: _finite_or_none(v) for k, v in data.items()}
+
+
+@dataclass(slots=True)
+class Segment:
+    """One speech or silence segment; start/end are sample indices."""
+    type: str
+    start: int
+    end: int
+    duration: float
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['type'], int(data['start']), int(data['end']), float(data['duration']))
+
+    def to_dict(self):
+        return {'type': self.type, 'start': self.start, 'end': self.end, 'duration': self.duration}
+
+
+@dataclass(slots=True)
+class SilenceStats:
+    """Silence pattern statistics produced by analyze_silence_patterns."""
+    total_silence_time: float = 0.0
+    total_speech_time: float = 0.0
+    average_silence_duration: float = 0.0
+    average_speech_duration: float = 0.0
+    silence_count: int = 0
+    speech_count: int = 0
+    speech_to_silence_ratio: float = 0.0
+    longest_silence: float = 0.0
+    longest_speech: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data):
+        names = cls.__dataclass_fields__
+        return cls(**{k: v.item() if isinstance(v, np.generic) else v for k, v in data.items() if k in names})
+
+    def to_dict(self):
+        return _plain_dict(self)
+
+
+@dataclass(slots=True)
+class PitchFeatures:
+    """Pitch features from extract_pitch_features plus the acoustic placeholders."""
+    f0_mean: float = 0.0
+    f0_std: float = 0.0
+    f0_median: float = 0.0
+    f0_range: float = 0.0
+    f0_coeff_variation: float = 0.0
+    f0_iqr: float = 0.0
+    f0_slope_mean: float = 0.0
+    f0_slope_std: float = 0.0
+    voiced_ratio: float = 0.0
+    voiced_frames: int = 0
+    f0_max: float = 0.0
+    f0_min: float = 0.0
+    f0_q1: float = 0.0
+    f0_q3: float = 0.0
+    f0_q90: float = 0.0
+    pitch_monotony_index: float = 0.0
+    pitch_dynamic_range: float = 0.0
+    jitter: float = 0.0
+    shimmer: float = 0.0
+    hnr: float = 0.0
+    formant_f1: float = 0.0
+    formant_f2: float = 0.0
+    # False when pitch extraction found too few voiced frames (empty feature dict)
+    available: bool = True
+
+    @classmethod
+    def from_dict(cls, data):
+        names = cls.__dataclass_fields__
+        values = {k: v.item() if isinstance(v, np.generic) else v for k, v in data.items() if k in names}
+        values.setdefault('available', 'f0_mean' in data)
+        return cls(**values)
+
+    def to_dict(self):
+        data = _plain_dict(self)
+        available = data.pop('available')
+        if not available:
+            # Mirror extract_all_acoustic_features: only the placeholders are present
+            return {k: data[k] for k in ('jitter', 'shimmer', 'hnr', 'formant_f1', 'formant_f2')}
+        return data
+
+
+@dataclass(slots=True)
+class RiskAssessment:
+    """Output of analyze_depression_indicators."""
+    overall_risk: str = 'low'
+    risk_factors: list = field(default_factory=list)
+    high_risk_count: int = 0
+    moderate_risk_count: int = 0
+    risk_score: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            overall_risk=data.get('overall_risk', 'low'),
+            risk_factors=list(data.get('risk_factors', [])),
+            high_risk_count=int(data.get('high_risk_count', 0)),
+            moderate_risk_count=int(data.get('moderate_risk_count', 0)),
+            risk_score=float(data.get('risk_score', 0.0)),
+        )
+
+    def to_dict(self):
+        return {
+            'overall_risk': self.overall_risk,
+            'risk_factors': list(self.risk_factors),
+            'high_risk_count': self.high_risk_count,
+            'moderate_risk_count': self.moderate_risk_count,
+            'risk_score': self.risk_score,
+        }
+
+
+@dataclass(slots=True)
+class PreprocessResult:
+    """
+    Typed, compact form of the preprocess_audio result dictionary.
+
+    Audio buffers are kept as NumPy arrays and are left out of to_json by
+    default; to_bytes ships them as raw buffers for inter-process transfer.
+    """
+    original_audio: np.ndarray = None
+    processed_audio: np.ndarray = None
+    sample_rate: int = 16000
+    segments: list = field(default_factory=list)
+    silence_stats: SilenceStats = field(default_factory=SilenceStats)
+    acoustic_features: PitchFeatures = None
+    # Column lists aligned with segments (prosody.SegmentTable.to_dict)
+    segment_prosody: dict = field(default_factory=dict)
+    depression_analysis: RiskAssessment = None
+    processing_steps: list = field(default_factory=list)
+    duration_original: float = 0.0
+    duration_processed: float = 0.0
+    preserve_gaps: bool = True
+    timings: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, result):
+        """
+        Build from the dictionary returned by AudioPreprocessor.preprocess_audio.
+
+        Args:
+            result (dict): preprocess_audio result
+
+        Returns:
+            PreprocessResult: Typed result (audio arrays are shared, not copied)
+        """
+        acoustic = result.get('acoustic_features') or {}
+        depression = result.get('depression_analysis') or {}
+        return cls(
+            original_audio=result.get('original_audio'),
+            processed_audio=result.get('processed_audio'),
+            sample_rate=int(result.get('sample_rate', 16000)),
+            segments=[Segment.from_dict(s) for s in result.get('segments', [])],
+            silence_stats=SilenceStats.from_dict(result.get('silence_stats') or {}),
+            acoustic_features=PitchFeatures.from_dict(acoustic) if acoustic else None,
+            segment_prosody=dict(result.get('segment_prosody') or {}),
+            depression_analysis=RiskAssessment.from_dict(depression) if depression else None,
+            processing_steps=list(result.get('processing_steps', [])),
+            duration_original=float(result.get('duration_original', 0)),
+            duration_processed=float(result.get('duration_processed', 0)),
+            preserve_gaps=bool(result.get('preserve_gaps', True)),
+            timings=dict(result.get('timings', {})),
+        )
+
+    def to_dict(self, include_audio=False):
+        """
+        Convert back to the preprocess_audio dictionary schema.
+
+        Args:
+            include_audio (bool): Include the audio arrays (as NumPy arrays)
+
+        Returns:
+            result (dict): Dictionary with the original keys
+        """
+        return {
+            'original_audio': self.original_audio if include_audio else None,
+            'processed_audio': self.processed_audio if include_audio else None,
+            'sample_rate': self.sample_rate,
+            'segments': [s.to_dict() for s in self.segments],
+            'silence_stats': self.silence_stats.to_dict() if self.silence_stats else {},
+            'acoustic_features': self.acoustic_features.to_dict() if self.acoustic_features else {},
+            'segment_prosody': self.segment_prosody,
+            'depression_analysis': self.depression_analysis.to_dict() if self.depression_analysis else {},
+            'processing_steps': list(self.processing_steps),
+            'duration_original': self.duration_original,
+            'duration_processed': self.duration_processed,
+            'preserve_gaps': self.preserve_gaps,
+            'timings': self.timings,
+        }
+
+    def to_json(self, include_audio=False, **kwargs):
+        """
+        Serialize to a JSON string.
+
+        Args:
+            include_audio (bool): Embed the audio arrays as float lists (large; off by default)
+            **kwargs: Passed to json.dumps
+
+        Returns:
+            text (str): JSON document (non-finite floats become null)
+        """
+        data = self.to_dict()
+        data['silence_stats'] = _json_safe(data['silence_stats'])
+        data['acoustic_features'] = _json_safe(data['acoustic_features'])
+        if include_audio:
+            for key in ('original_audio', 'processed_audio'):
+                audio = getattr(self, key)
+                data[key] = audio.tolist() if audio is not None else None
+        else:
+            del data['original_audio'], data['processed_audio']
+        return json.dumps(data, **kwargs)
+
+    def to_bytes(self, include_audio=True):
+        """
+        Serialize to a compact binary payload for inter-process transfer.
+
+        Uses msgpack when installed and NumPy's .npz container otherwise. Audio
+        buffers and segment boundaries travel as raw arrays, not per-element objects.
+
+        Args:
+            include_audio (bool): Include the audio arrays
+
+        Returns:
+            payload (bytes): Binary payload readable by from_bytes
+        """
+        meta = self.to_dict()
+        del meta['original_audio'], meta['processed_audio'], meta['segments']
+        arrays = {
+            'segment_bounds': np.array([(s.start, s.end) for s in self.segments], dtype=np.int64).reshape(-1, 2),
+            'segment_is_speech': np.array([s.type == 'speech' for s in self.segments], dtype=bool),
+        }
+        if include_audio:
+            for key in ('original_audio', 'processed_audio'):
+                if getattr(self, key) is not None:
+                    arrays[key] = np.ascontiguousarray(getattr(self, key))
+
+        if msgpack is not None:
+            packed = {
+                'meta': meta,
+                'arrays': {
+                    k: {'dtype': v.dtype.str, 'shape': list(v.shape), 'data': v.tobytes()}
+                    for k, v in arrays.items()
+                },
+            }
+            return _MSGPACK_MAGIC + msgpack.packb(packed, use_bin_type=True)
+
+        buffer = io.BytesIO()
+        meta_bytes = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+        np.savez(buffer, meta=meta_bytes, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        """
+        Deserialize a payload produced by to_bytes.
+
+        Args:
+            payload (bytes): Binary payload
+
+        Returns:
+            PreprocessResult: Reconstructed result
+        """
+        if payload[:4] == _MSGPACK_MAGIC:
+            if msgpack is None:
+                raise RuntimeError("msgpack payload received but msgpack is not installed")
+            packed = msgpack.unpackb(payload[4:], raw=False)
+            meta = packed['meta']
+            arrays = {
+                k: np.frombuffer(v['data'], dtype=np.dtype(v['dtype'])).reshape(v['shape'])
+                for k, v in packed['arrays'].items()
+            }
+        elif payload[:2] == _NPZ_MAGIC:
+            with np.load(io.BytesIO(payload), allow_pickle=False) as npz:
+                arrays = {k: npz[k] for k in npz.files}
+            meta = json.loads(arrays.pop('meta').tobytes().decode('utf-8'))
+        else:
+            raise ValueError("Unrecognized result payload format")
+
+        sr = meta.get('sample_rate', 16000)
+        bounds = arrays.pop('segment_bounds')
+        is_speech = arrays.pop('segment_is_speech')
+        meta['segments'] = [
+            {'type': 'speech' if speech else 'silence', 'start': int(start), 'end': int(end),
+             'duration': (int(end) - int(start)) / sr}
+            for (start, end), speech in zip(bounds.tolist(), is_speech.tolist())
+        ]
+        meta['original_audio'] = arrays.get('original_audio')
+        meta['processed_audio'] = arrays.get('processed_audio')
+        return cls.from_dict(meta)
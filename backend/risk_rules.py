@@ -0,0 +1,234 @@
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+# Path to a clinician-maintained rules file; defaults to risk_rules.json next to this module
+RULES_PATH_ENV = "RISK_RULES_PATH"
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "risk_rules.json")
+
+# Comparators as (direction, strict): hit when direction * (x - threshold) > 0, or >= 0 if not strict
+_COMPARATORS = {
+    '<': (-1.0, True),
+    '<=': (-1.0, False),
+    '>': (1.0, True),
+    '>=': (1.0, False),
+}
+_SEVERITIES = ('high', 'moderate')
+_MAX_RULES = 32
+
+
+class RiskRuleSet:
+    """
+    Risk rules compiled from a declarative config into parallel arrays.
+
+    Each rule becomes one column of (feature index, direction, strictness,
+    threshold, severity, weight, suppression mask), so a batch of records is
+    evaluated by a handful of NumPy operations with no per-rule Python
+    branching; single records use a plain-Python copy of the same rules.
+    """
+
+    def __init__(self, config):
+        """
+        Compile a rules config (see risk_rules.json for the schema).
+
+        Args:
+            config (dict): Parsed rules config
+
+        Raises:
+            ValueError: If the config references unknown features/factors or uses an unknown comparator
+        """
+        features = config['features']
+        rules = config['rules']
+        if len(rules) > _MAX_RULES:
+            raise ValueError(f"At most {_MAX_RULES} rules are supported, got {len(rules)}")
+
+        self.feature_names = [f['name'] for f in features]
+        self.feature_sections = [f['section'] for f in features]
+        feature_index = {name: i for i, name in enumerate(self.feature_names)}
+
+        self.factors = [r['factor'] for r in rules]
+        factor_index = {name: i for i, name in enumerate(self.factors)}
+        if len(factor_index) != len(self.factors):
+            raise ValueError("Duplicate factor names in risk rules")
+        self.messages = [r.get('message', r['factor']) for r in rules]
+
+        n = len(rules)
+        self.rule_feature = np.empty(n, dtype=np.intp)
+        self.direction = np.empty(n, dtype=np.float64)
+        self.strict = np.empty(n, dtype=bool)
+        self.threshold = np.empty(n, dtype=np.float64)
+        self.is_high = np.empty(n, dtype=bool)
+        self.weight = np.empty(n, dtype=np.float64)
+        self.suppress_mask = np.zeros(n, dtype=np.uint32)
+        self.bits = (np.uint32(1) << np.arange(n, dtype=np.uint32)).astype(np.uint32)
+
+        for i, rule in enumerate(rules):
+            if rule['feature'] not in feature_index:
+                raise ValueError(f"Rule '{rule['factor']}' uses unknown feature '{rule['feature']}'")
+            if rule['op'] not in _COMPARATORS:
+                raise ValueError(f"Rule '{rule['factor']}' uses unknown comparator '{rule['op']}'")
+            if rule.get('severity', 'moderate') not in _SEVERITIES:
+                raise ValueError(f"Rule '{rule['factor']}' has unknown severity '{rule.get('severity')}'")
+            self.rule_feature[i] = feature_index[rule['feature']]
+            self.direction[i], self.strict[i] = _COMPARATORS[rule['op']]
+            self.threshold[i] = float(rule['threshold'])
+            self.is_high[i] = rule.get('severity', 'moderate') == 'high'
+            self.weight[i] = float(rule.get('weight', 1.0))
+            for other in rule.get('unless', []):
+                if other not in factor_index:
+                    raise ValueError(f"Rule '{rule['factor']}' is suppressed by unknown factor '{other}'")
+                self.suppress_mask[i] |= self.bits[factor_index[other]]
+
+        self.high_mask = np.uint32(self.bits[self.is_high].sum())
+
+        # Overall levels are checked in order; the first satisfied one wins
+        levels = config.get('overall', [])
+        self.level_names = [level['level'] for level in levels] + [config.get('default_level', 'low')]
+        self.level_min_high = np.array([level.get('min_high', 0) for level in levels], dtype=np.int64)
+        self.level_min_moderate = np.array([level.get('min_moderate', 0) for level in levels], dtype=np.int64)
+        self._level_labels = np.array(self.level_names, dtype=object)
+        self.config = config
+
+        # Plain-Python copies for evaluate(): on a single record, NumPy call overhead
+        # outweighs the handful of comparisons
+        self._scalar_rules = [
+            (int(f), float(d), bool(s), float(t), int(b), int(m), bool(h), float(w))
+            for f, d, s, t, b, m, h, w in zip(self.rule_feature, self.direction, self.strict, self.threshold,
+                                              self.bits, self.suppress_mask, self.is_high, self.weight)
+        ]
+        self._scalar_levels = list(zip(self.level_names, self.level_min_high.tolist(),
+                                       self.level_min_moderate.tolist()))
+        self._feature_keys = list(zip(self.feature_sections, self.feature_names))
+
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a JSON rules file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def feature_vector(self, acoustic_features, silence_stats):
+        """
+        Gather the rule inputs for one record (missing features count as 0).
+
+        Returns:
+            x (np.array): float64 vector aligned with feature_names
+        """
+        sections = {'acoustic_features': acoustic_features or {}, 'silence_stats': silence_stats or {}}
+        return np.array([
+            sections[section].get(name, 0) for name, section in zip(self.feature_names, self.feature_sections)
+        ], dtype=np.float64)
+
+    def evaluate_matrix(self, X):
+        """
+        Evaluate all rules on a (n_records, n_features) matrix.
+
+        Args:
+            X (np.array): Feature matrix with columns in feature_names order
+
+        Returns:
+            scores (dict): 'risk_factors' (uint32 bitmask per row), 'high_risk_count',
+                'moderate_risk_count', 'risk_score' (sum of rule weights),
+                'overall_risk_code' (index into level_names) and 'overall_risk'
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        delta = self.direction * (X[:, self.rule_feature] - self.threshold)
+        hits = (delta > 0) | (~self.strict & (delta == 0))
+
+        raw_mask = hits.astype(np.uint32) @ self.bits
+        # A tiered rule (e.g. "reduced" variability) is dropped when its stronger tier fired
+        hits &= (raw_mask[:, None] & self.suppress_mask) == 0
+        mask = hits.astype(np.uint32) @ self.bits
+
+        high = (hits & self.is_high).sum(axis=1)
+        moderate = hits.sum(axis=1) - high
+        satisfied = (high[:, None] >= self.level_min_high) & (moderate[:, None] >= self.level_min_moderate)
+        # First satisfied level, or the default level (last index) when none is
+        code = np.where(satisfied.any(axis=1), satisfied.argmax(axis=1), len(self.level_names) - 1)
+
+        return {
+            'overall_risk': self._level_labels[code],
+            'overall_risk_code': code,
+            'risk_factors': mask,
+            'high_risk_count': high,
+            'moderate_risk_count': moderate,
+            'risk_score': hits.astype(np.float64) @ self.weight,
+        }
+
+    def evaluate(self, acoustic_features, silence_stats):
+        """
+        Evaluate one record.
+
+        Same semantics as evaluate_matrix (missing features count as 0, None/NaN
+        never triggers a rule), computed with plain Python floats since a single
+        record is too small to amortize NumPy call overhead.
+
+        Args:
+            acoustic_features (dict): Acoustic feature dictionary
+            silence_stats (dict): Silence pattern statistics
+
+        Returns:
+            assessment (dict): 'overall_risk', 'risk_factors' (names, in rule order),
+                'high_risk_count', 'moderate_risk_count', 'risk_score'
+        """
+        sections = {'acoustic_features': acoustic_features or {}, 'silence_stats': silence_stats or {}}
+        x = []
+        for section, name in self._feature_keys:
+            value = sections[section].get(name, 0)
+            x.append(float('nan') if value is None else float(value))
+
+        hits = []
+        raw_mask = 0
+        for rule in self._scalar_rules:
+            feature, direction, strict, threshold, bit = rule[:5]
+            delta = direction * (x[feature] - threshold)
+            if delta > 0 or (not strict and delta == 0):
+                hits.append(rule)
+                raw_mask |= bit
+        # A tiered rule (e.g. "reduced" variability) is dropped when its stronger tier fired
+        hits = [rule for rule in hits if not raw_mask & rule[5]]
+
+        mask = high = 0
+        risk_score = 0.0
+        for _, _, _, _, bit, _, is_high, weight in hits:
+            mask |= bit
+            high += is_high
+            risk_score += weight
+        moderate = len(hits) - high
+        overall_risk = self.level_names[-1]
+        for level, min_high, min_moderate in self._scalar_levels:
+            if high >= min_high and moderate >= min_moderate:
+                overall_risk = level
+                break
+
+        return {
+            'overall_risk': overall_risk,
+            'risk_factors': self.decode(mask),
+            'high_risk_count': high,
+            'moderate_risk_count': moderate,
+            'risk_score': risk_score,
+        }
+
+    def decode(self, mask):
+        """Expand a risk factor bitmask into factor names (rule order)."""
+        mask = int(mask)
+        return [name for i, name in enumerate(self.factors) if mask & (1 << i)]
+
+    def message(self, factor):
+        """Human-readable message for a factor."""
+        return self.messages[self.factors.index(factor)]
+
+
+@lru_cache(maxsize=None)
+def _load_rules(path):
+    return RiskRuleSet.from_file(path)
+
+
+def default_rules():
+    """
+    The compiled rule set from RISK_RULES_PATH (or the bundled risk_rules.json).
+
+    Compiled once per path and cached for the process lifetime.
+    """
+    return _load_rules(os.environ.get(RULES_PATH_ENV, DEFAULT_RULES_PATH))
@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+from logs import get_logger
+
+logger = get_logger("scheduler")
+
+# Lower value = served first
+PRIORITIES = {'crisis': 0, 'elevated': 1, 'routine': 2}
+DEFAULT_PRIORITY = 'routine'
+
+# Words the pre-screen reads: the first transcript chunk (LSTM input length)
+PRESCREEN_WORDS = 300
+
+CRISIS_PATTERNS = re.compile(
+    r"\b(kill(ing)? myself|suicid\w*|end (it all|my life)|want(ed)? to die|better off dead"
+    r"|no reason to live|hurt(ing)? myself|self[- ]harm\w*|can'?t go on|take my (own )?life)\b",
+    re.IGNORECASE,
+)
+ELEVATED_PATTERNS = re.compile(
+    r"\b(hopeless\w*|worthless|empty inside|can'?t cope|give up|no way out|dying)\b",
+    re.IGNORECASE,
+)
+
+
+def prescreen(text, classifier=None, threshold=0.5):
+    """
+    Cheap triage of the first transcript chunk.
+
+    Args:
+        text (str): Transcript (only the first PRESCREEN_WORDS words are read)
+        classifier (callable): Optional text -> (label, probability), e.g. the
+            Bi-LSTM predict_sentiment; a confident "Suicidal" marks a crisis
+        threshold (float): Minimum probability for the classifier's label to count
+
+    Returns:
+        priority (str): 'crisis', 'elevated' or 'routine'
+    """
+    head = " ".join(str(text or "").split()[:PRESCREEN_WORDS])
+    if CRISIS_PATTERNS.search(head):
+        return 'crisis'
+    if classifier is not None and head:
+        label, probability = classifier(head)
+        if probability >= threshold:
+            if str(label).lower() == 'suicidal':
+                return 'crisis'
+            if str(label).lower() in ('depression', 'bipolar'):
+                return 'elevated'
+    if ELEVATED_PATTERNS.search(head):
+        return 'elevated'
+    return DEFAULT_PRIORITY
+
+
+class PriorityScheduler:
+    """
+    Worker-thread job scheduler that serves higher-priority jobs first.
+
+    Queued jobs are ordered by (priority, arrival), so a crisis submission
+    overtakes every routine job still waiting. Running jobs are not
+    interrupted; instead `reserved` workers only ever take crisis jobs, so one
+    can start as soon as it arrives even when long routine work occupies the
+    shared workers.
+    """
+
+    def __init__(self, workers=4, reserved=1, name="scheduler"):
+        """
+        Args:
+            workers (int): Total worker threads
+            reserved (int): Workers that only run crisis jobs (must leave at least one shared worker)
+            name (str): Thread name prefix
+        """
+        if not 0 <= reserved < workers:
+            raise ValueError(f"reserved ({reserved}) must be between 0 and workers - 1 ({workers - 1})")
+        self.workers = workers
+        self.reserved = reserved
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._waits = {name: [] for name in PRIORITIES}
+        self._threads = [
+            threading.Thread(target=self._work, args=(i < reserved,), name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func, *args, priority=None, text=None, classifier=None, **kwargs):
+        """
+        Queue a job.
+
+        Args:
+            func (callable): Job body, called as func(*args, **kwargs)
+            priority (str): 'crisis', 'elevated' or 'routine'; pre-screened from `text` when omitted
+            text (str): Transcript (or its first chunk) used by the pre-screen
+            classifier (callable): Optional pre-screen classifier (see prescreen)
+
+        Returns:
+            future (concurrent.futures.Future): Job result
+        """
+        if priority is None:
+            priority = prescreen(text, classifier) if text is not None else DEFAULT_PRIORITY
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of {list(PRIORITIES)}")
+
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("scheduler is shut down")
+            heapq.heappush(self._heap, (PRIORITIES[priority], next(self._sequence), time.perf_counter(),
+                                        priority, future, func, args, kwargs))
+            self._condition.notify_all()
+        if priority == 'crisis':
+            logger.info("🚨 Crisis job queued ahead of %d waiting jobs", len(self._heap) - 1)
+        return future
+
+    def _next_job(self, reserved):
+        with self._condition:
+            while True:
+                if self._heap and (not reserved or self._heap[0][0] == PRIORITIES['crisis']):
+                    return heapq.heappop(self._heap)
+                # Closed: shared workers drain the queue; reserved ones stop once no crisis job is left
+                if self._closed and (not self._heap or reserved):
+                    return None
+                self._condition.wait()
+
+    def _work(self, reserved):
+        while True:
+            job = self._next_job(reserved)
+            if job is None:
+                return
+            _, _, queued, priority, future, func, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            wait = time.perf_counter() - queued
+            with self._condition:
+                self._waits[priority].append(wait)
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def queue_depth(self):
+        with self._condition:
+            return {name: sum(1 for job in self._heap if job[3] == name) for name in PRIORITIES}
+
+    def wait_percentiles(self, percentiles=(50, 95, 99)):
+        """
+        Queue wait (submit to start) per priority class.
+
+        Returns:
+            report (dict): {priority: {'count', 'p50_ms', 'p95_ms', ...}}
+        """
+        report = {}
+        with self._condition:
+            waits = {name: sorted(values) for name, values in self._waits.items()}
+        for name, values in waits.items():
+            entry = {'count': len(values)}
+            for p in percentiles:
+                entry[f'p{p}_ms'] = values[min(len(values) - 1, int(p / 100 * len(values)))] * 1000 if values else 0.0
+            report[name] = entry
+        return report
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs; workers exit once the queue is drained."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
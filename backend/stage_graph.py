@@ -0,0 +1,401 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from logs import configure_logging, get_logger
+from parallel_features import PYIN_PARAMS
+from risk_rules import RiskRuleSet
+
+logger = get_logger("stages")
+
+STAGE_CACHE_DIR_ENV = "STAGE_CACHE_DIR"
+
+# Report statuses
+COMPUTED = "computed"
+MEMORY = "memory"
+DISK = "disk"
+SKIPPED = "skipped"  # not needed: every stage downstream of it was reused
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One node of the preprocessing DAG.
+
+    `run(preprocessor, sr, inputs, params)` gets the outputs of `inputs` (and
+    `hints`) by stage name. A stage's cache key covers its own parameters and
+    the keys of its inputs, so changing a parameter invalidates that stage and
+    everything downstream of it, and nothing upstream. `hints` are passed to
+    run but stay out of the key: they may change how a stage runs, not its result
+    (silence segments only decide where parallel pyin splits the signal).
+    `key_params` drops parameters the current configuration ignores (top_db
+    without the top_db VAD), so sweeping them reuses the cached output.
+    Parameters must be JSON-serializable so keys are stable across processes.
+    Bump `version` when a stage's code changes its output.
+    """
+    name: str
+    run: object
+    defaults: object
+    inputs: tuple = ()
+    hints: tuple = ()
+    version: int = 1
+    # params -> the subset that can change the output (defaults to all of them)
+    key_params: object = None
+
+
+def _decode(pp, sr, inputs, params):
+    configured, pp.target_sr = pp.target_sr, params['target_sr']
+    try:
+        audio, _ = pp.load_audio(inputs['source'])
+    finally:
+        pp.target_sr = configured
+    if audio is None:
+        raise RuntimeError(f"Could not load {inputs['source']}")
+    return audio
+
+
+def _silence(pp, sr, inputs, params):
+    return pp.analyze_silence_patterns(inputs['decode'], sr, **params)
+
+
+def _silence_key(params):
+    # top_db only drives librosa's splitter; min_silence_duration only the adaptive detector
+    ignored = 'min_silence_duration' if params['vad'] == 'top_db' else 'top_db'
+    return {name: value for name, value in params.items() if name != ignored}
+
+
+def _denoise(pp, sr, inputs, params):
+    return pp.remove_background_noise(inputs['decode'], sr, **params)
+
+
+def _filter(pp, sr, inputs, params):
+    return pp.apply_bandpass_filter(inputs['denoise'], sr, **params)
+
+
+def _normalize(pp, sr, inputs, params):
+    return pp.normalize_audio(inputs['filter'], **params)
+
+
+def _pitch(pp, sr, inputs, params):
+    segments, _ = inputs['silence']
+    return pp.pitch_track(inputs['normalize'], sr, segments=segments, **params)
+
+
+def _acoustic(pp, sr, inputs, params):
+    # Pitch statistics plus the voice-quality measures (jitter, shimmer, HNR, formants)
+    return pp.extract_all_acoustic_features(None, sr, f0=inputs['pitch'])
+
+
+def _prosody(pp, sr, inputs, params):
+    segments, _ = inputs['silence']
+    if not segments or not len(inputs['pitch']):
+        return {}
+    return pp.extract_segment_prosody(inputs['normalize'], sr, segments, inputs['pitch'])
+
+
+def _risk(pp, sr, inputs, params):
+    _, silence_stats = inputs['silence']
+    rules = params['rules']
+    if rules != pp.risk_rules.config:
+        return RiskRuleSet(rules).evaluate(inputs['acoustic'], silence_stats)
+    return pp.analyze_depression_indicators(inputs['acoustic'], silence_stats)
+
+
+# Same order and dependencies as the gap-preserving preprocess_audio path
+STAGES = OrderedDict((stage.name, stage) for stage in (
+    Stage('decode', _decode, lambda pp: {'target_sr': pp.target_sr}, inputs=('source',)),
+    Stage('silence', _silence, lambda pp: {'top_db': 25, 'vad': pp.vad,
+                                           'min_silence_duration': pp.min_silence_duration},
+          inputs=('decode',), key_params=_silence_key),
+    Stage('denoise', _denoise, lambda pp: {'method': 'nonstationary'}, inputs=('decode',)),
+    Stage('filter', _filter, lambda pp: {'lowcut': 80, 'highcut': 4000}, inputs=('denoise',)),
+    Stage('normalize', _normalize, lambda pp: {'method': 'peak'}, inputs=('filter',)),
+    Stage('pitch', _pitch, lambda pp: {'fmin': PYIN_PARAMS['fmin'], 'fmax': PYIN_PARAMS['fmax']},
+          inputs=('normalize',), hints=('silence',)),
+    Stage('acoustic', _acoustic, lambda pp: {}, inputs=('pitch',)),
+    Stage('prosody', _prosody, lambda pp: {}, inputs=('normalize', 'silence', 'pitch')),
+    Stage('risk', _risk, lambda pp: {'rules': pp.risk_rules.config}, inputs=('acoustic', 'silence')),
+))
+
+DEFAULT_TARGETS = ('silence', 'acoustic', 'prosody', 'risk')
+
+
+def _nbytes(value):
+    """Approximate memory held by an artifact (arrays dominate)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value) + 8 * len(value)
+    return 64
+
+
+class ArtifactCache:
+    """
+    Stage outputs by key: an in-memory LRU bounded in bytes, plus an optional directory.
+
+    The directory tier (one pickle per artifact) lets separate runs and
+    processes of a parameter sweep share upstream stages. It holds trusted
+    local data only; don't point it at a shared or writable-by-others location.
+    """
+
+    def __init__(self, max_bytes=2 * 1024 ** 3, directory=None):
+        """
+        Args:
+            max_bytes (int): Memory budget for cached artifacts
+            directory (str): Disk tier (defaults to STAGE_CACHE_DIR; None = memory only)
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory if directory is not None else os.environ.get(STAGE_CACHE_DIR_ENV) or None
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Returns:
+            (tier, value): tier is MEMORY, DISK or None (miss)
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return MEMORY, self._entries[key][0]
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as f:
+                value = pickle.load(f)
+            self._remember(key, value)
+            return DISK, value
+        return None, None
+
+    def _remember(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            # Write-then-rename so a concurrent reader never sees a partial file
+            tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+
+def source_key(file_path):
+    """Identity of an input file: absolute path, size and modification time."""
+    path = os.path.abspath(os.fspath(file_path))
+    stat = os.stat(path)
+    return hashlib.sha256(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class GraphRun:
+    """Outputs of one StageGraph.run and what happened to each stage."""
+    outputs: dict
+    report: list = field(default_factory=list)
+
+    def reused(self):
+        return [entry['stage'] for entry in self.report if entry['status'] in (MEMORY, DISK)]
+
+    def computed(self):
+        return [entry['stage'] for entry in self.report if entry['status'] == COMPUTED]
+
+    def result(self):
+        """The target outputs under preprocess_audio's result keys."""
+        outputs = self.outputs
+        result = {}
+        if 'silence' in outputs:
+            result['segments'], result['silence_stats'] = outputs['silence']
+        if 'normalize' in outputs:
+            result['processed_audio'] = outputs['normalize']
+        if 'decode' in outputs:
+            result['original_audio'] = outputs['decode']
+        for stage, key in (('acoustic', 'acoustic_features'), ('prosody', 'segment_prosody'),
+                           ('risk', 'depression_analysis')):
+            if stage in outputs:
+                result[key] = outputs[stage]
+        return result
+
+
+class StageGraph:
+    """
+    preprocess_audio as a DAG of memoized stages.
+
+    decode -> denoise -> filter -> normalize -> pitch -> acoustic -> risk, with
+    silence on the decoded audio feeding risk and the per-segment prosody.
+    Stage outputs are cached under a key of the stage's parameters and its
+    inputs' keys, so a sweep over e.g. pitch fmin or the risk rules only
+    reruns the stages downstream of the changed parameter. Keys are computed
+    before anything runs, and an upstream artifact is only loaded when a stage
+    that needs it has to be recomputed.
+    """
+
+    def __init__(self, preprocessor=None, cache=None):
+        """
+        Args:
+            preprocessor (AudioPreprocessor): Supplies the stage implementations and defaults
+            cache (ArtifactCache): Artifact store (a memory-only one by default)
+        """
+        if preprocessor is None:
+            from audio import AudioPreprocessor
+
+            preprocessor = AudioPreprocessor(profile=False)
+        self.preprocessor = preprocessor
+        self.cache = cache if cache is not None else ArtifactCache()
+
+    def resolve_params(self, params=None):
+        """Every stage's effective parameters: its defaults updated with params[stage]."""
+        params = params or {}
+        unknown = set(params) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages {sorted(unknown)}, expected some of {list(STAGES)}")
+        return {name: {**stage.defaults(self.preprocessor), **params.get(name, {})} for name, stage in STAGES.items()}
+
+    def keys(self, file_path, params=None):
+        """Cache key of every stage for this input and parameters (nothing is run)."""
+        resolved = self.resolve_params(params)
+        keys = {'source': source_key(file_path)}
+        for name, stage in STAGES.items():
+            params = stage.key_params(resolved[name]) if stage.key_params else resolved[name]
+            try:
+                material = json.dumps([name, stage.version, params, [keys[i] for i in stage.inputs]],
+                                      sort_keys=True)
+            except TypeError as e:
+                # A repr-based key (e.g. an object's address) would differ between processes
+                raise ValueError(f"Parameters of stage '{name}' must be JSON-serializable: {e}") from None
+            keys[name] = hashlib.sha256(material.encode("utf-8")).hexdigest()
+        return keys
+
+    def run(self, file_path, params=None, targets=DEFAULT_TARGETS):
+        """
+        Produce the target stages, reusing every cached artifact whose key still matches.
+
+        Args:
+            file_path (str): Audio file
+            params (dict): {stage: {param: value}} overrides, e.g.
+                {'silence': {'top_db': 30}, 'pitch': {'fmin': 60}}
+            targets (iterable): Stages whose outputs are returned
+
+        Returns:
+            run (GraphRun): outputs by stage, and a report entry per needed stage
+                (stage, status, seconds, key) in pipeline order
+        """
+        resolved = self.resolve_params(params)
+        keys = self.keys(file_path, params)
+        sr = resolved['decode']['target_sr']
+        values = {'source': file_path}
+        status = {}
+        seconds = {}
+
+        def value(name):
+            if name in values:
+                return values[name]
+            tier, cached = self.cache.get(keys[name])
+            if tier is not None:
+                status[name], seconds[name] = tier, 0.0
+                values[name] = cached
+                return cached
+            stage = STAGES[name]
+            inputs = {dependency: value(dependency) for dependency in stage.inputs + stage.hints}
+            start = time.perf_counter()
+            output = stage.run(self.preprocessor, sr, inputs, resolved[name])
+            seconds[name] = time.perf_counter() - start
+            status[name] = COMPUTED
+            self.cache.put(keys[name], output)
+            values[name] = output
+            return output
+
+        outputs = {name: value(name) for name in targets}
+
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name in needed or name == 'source':
+                continue
+            needed.add(name)
+            pending.extend(STAGES[name].inputs)
+        report = [
+            {'stage': name, 'status': status.get(name, SKIPPED), 'seconds': seconds.get(name, 0.0),
+             'key': keys[name][:12]}
+            for name in STAGES if name in needed or name in status
+        ]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("♻️ Stages reused: %s; computed: %s",
+                        ", ".join(e['stage'] for e in report if e['status'] in (MEMORY, DISK)) or "none",
+                        ", ".join(e['stage'] for e in report if e['status'] == COMPUTED) or "none")
+        return GraphRun(outputs, report)
+
+    def sweep(self, file_path, stage, param, values, params=None, targets=DEFAULT_TARGETS):
+        """
+        Run once per value of one parameter; later runs reuse everything upstream of `stage`.
+
+        Returns:
+            runs (list): (value, GraphRun) pairs
+        """
+        runs = []
+        for v in values:
+            overrides = {name: dict(p) for name, p in (params or {}).items()}
+            overrides.setdefault(stage, {})[param] = v
+            runs.append((v, self.run(file_path, overrides, targets)))
+        return runs
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the stage DAG and show which stages are reused")
+    parser.add_argument("file", nargs="?", default="whats.wav")
+    parser.add_argument("--sweep", default="pitch.fmin=60,75,90",
+                        help="stage.param=v1,v2,... (e.g. silence.min_silence_duration=0.3,0.5)")
+    parser.add_argument("--set", action="append", default=[], metavar="STAGE.PARAM=VALUE",
+                        help="Fixed parameter for every run (repeatable), e.g. silence.vad=top_db")
+    parser.add_argument("--cache-dir", default=None, help="Disk tier shared across runs (default: memory only)")
+    args = parser.parse_args()
+    configure_logging(verbose=False)
+
+    fixed = {}
+    for item in args.set:
+        name, value = item.split("=", 1)
+        stage, param = name.split(".", 1)
+        fixed.setdefault(stage, {})[param] = _parse_value(value)
+    name, raw_values = args.sweep.split("=", 1)
+    stage, param = name.split(".", 1)
+
+    graph = StageGraph(cache=ArtifactCache(directory=args.cache_dir))
+    for v, run in graph.sweep(args.file, stage, param, [_parse_value(x) for x in raw_values.split(",")], fixed):
+        total = sum(entry['seconds'] for entry in run.report)
+        risk = run.outputs.get('risk', {}).get('overall_risk', '-')
+        print(f"\n{stage}.{param}={v}: {total:.2f}s, risk {risk}")
+        for entry in run.report:
+            print(f"  {entry['stage']:>9} | {entry['status']:>8} | {entry['seconds']:>6.2f}s | {entry['key']}")
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import soundfile as sf
+
+# Durations (seconds) covered by the benchmark corpus, from 5 s up to 2 h
+CORPUS_DURATIONS = [5, 30, 120, 600, 1800, 7200]
+
+# Signals are generated in independent blocks so that long files never need
+# more than one block of temporaries and every block is reproducible on its own
+BLOCK_SECONDS = 60
+
+
+def _block_rng(seed, block_index):
+    return np.random.default_rng([seed, 1, block_index])
+
+
+def _pause_rng(seed):
+    return np.random.default_rng([seed, 0, 0])
+
+
+def generate_speech_like(duration, sr=16000, seed=0, f0_base=120.0, f0_range=0.25,
+                         syllable_rate=4.0, n_harmonics=12, pause_every=4.0,
+                         pause_duration=(0.3, 1.8), snr_db=20.0):
+    """
+    Generate a deterministic speech-like signal.
+
+    Voiced segments are harmonic tones whose f0 follows a slow contour with
+    syllable-rate amplitude modulation; pauses of random length are inserted
+    roughly every `pause_every` seconds and white noise is added at `snr_db`.
+
+    Args:
+        duration (float): Length of the signal in seconds
+        sr (int): Sample rate
+        seed (int): Random seed; the same arguments always produce the same signal
+        f0_base (float): Mean fundamental frequency in Hz
+        f0_range (float): Relative f0 excursion of the contour (0.25 = ±25%)
+        syllable_rate (float): Syllables per second (amplitude modulation rate)
+        n_harmonics (int): Number of harmonics in the voiced source
+        pause_every (float): Mean speech run length between pauses in seconds
+        pause_duration (tuple): (min, max) pause length in seconds
+        snr_db (float): Signal-to-noise ratio of the added white noise
+
+    Returns:
+        audio (np.array): float32 signal in [-1, 1]
+        truth (dict): Ground truth with 'pauses' [(start, end), ...] in samples
+            and the f0 contour parameters used
+    """
+    n_samples = int(round(duration * sr))
+    audio = np.empty(n_samples, dtype=np.float32)
+    block_len = int(BLOCK_SECONDS * sr)
+    harmonics = np.arange(1, n_harmonics + 1, dtype=np.float64)
+    # Spectral tilt similar to a glottal source (-6 dB/octave)
+    harmonic_gain = 1.0 / harmonics
+    pauses = []
+    phase = 0.0
+
+    # Pause placement is drawn once for the whole signal so it does not depend on blocks
+    pause_rng = _pause_rng(seed)
+    t = pause_rng.exponential(pause_every)
+    while t < duration:
+        length = pause_rng.uniform(*pause_duration)
+        start = int(t * sr)
+        end = min(int((t + length) * sr), n_samples)
+        pauses.append((start, end))
+        t += length + pause_rng.exponential(pause_every)
+
+    for block_index, block_start in enumerate(range(0, n_samples, block_len)):
+        block_end = min(block_start + block_len, n_samples)
+        rng = _block_rng(seed, block_index)
+        times = np.arange(block_start, block_end, dtype=np.float64) / sr
+
+        # Slow f0 contour: two incommensurate sinusoids give a non-repeating intonation
+        contour = (np.sin(2 * np.pi * 0.21 * times + seed)
+                   + 0.5 * np.sin(2 * np.pi * 0.053 * times + 2 * seed)) / 1.5
+        f0 = f0_base * (1.0 + f0_range * contour)
+
+        # Integrate instantaneous frequency so the phase is continuous across blocks
+        inst_phase = phase + 2 * np.pi * np.cumsum(f0) / sr
+        phase = float(inst_phase[-1])
+
+        voiced = np.zeros(len(times))
+        for k, gain in zip(harmonics, harmonic_gain):
+            # Skip harmonics above Nyquist
+            if k * f0_base * (1 + f0_range) >= sr / 2:
+                break
+            voiced += gain * np.sin(k * inst_phase)
+
+        # Syllable envelope: raised cosine at syllable rate, jittered per block
+        syllable_phase = rng.uniform(0, 2 * np.pi)
+        envelope = 0.5 * (1 - np.cos(2 * np.pi * syllable_rate * times + syllable_phase))
+        # Scale by the worst-case harmonic sum so the level is identical in every block
+        block = voiced * envelope / harmonic_gain.sum()
+
+        for start, end in pauses:
+            if end <= block_start or start >= block_end:
+                continue
+            block[max(start, block_start) - block_start:min(end, block_end) - block_start] = 0.0
+
+        noise_rms = np.sqrt(np.mean(block ** 2)) / (10 ** (snr_db / 20)) if snr_db is not None else 0.0
+        block += rng.standard_normal(len(block)) * noise_rms
+        audio[block_start:block_end] = block * 0.5
+
+    truth = {
+        'pauses': pauses,
+        'f0_base': f0_base,
+        'f0_range': f0_range,
+        'sample_rate': sr,
+        'duration': duration,
+    }
+    return audio, truth
+
+
+def corpus_file(duration, output_dir="bench_corpus", sr=16000, seed=0, **kwargs):
+    """
+    Write (or reuse) a synthetic WAV file for the given parameters.
+
+    Files are cached under a name derived from a hash of all parameters, so a
+    corpus is generated once and shared by subsequent benchmark runs.
+
+    Args:
+        duration (float): Length in seconds
+        output_dir (str): Directory holding the corpus
+        sr (int): Sample rate
+        seed (int): Random seed
+        **kwargs: Extra generate_speech_like parameters
+
+    Returns:
+        path (str): Path to the WAV file
+    """
+    params = {'duration': duration, 'sr': sr, 'seed': seed, **kwargs}
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:10]
+    path = os.path.join(output_dir, f"synthetic_{int(duration)}s_{digest}.wav")
+    if not os.path.exists(path):
+        os.makedirs(output_dir, exist_ok=True)
+        audio, _ = generate_speech_like(duration, sr=sr, seed=seed, **kwargs)
+        tmp_path = path + ".tmp.wav"
+        sf.write(tmp_path, audio, sr, subtype='PCM_16')
+        os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,319 @@
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from logs import get_logger
+
+logger = get_logger("trends")
+
+# name -> (result section, key, direction). Direction +1 means higher values
+# point towards depression risk, -1 means lower values do.
+TRACKED_FEATURES = {
+    'f0_cv': ('acoustic_features', 'f0_coeff_variation', -1),
+    'monotony': ('acoustic_features', 'pitch_monotony_index', +1),
+    'pause_duration': ('silence_stats', 'average_silence_duration', +1),
+    'speech_silence_ratio': ('silence_stats', 'speech_to_silence_ratio', -1),
+}
+
+# speech_to_silence_ratio is inf when no silence was found; cap it so one
+# recording can't blow up the running mean
+RATIO_CAP = 50.0
+
+# Floor for the baseline standard deviation so a very stable user doesn't
+# produce huge z-scores from tiny changes
+MIN_STD = {
+    'f0_cv': 0.01,
+    'monotony': 0.01,
+    'pause_duration': 0.05,
+    'speech_silence_ratio': 0.1,
+}
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass(slots=True)
+class EwmaStat:
+    """Exponentially weighted mean/variance updated in O(1) per observation."""
+    mean: float = 0.0
+    var: float = 0.0
+    count: int = 0
+
+    def update(self, value, alpha):
+        if self.count == 0:
+            self.mean, self.var = value, 0.0
+        else:
+            delta = value - self.mean
+            self.mean += alpha * delta
+            # Incremental EW variance (West, 1979)
+            self.var = (1 - alpha) * (self.var + alpha * delta * delta)
+        self.count += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+
+@dataclass(slots=True)
+class BaselineStat:
+    """
+    Personal baseline: a plain running mean/variance (Welford) over the first
+    `warmup` sessions, then a slow EWMA so the baseline follows long-term drift.
+    """
+    mean: float = 0.0
+    m2: float = 0.0
+    count: int = 0
+
+    def update(self, value, warmup, alpha):
+        self.count += 1
+        if self.count <= warmup:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (value - self.mean)
+        else:
+            # m2 stores the variance directly once in EWMA mode
+            if self.count == warmup + 1:
+                self.m2 = self.m2 / max(warmup - 1, 1)
+            delta = value - self.mean
+            self.mean += alpha * delta
+            self.m2 = (1 - alpha) * (self.m2 + alpha * delta * delta)
+
+    def variance(self, warmup):
+        if self.count <= warmup:
+            return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        return self.m2
+
+
+class UserTrend:
+    """Incremental aggregates for one user; every update is O(number of features)."""
+
+    __slots__ = ('recent', 'baseline', 'sessions', 'last_timestamp', 'last_day', 'streak_days')
+
+    def __init__(self):
+        self.recent = {name: EwmaStat() for name in TRACKED_FEATURES}
+        self.baseline = {name: BaselineStat() for name in TRACKED_FEATURES}
+        self.sessions = 0
+        self.last_timestamp = None
+        self.last_day = None
+        self.streak_days = 0
+
+    def to_dict(self):
+        return {
+            'recent': {k: [v.mean, v.var, v.count] for k, v in self.recent.items()},
+            'baseline': {k: [v.mean, v.m2, v.count] for k, v in self.baseline.items()},
+            'sessions': self.sessions,
+            'last_timestamp': self.last_timestamp,
+            'last_day': self.last_day,
+            'streak_days': self.streak_days,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        trend = cls()
+        for k, (mean, var, count) in data.get('recent', {}).items():
+            if k in trend.recent:
+                trend.recent[k] = EwmaStat(mean, var, count)
+        for k, (mean, m2, count) in data.get('baseline', {}).items():
+            if k in trend.baseline:
+                trend.baseline[k] = BaselineStat(mean, m2, count)
+        trend.sessions = data.get('sessions', 0)
+        trend.last_timestamp = data.get('last_timestamp')
+        trend.last_day = data.get('last_day')
+        trend.streak_days = data.get('streak_days', 0)
+        return trend
+
+
+def extract_session_features(result):
+    """
+    Pull the tracked features out of a preprocess_audio result.
+
+    Args:
+        result (dict): preprocess_audio result (or report with the same sections)
+
+    Returns:
+        features (dict): {feature name: float}; features missing from the result are omitted
+    """
+    features = {}
+    for name, (section, key, _) in TRACKED_FEATURES.items():
+        value = (result.get(section) or {}).get(key)
+        if value is None:
+            continue
+        value = float(value)
+        if math.isnan(value):
+            continue
+        if name == 'speech_silence_ratio':
+            value = min(value, RATIO_CAP)
+        features[name] = value
+    return features
+
+
+class TrendEngine:
+    """
+    Longitudinal per-user trend tracking with O(1) updates per session.
+
+    For each user the engine keeps a fast EWMA of every tracked feature (recent
+    trend), a personal baseline (running mean over the first sessions, then a
+    slow EWMA) and a daily streak counter. Deviation from the personal baseline
+    is scored as a signed z-score where positive always means "towards risk".
+    """
+
+    def __init__(self, recent_alpha=0.3, baseline_alpha=0.05, warmup_sessions=5,
+                 deviation_threshold=2.0, state_path=None):
+        """
+        Args:
+            recent_alpha (float): EWMA weight of the newest session for the recent trend
+            baseline_alpha (float): EWMA weight for the baseline after warm-up
+            warmup_sessions (int): Sessions averaged equally to form the initial baseline
+            deviation_threshold (float): |z| above which a feature is flagged
+            state_path (str): Optional JSON file to load/save aggregates
+        """
+        self.recent_alpha = recent_alpha
+        self.baseline_alpha = baseline_alpha
+        self.warmup_sessions = warmup_sessions
+        self.deviation_threshold = deviation_threshold
+        self.state_path = state_path
+        self.users = {}
+        self._lock = threading.Lock()
+        if state_path and os.path.exists(state_path):
+            self.load(state_path)
+
+    def _baseline_std(self, name, stat):
+        return max(math.sqrt(max(stat.variance(self.warmup_sessions), 0.0)), MIN_STD[name])
+
+    def update(self, user_id, result, timestamp=None):
+        """
+        Fold one session into the user's aggregates and score it.
+
+        The session is scored against the baseline as it was *before* this
+        session, so an outlier can't mask itself.
+
+        Args:
+            user_id (str): User identifier
+            result (dict): preprocess_audio result for the session
+            timestamp (float): Session time (epoch seconds); defaults to now
+
+        Returns:
+            report (dict): Deviation report (see score)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        features = extract_session_features(result)
+
+        with self._lock:
+            trend = self.users.get(user_id)
+            if trend is None:
+                trend = self.users[user_id] = UserTrend()
+
+            report = self._score(trend, features)
+
+            for name, value in features.items():
+                trend.recent[name].update(value, self.recent_alpha)
+                trend.baseline[name].update(value, self.warmup_sessions, self.baseline_alpha)
+
+            day = int(timestamp // SECONDS_PER_DAY)
+            if trend.last_day is None or day - trend.last_day > 1:
+                trend.streak_days = 1
+            elif day - trend.last_day == 1:
+                trend.streak_days += 1
+            trend.last_day = day if trend.last_day is None else max(day, trend.last_day)
+            trend.last_timestamp = timestamp
+            trend.sessions += 1
+
+            report['sessions'] = trend.sessions
+            report['streak_days'] = trend.streak_days
+            report['recent'] = {k: v.mean for k, v in trend.recent.items() if v.count}
+
+        logger.info("📈 Trend update for %s: session %d, personal risk %s",
+                    user_id, report['sessions'], report['personal_risk'],
+                    extra={'user_id': user_id, 'max_deviation': report['max_deviation']})
+        return report
+
+    def _score(self, trend, features):
+        deviations = {}
+        flagged = []
+        baseline_ready = trend.sessions >= self.warmup_sessions
+        for name, value in features.items():
+            stat = trend.baseline[name]
+            if stat.count < 2:
+                continue
+            direction = TRACKED_FEATURES[name][2]
+            z = direction * (value - stat.mean) / self._baseline_std(name, stat)
+            deviations[name] = z
+            if baseline_ready and z > self.deviation_threshold:
+                flagged.append(name)
+
+        max_deviation = max(deviations.values()) if deviations else 0.0
+        if not baseline_ready:
+            personal_risk = 'insufficient_history'
+        elif len(flagged) >= 2:
+            personal_risk = 'high'
+        elif flagged:
+            personal_risk = 'moderate'
+        else:
+            personal_risk = 'low'
+
+        return {
+            'deviations': deviations,
+            'flagged_features': flagged,
+            'max_deviation': max_deviation,
+            'personal_risk': personal_risk,
+            'baseline_ready': baseline_ready,
+        }
+
+    def score(self, user_id, result):
+        """
+        Score a session against the user's baseline without updating it.
+
+        Args:
+            user_id (str): User identifier
+            result (dict): preprocess_audio result
+
+        Returns:
+            report (dict): 'deviations' (signed z per feature, positive = towards risk),
+                'flagged_features', 'max_deviation', 'personal_risk', 'baseline_ready'
+        """
+        features = extract_session_features(result)
+        with self._lock:
+            trend = self.users.get(user_id) or UserTrend()
+            return self._score(trend, features)
+
+    def summary(self, user_id):
+        """
+        Current aggregates for a user (no history scan).
+
+        Returns:
+            summary (dict): Recent EWMA means, baseline means/stds, session count, streak
+        """
+        with self._lock:
+            trend = self.users.get(user_id)
+            if trend is None:
+                return {}
+            return {
+                'sessions': trend.sessions,
+                'streak_days': trend.streak_days,
+                'last_timestamp': trend.last_timestamp,
+                'recent': {k: v.mean for k, v in trend.recent.items() if v.count},
+                'baseline': {
+                    k: {'mean': v.mean, 'std': self._baseline_std(k, v)}
+                    for k, v in trend.baseline.items() if v.count
+                },
+            }
+
+    def save(self, path=None):
+        """Persist all user aggregates to a JSON file (atomic replace)."""
+        path = path or self.state_path
+        with self._lock:
+            state = {user_id: trend.to_dict() for user_id, trend in self.users.items()}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """Load user aggregates saved by save()."""
+        path = path or self.state_path
+        with open(path) as f:
+            state = json.load(f)
+        with self._lock:
+            self.users = {user_id: UserTrend.from_dict(data) for user_id, data in state.items()}
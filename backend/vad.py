@@ -0,0 +1,122 @@
+import numpy as np
+
+
+def frame_energy_db(audio, frame_length=1024, hop_length=256):
+    """
+    Per-frame energy in dB, computed in one pass over the signal.
+
+    Squares are summed per hop (a reshaped view, no full-length temporaries)
+    and frames are formed by summing frame_length // hop_length consecutive
+    hops. Frame i covers samples [i * hop_length, i * hop_length + frame_length).
+
+    Args:
+        audio (np.array): Mono signal
+        frame_length (int): Frame size in samples (a multiple of hop_length)
+        hop_length (int): Hop size in samples
+
+    Returns:
+        energy_db (np.array): Mean-square energy per frame in dB (float64)
+    """
+    if frame_length % hop_length:
+        raise ValueError(f"frame_length ({frame_length}) must be a multiple of hop_length ({hop_length})")
+    audio = np.asarray(audio, dtype=np.float32)
+    n_hops = -(-len(audio) // hop_length)
+    if n_hops == 0:
+        return np.zeros(0)
+
+    full = (len(audio) // hop_length) * hop_length
+    blocks = audio[:full].reshape(-1, hop_length)
+    hop_energy = np.zeros(n_hops + frame_length // hop_length, dtype=np.float64)
+    hop_energy[:len(blocks)] = np.einsum('ij,ij->i', blocks, blocks, dtype=np.float64)
+    if full < len(audio):
+        tail = audio[full:].astype(np.float64)
+        hop_energy[len(blocks)] = tail @ tail
+
+    # Sliding sum of k hops via a cumulative sum over the (short) hop series
+    k = frame_length // hop_length
+    cumulative = np.concatenate(([0.0], np.cumsum(hop_energy)))
+    frame_energy = (cumulative[k:k + n_hops] - cumulative[:n_hops]) / frame_length
+    return 10.0 * np.log10(frame_energy + 1e-12)
+
+
+def detect_speech(audio, sr, frame_length=1024, hop_length=256, floor_percentile=10.0,
+                  peak_percentile=95.0, enter_fraction=0.3, exit_fraction=0.15,
+                  min_range_db=6.0, min_silence_duration=0.5, min_speech_duration=0.1,
+                  silence_db=-60.0, digital_silence_db=-100.0):
+    """
+    Adaptive voice-activity detection returning non-silent intervals.
+
+    The noise floor and the speech level are estimated from percentiles of the
+    frame energies, so thresholds follow the recording instead of its single
+    loudest sample. Frames enter speech above floor + enter_fraction * range and
+    stay in speech down to floor + exit_fraction * range (hysteresis). Pauses
+    shorter than min_silence_duration are bridged, and isolated bursts shorter
+    than min_speech_duration (clicks) are dropped.
+
+    Args:
+        audio (np.array): Mono signal
+        sr (int): Sample rate
+        frame_length (int): Frame size in samples
+        hop_length (int): Hop size in samples
+        floor_percentile (float): Frame-energy percentile taken as the noise floor
+        peak_percentile (float): Frame-energy percentile taken as the speech level
+        enter_fraction (float): Speech onset threshold, as a fraction of the dB range above the floor
+        exit_fraction (float): Speech offset threshold (below enter_fraction)
+        min_range_db (float): With less dynamic range than this the file is one class:
+            all speech, or all silence when the level is below silence_db
+        min_silence_duration (float): Shortest pause kept as silence (seconds)
+        min_speech_duration (float): Shortest speech burst kept (seconds)
+        silence_db (float): Absolute level (dB re full scale) below which a flat file is all silence
+        digital_silence_db (float): Frames below this level (zeroed samples) are left out of
+            the floor and level estimates
+
+    Returns:
+        intervals (np.array): (n, 2) int array of [start, end) sample indices of speech,
+            like librosa.effects.split
+    """
+    energy_db = frame_energy_db(audio, frame_length, hop_length)
+    n = len(audio)
+    if len(energy_db) == 0:
+        return np.zeros((0, 2), dtype=int)
+
+    # Gated/denoised audio contains runs of exact zeros; they would pin the floor at -120 dB
+    audible = energy_db[energy_db > digital_silence_db]
+    if len(audible) == 0:
+        return np.zeros((0, 2), dtype=int)
+    floor, level = np.percentile(audible, [floor_percentile, peak_percentile])
+    if level - floor < min_range_db:
+        if level < silence_db:
+            return np.zeros((0, 2), dtype=int)
+        return np.array([[0, n]])
+
+    enter = floor + enter_fraction * (level - floor)
+    exit_ = floor + exit_fraction * (level - floor)
+
+    # Hysteresis without a per-frame loop: a speech region is a run of frames
+    # above the exit threshold that contains at least one frame above the enter threshold
+    above_exit = np.concatenate(([False], energy_db > exit_, [False]))
+    edges = np.flatnonzero(above_exit[1:] != above_exit[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    if len(starts) == 0:
+        return np.zeros((0, 2), dtype=int)
+    enter_count = np.concatenate(([0], np.cumsum(energy_db > enter)))
+    keep = enter_count[ends] > enter_count[starts]
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return np.zeros((0, 2), dtype=int)
+
+    # Frame runs -> sample intervals; each frame stands for the hop at its centre
+    offset = (frame_length - hop_length) // 2
+    starts = np.where(starts == 0, 0, starts * hop_length + offset)
+    ends = np.minimum(ends * hop_length + offset, n)
+
+    # Bridge pauses shorter than min_silence_duration (and runs whose frames overlap)
+    min_gap = max(int(min_silence_duration * sr), 1)
+    if len(starts) > 1:
+        split = (starts[1:] - ends[:-1]) >= min_gap
+        starts = starts[np.concatenate(([True], split))]
+        ends = ends[np.concatenate((split, [True]))]
+
+    # Drop clicks
+    long_enough = (ends - starts) >= int(min_speech_duration * sr)
+    return np.stack([starts[long_enough], ends[long_enough]], axis=1)
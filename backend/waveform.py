@@ -0,0 +1,135 @@
+import io
+
+import numpy as np
+
+# Default canvas: 14 x 10 inches at 100 dpi, as the interactive plot
+FIGSIZE = (14, 10)
+DPI = 100
+
+SEGMENT_COLORS = {'speech': 'green', 'silence': 'red'}
+
+
+def envelope(audio, n_columns):
+    """
+    Min/max envelope of a signal decimated to n_columns.
+
+    Each column covers an equal run of samples; drawing a vertical span
+    from its minimum to its maximum gives the same picture as plotting every
+    sample at that pixel width. Short signals are returned unchanged.
+
+    Args:
+        audio (np.array): Signal
+        n_columns (int): Column budget (roughly the plot width in pixels)
+
+    Returns:
+        positions (np.array): First sample of every column
+        lows (np.array), highs (np.array): Column minima and maxima
+    """
+    audio = np.asarray(audio)
+    n = len(audio)
+    if n <= 2 * n_columns:
+        positions = np.arange(n)
+        return positions, audio, audio
+    positions = np.linspace(0, n, n_columns, endpoint=False).astype(np.int64)
+    return positions, np.minimum.reduceat(audio, positions), np.maximum.reduceat(audio, positions)
+
+
+def segment_spans(segments, sr):
+    """
+    (start, width) spans in seconds per segment type, adjacent spans of a type merged.
+
+    Returns:
+        spans (dict): {type: [(start_s, width_s), ...]}
+    """
+    spans = {}
+    for segment in segments:
+        start, end = segment['start'] / sr, segment['end'] / sr
+        runs = spans.setdefault(segment['type'], [])
+        if runs and runs[-1][0] + runs[-1][1] >= start:
+            runs[-1] = (runs[-1][0], end - runs[-1][0])
+        else:
+            runs.append((start, end - start))
+    return spans
+
+
+def _plot_envelope(ax, audio, sr, n_columns, color, label):
+    positions, lows, highs = envelope(audio, n_columns)
+    times = positions / sr
+    if len(positions) == len(audio):
+        ax.plot(times, audio, alpha=0.7, color=color, label=label)
+    else:
+        ax.fill_between(times, lows, highs, step='post', alpha=0.7, color=color, linewidth=0, label=label)
+
+
+def draw_audio_with_segments(fig, original_audio, processed_audio, segments, sr, title="Audio Analysis"):
+    """
+    Draw original and processed audio with speech/silence spans onto fig.
+
+    Signals are drawn as min/max envelopes at the figure's pixel width, and
+    all spans of one segment type are a single broken_barh collection, so
+    drawing cost no longer grows with the recording length or segment count.
+
+    Args:
+        fig (matplotlib.figure.Figure): Empty figure to draw on
+        original_audio (np.array): Original audio signal
+        processed_audio (np.array): Processed audio signal
+        segments (list): Segment information
+        sr (int): Sample rate
+        title (str): Plot title
+    """
+    n_columns = max(1, int(fig.get_figwidth() * fig.dpi))
+    ax1, ax2 = fig.subplots(2, 1)
+
+    _plot_envelope(ax1, original_audio, sr, n_columns, 'blue', 'Original')
+    ax1.set_title(f'{title} - Original Audio with Segment Analysis')
+    ax1.set_ylabel('Amplitude')
+    ax1.grid(True)
+    # A fixed corner: loc='best' tests every envelope vertex and span for overlap
+    ax1.legend(loc='upper right')
+
+    _plot_envelope(ax2, processed_audio, sr, n_columns, 'orange', 'Processed')
+    # Full-height spans: x in seconds, y in axes coordinates
+    for segment_type, spans in segment_spans(segments, sr).items():
+        ax2.broken_barh(spans, (0, 1), transform=ax2.get_xaxis_transform(), alpha=0.3,
+                        color=SEGMENT_COLORS.get(segment_type, 'gray'), label=segment_type.capitalize())
+    ax2.set_title('Processed Audio with Speech/Silence Segments')
+    ax2.set_xlabel('Time (s)')
+    ax2.set_ylabel('Amplitude')
+    ax2.grid(True)
+    ax2.legend(loc='upper right')
+
+    fig.tight_layout()
+
+
+def render_audio_with_segments(original_audio, processed_audio, segments, sr, title="Audio Analysis",
+                               fmt='png', figsize=FIGSIZE, dpi=DPI):
+    """
+    Render the segment plot to image bytes without a display.
+
+    Uses a Figure on an Agg canvas rather than pyplot, so nothing is
+    registered globally and concurrent requests don't share state.
+
+    Args:
+        original_audio (np.array): Original audio signal
+        processed_audio (np.array): Processed audio signal
+        segments (list): Segment information
+        sr (int): Sample rate
+        title (str): Plot title
+        fmt (str): 'png' or 'svg'
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution; figsize[0] * dpi is the envelope's column budget
+
+    Returns:
+        image (bytes): Encoded image
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if fmt not in ('png', 'svg'):
+        raise ValueError(f"Unsupported format {fmt!r}, expected 'png' or 'svg'")
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    draw_audio_with_segments(fig, original_audio, processed_audio, segments, sr, title)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
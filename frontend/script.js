@@ -5,6 +5,10 @@ const API_BASE_URL = 'http://34.31.86.85/toofan';
 const UPLOAD_AUDIO_ENDPOINT = `${API_BASE_URL}/upload-audio/`;
 const TEXT_ANALYSIS_ENDPOINT = `${API_BASE_URL}/text-output/`;
 const finalize = `${API_BASE_URL}/final`;
+// Uploads may be queued: the API answers with a job_id that is polled here
+const JOB_STATUS_ENDPOINT = `${API_BASE_URL}/jobs/`;
+const JOB_POLL_INTERVAL_MS = 2000;
+const JOB_POLL_TIMEOUT_MS = 10 * 60 * 1000;
 
 // Global State
 let currentUser = null;
@@ -368,6 +372,23 @@ function showDashboardSection(sectionName) {
     closeSidebarOnMobile();
 }
 
+// Poll a queued analysis job until it finishes; resolves with the job's result
+async function pollJobResult(jobId, onProgress) {
+    const started = Date.now();
+    while (Date.now() - started < JOB_POLL_TIMEOUT_MS) {
+        const response = await fetch(`${JOB_STATUS_ENDPOINT}${encodeURIComponent(jobId)}`);
+        if (!response.ok) {
+            throw new Error(`Job status error! status: ${response.status}`);
+        }
+        const job = await response.json();
+        if (job.status === 'done') return job.result;
+        if (job.status === 'failed') throw new Error(`Analysis job failed: ${job.error || 'unknown error'}`);
+        if (onProgress) onProgress(job.status === 'running' ? 60 : 30);
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+    throw new Error("Analysis is taking longer than expected");
+}
+
 async function startAudioAnalysis(audioFile, filename = "audio.wav") {
     document.getElementById("analysis-progress").style.display = "block";
     try {
@@ -393,8 +414,10 @@ async function startAudioAnalysis(audioFile, filename = "audio.wav") {
             const errorText = await response.text();
             throw new Error(`HTTP error! status: ${response.status} - ${errorText}`);
         }
-        const result = await response.json();
-         
+        let result = await response.json();
+        if (result.job_id) {
+            result = await pollJobResult(result.job_id, updateProgress);
+        }
 
         const response1 = await fetch(finalize, {
             method: 'POST',
@@ -429,12 +452,26 @@ function completeAudioAnalysis(apiResult, isMock = false) {
     showAudioAnalysisInsights(analysisResults);
 }
 
+// Transcript-level emotions as [{label, score}] sorted by score.
+// Prefers the server-pooled dense result (emotion_matrix: labels + pooled vectors);
+// falls back to the first chunk of the legacy per-chunk list.
+function transcriptEmotions(respData) {
+    const dense = respData.emotion_matrix;
+    const pooled = dense?.pooled?.word_weighted || dense?.pooled?.duration_weighted;
+    if (dense && Array.isArray(dense.labels) && pooled) {
+        return dense.labels
+            .map((label, i) => ({ label, score: pooled[i] || 0 }))
+            .sort((a, b) => b.score - a.score);
+    }
+    return respData.returned_json?.[0]?.emotions || [];
+}
+
 // MODIFIED: This function now extracts all relevant data
 function processAudioApiResponse(apiResult) {
     // --- Data Extraction ---
     const respData = apiResult.response || {};
     const pitchData = respData.pitch_analysis || {};
-    const emotionsData = respData.returned_json?.[0]?.emotions || []; // Get emotions from the first chunk for dashboard overview
+    const emotionsData = transcriptEmotions(respData);
 
     // --- Video Link Extraction from resp_json.resp string ---
     const recommendedVideos = [];
@@ -455,10 +492,8 @@ function processAudioApiResponse(apiResult) {
     }
 
     // --- Helper to find emotion scores (0-100 scale) ---
-    const getEmotionScore = (label) => {
-        const emotion = emotionsData.find(e => e.label === label);
-        return emotion ? Math.floor(emotion.score * 100) : 0; // Ensure whole number percentage
-    };
+    const emotionScores = Object.fromEntries(emotionsData.map(e => [e.label, e.score]));
+    const getEmotionScore = (label) => Math.floor((emotionScores[label] || 0) * 100); // Ensure whole number percentage
 
     // --- Processed Results Object ---
     return {
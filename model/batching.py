@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+
+logger = logging.getLogger("depression.batching")
+logger.addHandler(logging.NullHandler())
+
+
+class BatchMetrics:
+    """Achieved batch sizes, queue waits and forward-pass times of a MicroBatcher."""
+
+    def __init__(self, window=10000):
+        self.batches = 0
+        self.items = 0
+        self.size_histogram = Counter()
+        # Recent samples only, so percentiles follow the current load
+        self.waits_ms = deque(maxlen=window)
+        self.forward_ms = deque(maxlen=window)
+
+    def record(self, size, waits_ms, forward_ms):
+        self.batches += 1
+        self.items += size
+        self.size_histogram[size] += 1
+        self.waits_ms.extend(waits_ms)
+        self.forward_ms.append(forward_ms)
+
+    @staticmethod
+    def _percentile(values, q):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self):
+        """
+        Returns:
+            metrics (dict): batches, items, mean_batch_size, batch_size_histogram,
+                wait p50/p95 (ms, enqueue to forward start) and mean forward time (ms)
+        """
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'batch_size_histogram': dict(sorted(self.size_histogram.items())),
+            'wait_p50_ms': self._percentile(self.waits_ms, 0.50),
+            'wait_p95_ms': self._percentile(self.waits_ms, 0.95),
+            'forward_mean_ms': sum(self.forward_ms) / len(self.forward_ms) if self.forward_ms else 0.0,
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item requests into batched forward passes.
+
+    Callers `await batcher.submit(item)`. The first queued item opens a batch
+    that closes after `max_wait_ms` or once `max_batch` items have arrived,
+    whichever comes first. The batch function then runs once, in a worker
+    thread so the event loop keeps accepting requests, and each caller gets its
+    own result (or the batch's exception).
+    """
+
+    def __init__(self, batch_fn, max_batch=32, max_wait_ms=5.0, name="batcher"):
+        """
+        Args:
+            batch_fn (callable): list of items -> list of results (same order and length)
+            max_batch (int): Largest batch
+            max_wait_ms (float): Longest time the first item of a batch waits for company
+            name (str): Name used in logs
+        """
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self.metrics = BatchMetrics()
+        self._queue = None
+        self._worker = None
+        self._closed = False
+
+    async def submit(self, item):
+        """
+        Queue one item and wait for its result.
+
+        Raises:
+            RuntimeError: The batcher has been closed
+            asyncio.CancelledError: The batcher was closed while the item was pending
+        """
+        if self._closed:
+            raise RuntimeError(f"{self.name}: batcher is closed")
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((item, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self, batch):
+        # Fills `batch` in place, so items already taken off the queue are
+        # still reachable (and cancelled) if the worker is cancelled mid-collect
+        batch.append(await self._queue.get())
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch:
+            # Take whatever is already queued before sleeping on the deadline
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - asyncio.get_running_loop().time()
+            if len(batch) >= self.max_batch or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        batch = []
+        try:
+            await self._serve(batch)
+        except asyncio.CancelledError:
+            # aclose(): callers of the in-flight batch must not wait forever
+            _cancel(batch)
+            raise
+
+    async def _serve(self, batch):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch.clear()
+            await self._collect(batch)
+            items = [item for item, _, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(None, self.batch_fn, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                logger.error("❌ %s batch of %d failed: %s", self.name, len(items), e)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finished = time.perf_counter()
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self.metrics.record(len(batch), [(started - queued) * 1000 for _, _, queued in batch],
+                                (finished - started) * 1000)
+            logger.debug("📦 %s: batch of %d in %.1f ms", self.name, len(batch), (finished - started) * 1000)
+
+    async def aclose(self):
+        """Stop the background worker; pending callers are cancelled and later submits raise."""
+        self._closed = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            _cancel(queued)
+
+
+def _cancel(batch):
+    for _, future, _ in batch:
+        if not future.done():
+            future.cancel()
+
+
+def emotion_batcher(backend=None, **kwargs):
+    """MicroBatcher over the DistilRoBERTa emotion classifier; results are per-text score lists."""
+    from emotion_backends import load_emotion_classifier
+
+    classifier = load_emotion_classifier(backend)
+
+    def classify(texts):
+        return classifier(texts, batch_size=len(texts))
+    return MicroBatcher(classify, name="emotion", **kwargs)
+
+
+def sentiment_batcher(model_dir=None, **kwargs):
+    """MicroBatcher over the Bi-LSTM sentiment model; results are (label, probability)."""
+    from sentiment import predict_sentiment_batch
+
+    return MicroBatcher(lambda texts: predict_sentiment_batch(texts, model_dir), name="sentiment", **kwargs)
+
+
+def multitask_batcher(model_dir=None, **kwargs):
+    """MicroBatcher over the shared-encoder model; results are {'sentiment', 'emotions'} per text."""
+    from multitask import predict_multitask_batch
+
+    return MicroBatcher(lambda texts: predict_multitask_batch(texts, model_dir), name="multitask", **kwargs)
+
+
+async def _simulate(batcher, clients, requests_per_client, think_ms):
+    async def client(i):
+        for j in range(requests_per_client):
+            await batcher.submit(f"request {i}-{j}")
+            await asyncio.sleep(think_ms / 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    await batcher.aclose()
+    return clients * requests_per_client / elapsed
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Micro-batching under concurrent load")
+    parser.add_argument("--model", choices=("synthetic", "emotion", "sentiment", "multitask"), default="synthetic")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--think-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    from script_logging import configure_script_logging
+
+    configure_script_logging()
+
+    if args.model == "synthetic":
+        # Forward-pass cost model: fixed overhead plus a small per-item cost
+        def make():
+            return MicroBatcher(lambda items: time.sleep(0.004 + 0.0002 * len(items)) or items,
+                                max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, name="synthetic")
+    else:
+        factory = {'emotion': emotion_batcher, 'sentiment': sentiment_batcher,
+                   'multitask': multitask_batcher}[args.model]
+
+        def make():
+            return factory(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+
+    for label, max_batch in (("batch size 1", 1), (f"micro-batched (<= {args.max_batch})", args.max_batch)):
+        batcher = make()
+        batcher.max_batch = max_batch
+        throughput = asyncio.run(_simulate(batcher, args.clients, args.requests, args.think_ms))
+        print(f"\n{label}: {throughput:.0f} requests/s")
+        print(json.dumps(batcher.metrics.snapshot(), indent=2))
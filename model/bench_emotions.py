@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from emotion_backends import BACKENDS, load_emotion_classifier
+from emotions import TEST_TEXTS
+
+DEFAULT_TRANSCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test.json")
+
+
+def parity_texts(transcript_path=DEFAULT_TRANSCRIPT):
+    """The fixed parity set: emotions.TEST_TEXTS plus the chunks of test.json."""
+    texts = list(TEST_TEXTS)
+    if os.path.exists(transcript_path):
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            texts.extend(chunk['text'] for chunk in json.load(f)['chunks'])
+    return texts
+
+
+def _scores(classifier, texts, batch_size=8):
+    outputs = classifier(texts, batch_size=batch_size)
+    return [{e['label']: e['score'] for e in out} for out in outputs]
+
+
+def compare_backends(backends, texts, reference="torch", repeat=20, batch_size=8):
+    """
+    Measure accuracy parity and CPU latency/throughput of emotion backends.
+
+    Args:
+        backends (list): Backends to evaluate (see emotion_backends.BACKENDS)
+        texts (list): Parity text set
+        reference (str): Backend whose outputs count as ground truth
+        repeat (int): Timed passes over the text set
+        batch_size (int): Batch size for the throughput measurement
+
+    Returns:
+        report (dict): Per backend: top1_agreement, max_abs_diff, p50/p95 single-text
+            latency (ms) and batched throughput (texts/s)
+    """
+    reference_scores = _scores(load_emotion_classifier(reference, device=-1), texts, batch_size)
+    reference_top1 = [max(s, key=s.get) for s in reference_scores]
+
+    report = {}
+    for backend in backends:
+        classifier = load_emotion_classifier(backend, device=-1)
+        # Warm-up (graph build, lazy weight init)
+        classifier(texts[:2])
+
+        scores = _scores(classifier, texts, batch_size)
+        top1 = [max(s, key=s.get) for s in scores]
+        agreement = sum(a == b for a, b in zip(top1, reference_top1)) / len(texts)
+        max_diff = max(abs(s[label] - r[label]) for s, r in zip(scores, reference_scores) for label in r)
+
+        latencies = []
+        for _ in range(repeat):
+            for text in texts:
+                start = time.perf_counter()
+                classifier(text)
+                latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            classifier(texts, batch_size=batch_size)
+        throughput = repeat * len(texts) / (time.perf_counter() - start)
+
+        report[backend] = {
+            'top1_agreement': agreement,
+            'max_abs_diff': max_diff,
+            'latency_p50_ms': statistics.median(latencies),
+            'latency_p95_ms': latencies[int(0.95 * (len(latencies) - 1))],
+            'throughput_texts_per_s': throughput,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare emotion classifier backends on CPU")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--min-agreement", type=float, default=1.0,
+                        help="Fail if a backend's top-1 agreement with torch is below this")
+    parser.add_argument("--max-diff", type=float, default=0.05,
+                        help="Fail if a backend's largest per-label score difference exceeds this")
+    args = parser.parse_args()
+
+    texts = parity_texts()
+    report = compare_backends(args.backends.split(","), texts, repeat=args.repeat, batch_size=args.batch_size)
+
+    print(f"{'backend':>8} | {'top-1 agree':>11} | {'max |Δp|':>8} | {'p50 ms':>7} | {'p95 ms':>7} | {'texts/s':>8}")
+    failed = False
+    for backend, r in report.items():
+        ok = r['top1_agreement'] >= args.min_agreement and r['max_abs_diff'] <= args.max_diff
+        failed |= not ok
+        print(f"{backend:>8} | {r['top1_agreement']:>11.2%} | {r['max_abs_diff']:>8.4f} | "
+              f"{r['latency_p50_ms']:>7.1f} | {r['latency_p95_ms']:>7.1f} | {r['throughput_texts_per_s']:>8.1f}"
+              f"{'' if ok else '  ❌ parity'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
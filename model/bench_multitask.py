@@ -0,0 +1,120 @@
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import multitask
+import sentiment
+from bench_emotions import parity_texts
+from emotion_backends import load_emotion_classifier
+
+
+def _emotion_scores(outputs):
+    return np.array([[{e['label']: e['score'] for e in out}[label] for label in multitask.EMOTION_LABELS]
+                     for out in outputs], dtype=np.float32)
+
+
+def _timed(fn, texts, repeat, batch_size):
+    # Memo bypassed on purpose: every call below is a real forward pass
+    fn(texts[:2])
+    latencies = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            fn([text])
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i in range(0, len(texts), batch_size):
+            fn(texts[i:i + batch_size])
+    throughput = repeat * len(texts) / (time.perf_counter() - start)
+    return {
+        'latency_p50_ms': statistics.median(latencies),
+        'latency_p95_ms': latencies[int(0.95 * (len(latencies) - 1))],
+        'throughput_texts_per_s': throughput,
+    }
+
+
+def compare(texts, labels=None, sentiment_dir=None, multitask_dir=None, backend=None, repeat=5, batch_size=8):
+    """
+    Shared-encoder model vs. running the Bi-LSTM and the emotion classifier separately.
+
+    Args:
+        texts (list): Evaluation texts
+        labels (list): Gold sentiment labels (None: sentiment accuracy is skipped)
+        sentiment_dir (str): Bi-LSTM artifacts (see sentiment.load_sentiment_model)
+        multitask_dir (str): Multi-task artifacts (see multitask.load_multitask_model)
+        backend (str): Emotion classifier backend (the separate pipeline and the reference)
+        repeat (int): Timed passes
+        batch_size (int): Batch size for the throughput measurement
+
+    Returns:
+        report (dict): {'separate': {...}, 'multitask': {...}} with sentiment_accuracy,
+            emotion top-1 agreement / mean |Δp| against the emotion classifier, and latency
+    """
+    classifier = load_emotion_classifier(backend)
+
+    def separate(batch):
+        return (sentiment._predict(batch, sentiment_dir or "."),
+                classifier(batch, batch_size=len(batch), truncation=True))
+
+    def shared(batch):
+        return multitask._predict(batch, multitask_dir or ".")
+
+    lstm, reference = separate(texts)
+    reference = _emotion_scores(reference)
+    combined = shared(texts)
+    predicted = _emotion_scores([r['emotions'] for r in combined])
+
+    report = {
+        'separate': {'emotion_top1_agreement': 1.0, 'emotion_mean_abs_diff': 0.0, **_timed(separate, texts, repeat, batch_size)},
+        'multitask': {
+            'emotion_top1_agreement': float(np.mean(predicted.argmax(axis=1) == reference.argmax(axis=1))),
+            'emotion_mean_abs_diff': float(np.abs(predicted - reference).mean()),
+            **_timed(shared, texts, repeat, batch_size),
+        },
+    }
+    if labels is not None:
+        report['separate']['sentiment_accuracy'] = float(np.mean([p[0] == y for p, y in zip(lstm, labels)]))
+        report['multitask']['sentiment_accuracy'] = float(np.mean([r['sentiment'][0] == y
+                                                                   for r, y in zip(combined, labels)]))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-task text model vs. the two separate classifiers")
+    parser.add_argument("--csv", help='Labeled CSV ("Combined Data.csv"); its held-out test split is used')
+    parser.add_argument("--limit", type=int, default=500, help="Test-split rows to evaluate")
+    parser.add_argument("--sentiment-dir", default=None)
+    parser.add_argument("--multitask-dir", default=None)
+    parser.add_argument("--backend", default=None, help="Emotion classifier backend")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    labels = None
+    if args.csv:
+        import pandas as pd
+
+        df = pd.read_csv(args.csv).dropna(subset=["text", "sentiment"]).reset_index(drop=True)
+        test = multitask.split_frame(df)[2].head(args.limit)
+        texts, labels = [str(t) for t in test["text"]], list(test["sentiment"])
+    else:
+        texts = parity_texts()
+
+    report = compare(texts, labels, args.sentiment_dir, args.multitask_dir, args.backend,
+                     args.repeat, args.batch_size)
+    print(f"{'pipeline':>9} | {'sent. acc':>9} | {'emo top-1':>9} | {'emo |Δp|':>8} | "
+          f"{'p50 ms':>7} | {'p95 ms':>7} | {'texts/s':>8}")
+    for name, r in report.items():
+        accuracy = f"{r['sentiment_accuracy']:>9.2%}" if 'sentiment_accuracy' in r else f"{'-':>9}"
+        print(f"{name:>9} | {accuracy} | {r['emotion_top1_agreement']:>9.2%} | {r['emotion_mean_abs_diff']:>8.4f} | "
+              f"{r['latency_p50_ms']:>7.1f} | {r['latency_p95_ms']:>7.1f} | {r['throughput_texts_per_s']:>8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
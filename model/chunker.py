@@ -0,0 +1,251 @@
+import json
+import logging
+import math
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+
+logger = logging.getLogger("depression.chunker")
+logger.addHandler(logging.NullHandler())
+
+# DistilRoBERTa accepts 512 positions including <s> and </s>
+EMOTION_MAX_TOKENS = 512
+SPECIAL_TOKENS = 2
+# The Bi-LSTM pads/truncates to MAX_SEQUENCE_LENGTH words (test.ipynb)
+LSTM_MAX_WORDS = 300
+
+# Sentence = run of text up to and including terminal punctuation (or end of text)
+_SENTENCE_RE = re.compile(r"[^.!?\n]+(?:[.!?]+[\"')\]]*|\n|$)")
+_WORD_RE = re.compile(r"\S+")
+
+
+@lru_cache(maxsize=None)
+def load_tokenizer(model_name=None):
+    """
+    Load the emotion model's fast tokenizer for exact token counts.
+
+    Returns:
+        tokenizer or None: None when transformers or the model files are unavailable,
+            in which case token counts are estimated from words
+    """
+    try:
+        from transformers import AutoTokenizer
+        from emotion_backends import EMOTION_MODEL
+
+        return AutoTokenizer.from_pretrained(model_name or EMOTION_MODEL)
+    except Exception as e:
+        logger.warning("⚠️ Tokenizer unavailable (%s); estimating token counts from words", e)
+        return None
+
+
+def estimate_tokens(text):
+    """Rough BPE token estimate: ~1.3 tokens per word plus punctuation marks."""
+    words = text.split()
+    return int(math.ceil(len(words) * 1.3)) + len(re.findall(r"[^\w\s]", text))
+
+
+class TranscriptChunker:
+    """
+    Splits transcripts into token-budgeted, overlapping windows aligned to sentences.
+
+    Every window fits both the emotion transformer (subword tokens) and the
+    sentiment LSTM (words). Consecutive windows share `overlap_sentences`
+    sentences of context, single sentences longer than the budget are split at
+    word boundaries, and a short trailing window is folded into the previous one.
+    """
+
+    def __init__(self, token_budget=EMOTION_MAX_TOKENS - SPECIAL_TOKENS, word_budget=LSTM_MAX_WORDS,
+                 overlap_sentences=1, min_chunk_tokens=32, tokenizer="auto"):
+        """
+        Args:
+            token_budget (int): Max subword tokens per window (excluding special tokens)
+            word_budget (int): Max words per window
+            overlap_sentences (int): Sentences repeated at the start of the next window
+            min_chunk_tokens (int): A trailing window smaller than this is merged backwards when it fits
+            tokenizer: HF tokenizer, None to estimate counts, or "auto" to load the emotion model's tokenizer
+        """
+        self.token_budget = token_budget
+        self.word_budget = word_budget
+        self.overlap_sentences = overlap_sentences
+        self.min_chunk_tokens = min_chunk_tokens
+        self.tokenizer = load_tokenizer() if tokenizer == "auto" else tokenizer
+
+    def _count_tokens(self, texts):
+        if not texts:
+            return []
+        if self.tokenizer is None:
+            return [estimate_tokens(t) for t in texts]
+        # One batched call for all sentences of the transcript
+        encoded = self.tokenizer(texts, add_special_tokens=False)['input_ids']
+        return [len(ids) for ids in encoded]
+
+    def _sentences(self, text):
+        """Sentence spans as (start, end, tokens, words), end exclusive, whitespace trimmed."""
+        spans = []
+        for match in _SENTENCE_RE.finditer(text):
+            start, end = match.span()
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if end > start:
+                spans.append((start, end))
+
+        token_counts = self._count_tokens([text[s:e] for s, e in spans])
+        sentences = []
+        for (start, end), tokens in zip(spans, token_counts):
+            words = len(text[start:end].split())
+            if tokens <= self.token_budget and words <= self.word_budget:
+                sentences.append((start, end, tokens, words))
+            else:
+                sentences.extend(self._split_long_sentence(text, start, end))
+        return sentences
+
+    def _split_long_sentence(self, text, start, end):
+        """Split one oversized sentence into word-aligned pieces that fit the budgets."""
+        words = [(m.start() + start, m.end() + start) for m in _WORD_RE.finditer(text[start:end])]
+        # Leading space matches how BPE tokenizes words inside a sentence
+        word_tokens = self._count_tokens([" " + text[s:e] for s, e in words])
+        pieces = []
+        piece_start = 0
+        tokens = 0
+        for i, count in enumerate(word_tokens):
+            if i > piece_start and (tokens + count > self.token_budget or i - piece_start >= self.word_budget):
+                pieces.append((words[piece_start][0], words[i - 1][1], tokens, i - piece_start))
+                piece_start, tokens = i, 0
+            tokens += count
+        pieces.append((words[piece_start][0], words[-1][1], tokens, len(words) - piece_start))
+        return pieces
+
+    def _fill(self, sentences, i):
+        """Pack sentences from index i until a budget would be exceeded."""
+        tokens = words = 0
+        j = i
+        while j < len(sentences):
+            _, _, t, w = sentences[j]
+            # +1 token per sentence boundary for the joining space
+            if j > i and (tokens + t + 1 > self.token_budget or words + w > self.word_budget):
+                break
+            tokens += t + (1 if j > i else 0)
+            words += w
+            j += 1
+        return j, tokens, words
+
+    def _windows(self, sentences):
+        """Greedy sentence packing with sentence overlap; returns [[first, last_exclusive, tokens, words]]."""
+        windows = []
+        n = len(sentences)
+        i = prev_end = 0
+        while i < n:
+            j, tokens, words = self._fill(sentences, i)
+            if j <= prev_end:
+                # The overlap left no room for new sentences; start fresh at the previous end
+                i = prev_end
+                j, tokens, words = self._fill(sentences, i)
+            windows.append([i, j, tokens, words])
+            if j >= n:
+                break
+            prev_end = j
+            i = max(j - self.overlap_sentences, i + 1)
+
+        # Fold a short trailing window into its predecessor when the result still fits
+        if len(windows) > 1 and windows[-1][2] < self.min_chunk_tokens:
+            prev, last = windows[-2], windows[-1]
+            extra = [s for s in range(prev[1], last[1])]
+            extra_tokens = sum(sentences[s][2] + 1 for s in extra)
+            extra_words = sum(sentences[s][3] for s in extra)
+            if prev[2] + extra_tokens <= self.token_budget and prev[3] + extra_words <= self.word_budget:
+                prev[1] = last[1]
+                prev[2] += extra_tokens
+                prev[3] += extra_words
+                windows.pop()
+        return windows
+
+    def chunk(self, text, transcript_id=None):
+        """
+        Chunk a transcript into the test.json schema.
+
+        Args:
+            text (str): Full transcript
+            transcript_id (str): Identifier; generated (uuid_epochms) when omitted
+
+        Returns:
+            transcript (dict): transcriptId, originalTranscript, chunks (id, text, wordCount,
+                tokenCount, startPosition, endPosition, timestamp), chunkingTimestamp,
+                totalChunks, totalWords
+        """
+        sentences = self._sentences(text)
+        chunks = []
+        for index, (first, last, tokens, words) in enumerate(self._windows(sentences)):
+            start = sentences[first][0]
+            end = sentences[last - 1][1]
+            chunks.append({
+                'id': index,
+                'text': text[start:end],
+                'wordCount': words,
+                'tokenCount': tokens,
+                'startPosition': start,
+                'endPosition': end,
+                'timestamp': f"Chunk_{index + 1}",
+            })
+
+        now = datetime.now(timezone.utc)
+        return {
+            'transcriptId': transcript_id or f"{uuid.uuid4()}_{int(time.time() * 1000)}",
+            'originalTranscript': text,
+            'chunks': chunks,
+            'chunkingTimestamp': now.strftime('%Y-%m-%dT%H:%M:%S.') + f"{now.microsecond // 1000:03d}Z",
+            'totalChunks': len(chunks),
+            'totalWords': len(text.split()),
+        }
+
+
+def pack_batches(chunks, max_batch_size=16, max_batch_tokens=4096):
+    """
+    Group chunks (from one or many transcripts) into inference batches.
+
+    Chunks are sorted by token count so each batch holds similar lengths
+    (little padding), and batches are filled up to max_batch_size or until the
+    padded size (longest chunk x batch size) would exceed max_batch_tokens.
+
+    Args:
+        chunks (list): Chunk dicts with 'tokenCount' (as produced by TranscriptChunker)
+        max_batch_size (int): Max chunks per batch
+        max_batch_tokens (int): Max padded tokens per batch
+
+    Returns:
+        batches (list): Lists of indices into `chunks`
+    """
+    order = sorted(range(len(chunks)), key=lambda i: chunks[i].get('tokenCount', 0))
+    batches = []
+    current = []
+    longest = 0
+    for i in order:
+        tokens = chunks[i].get('tokenCount', 0) + SPECIAL_TOKENS
+        padded = max(longest, tokens) * (len(current) + 1)
+        if current and (len(current) >= max_batch_size or padded > max_batch_tokens):
+            batches.append(current)
+            current, longest = [], 0
+        current.append(i)
+        longest = max(longest, tokens)
+    if current:
+        batches.append(current)
+    return batches
+
+
+if __name__ == "__main__":
+    import sys
+
+    from script_logging import configure_script_logging
+
+    configure_script_logging()
+    source = sys.argv[1] if len(sys.argv) > 1 else "test.json"
+    with open(source, 'r', encoding='utf-8') as f:
+        raw = f.read()
+    try:
+        transcript_text = json.loads(raw)['originalTranscript']
+    except (ValueError, KeyError, TypeError):
+        transcript_text = raw
+    print(json.dumps(TranscriptChunker().chunk(transcript_text), indent=2, ensure_ascii=False))
@@ -0,0 +1,113 @@
+import logging
+import os
+from functools import lru_cache
+
+logger = logging.getLogger("depression.emotions")
+logger.addHandler(logging.NullHandler())
+
+EMOTION_MODEL = "j-hartmann/emotion-english-distilroberta-base"
+
+# torch (full precision), int8 (PyTorch dynamic quantization) or onnx (ONNX Runtime)
+BACKEND_ENV = "EMOTION_BACKEND"
+BACKENDS = ("torch", "int8", "onnx")
+
+# Where the exported ONNX model is cached between runs
+ONNX_DIR_ENV = "EMOTION_ONNX_DIR"
+DEFAULT_ONNX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx", "emotion-distilroberta")
+
+
+def _torch_pipeline(device):
+    from transformers import pipeline
+
+    return pipeline("text-classification", model=EMOTION_MODEL, top_k=None, device=device)
+
+
+def _int8_pipeline():
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(EMOTION_MODEL)
+    model = AutoModelForSequenceClassification.from_pretrained(EMOTION_MODEL).eval()
+    # Dynamic quantization: Linear weights stored as int8, activations quantized on the fly.
+    # CPU only; this is where DistilRoBERTa spends nearly all of its time.
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("text-classification", model=quantized, tokenizer=tokenizer, top_k=None, device=-1)
+
+
+def _onnx_pipeline(onnx_dir, quantize):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+
+    model_file = "model_quantized.onnx" if quantize else "model.onnx"
+    if not os.path.exists(os.path.join(onnx_dir, model_file)):
+        logger.info("📦 Exporting %s to ONNX in %s", EMOTION_MODEL, onnx_dir)
+        model = ORTModelForSequenceClassification.from_pretrained(EMOTION_MODEL, export=True)
+        model.save_pretrained(onnx_dir)
+        AutoTokenizer.from_pretrained(EMOTION_MODEL).save_pretrained(onnx_dir)
+        if quantize:
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+            quantizer = ORTQuantizer.from_pretrained(onnx_dir)
+            config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=onnx_dir, quantization_config=config)
+
+    model = ORTModelForSequenceClassification.from_pretrained(onnx_dir, file_name=model_file)
+    tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+    return pipeline("text-classification", model=model, tokenizer=tokenizer, top_k=None)
+
+
+def resolve_backend(backend=None):
+    """Backend name from the argument or EMOTION_BACKEND (default 'torch')."""
+    backend = (backend or os.environ.get(BACKEND_ENV, "torch")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown emotion backend '{backend}', expected one of {BACKENDS}")
+    return backend
+
+
+def _resolve_device(device):
+    """torch device index: the argument, or GPU 0 when CUDA is available, else CPU (-1)."""
+    if device is not None:
+        return device
+    import torch
+
+    return 0 if torch.cuda.is_available() else -1
+
+
+def load_emotion_classifier(backend=None, device=None, onnx_quantize=True):
+    """
+    Load the DistilRoBERTa emotion classifier with the requested runtime.
+
+    Every backend returns a transformers text-classification pipeline with
+    top_k=None, so callers use it exactly like the original classifier.
+    Arguments are resolved before the cache lookup, so load_emotion_classifier()
+    and load_emotion_classifier('torch', device=-1) share one instance on a CPU host,
+    and settings a backend ignores don't create extra copies.
+
+    Args:
+        backend (str): 'torch' (full precision), 'int8' (dynamic int8 quantization,
+            CPU) or 'onnx' (ONNX Runtime, int8 by default); defaults to EMOTION_BACKEND or 'torch'
+        device (int): Device for the torch backend (-1 = CPU); auto-detected when None
+        onnx_quantize (bool): Use the int8-quantized ONNX graph for the onnx backend
+
+    Returns:
+        classifier: Callable pipeline mapping text(s) to per-label scores
+    """
+    backend = resolve_backend(backend)
+    if backend == "torch":
+        return _load_emotion_classifier(backend, device=_resolve_device(device))
+    if backend == "onnx":
+        return _load_emotion_classifier(backend, onnx_dir=os.environ.get(ONNX_DIR_ENV, DEFAULT_ONNX_DIR),
+                                        onnx_quantize=bool(onnx_quantize))
+    return _load_emotion_classifier(backend)
+
+
+@lru_cache(maxsize=None)
+def _load_emotion_classifier(backend, device=None, onnx_dir=None, onnx_quantize=True):
+    """Cached loader keyed on fully resolved arguments; see load_emotion_classifier."""
+    logger.info("🧠 Loading emotion classifier (%s backend)", backend)
+    if backend == "int8":
+        return _int8_pipeline()
+    if backend == "onnx":
+        return _onnx_pipeline(onnx_dir, onnx_quantize)
+    return _torch_pipeline(device)
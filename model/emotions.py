@@ -1,34 +1,57 @@
+import logging
 import warnings
 warnings.filterwarnings('ignore')
 
+# Silent by default; set DEPRESSION_VERBOSE=1 (or run as a script) for console output
+logger = logging.getLogger("depression.emotions")
+logger.addHandler(logging.NullHandler())
+
 try:
     from transformers import pipeline
-    print("✅ Transformers imported successfully")
+    logger.debug("✅ Transformers imported successfully")
 except ImportError as e:
-    print(f"❌ Failed to import transformers: {e}")
-    print("Try: pip install transformers torch")
+    logger.error("❌ Failed to import transformers: %s (try: pip install transformers torch)", e)
     exit(1)
 
-def classify_emotion(text):
-    """Classify emotions in text using DistilRoBERTa model"""
+from emotion_backends import load_emotion_classifier, resolve_backend
+from memo import get_memo
+
+# Fixed sample texts, also used as the parity set for the quantized backends
+TEST_TEXTS = [
+    "I want to cwetch someone so hard that they never become opposite of happy!",
+    "This is the worst day ever.",
+    "I'm so excited for the weekend!",
+    "I don't really care either way.",
+    "The tears of happiness from my eyes were like a river flowing down my cheeks.",
+]
+
+def classify_emotion(text, backend=None):
+    """
+    Classify emotions in text using DistilRoBERTa model (backend: torch, int8 or onnx).
+
+    Results are memoized per backend by a hash of the whitespace-normalized text
+    (see memo.py; MEMO_DB adds a disk tier shared across workers). Treat the
+    returned list as read-only.
+    """
+    backend = resolve_backend(backend)
+    return get_memo("emotion").get_or_compute(text, lambda t: _classify_emotion(t, backend), extra=backend)
+
+def _classify_emotion(text, backend):
     try:
-        # Initialize the emotion classifier
-        classifier = pipeline(
-            "text-classification", 
-            model="j-hartmann/emotion-english-distilroberta-base", 
-            top_k=None,
-            device=0 if torch.cuda.is_available() else -1  # Use GPU if available
-        )
+        # Get the (cached) emotion classifier; uses GPU if available for the torch backend
+        classifier = load_emotion_classifier(backend)
         
-        print(f"📝 Analyzing text: '{text}'")
+        logger.debug("📝 Analyzing text: '%s'", text)
         emotions = classifier(text)
         
-        print("\n🎭 Emotion Analysis Results:")
-        print("-" * 30)
-        
         # Sort by confidence score (highest first)
         sorted_emotions = sorted(emotions[0], key=lambda x: x['score'], reverse=True)
         
+        # Score bars are console-only output, skipped entirely unless verbose
+        if not logger.isEnabledFor(logging.DEBUG):
+            return sorted_emotions
+        
+        lines = ["🎭 Emotion Analysis Results:"]
         for emotion in sorted_emotions:
             confidence = emotion['score']
             label = emotion['label']
@@ -48,30 +71,27 @@ def classify_emotion(text):
             bar_length = int(confidence * 20)  # Scale for visual bar
             bar = '█' * bar_length + '░' * (20 - bar_length)
             
-            print(f"{emoji} {label.capitalize():>8}: {confidence:.4f} |{bar}|")
-            
+            lines.append(f"{emoji} {label.capitalize():>8}: {confidence:.4f} |{bar}|")
+        
+        logger.debug("\n".join(lines))
         return sorted_emotions
         
     except Exception as e:
-        print(f"❌ Error during emotion classification: {e}")
+        logger.error("❌ Error during emotion classification: %s", e)
         return None
 
 def main():
     # Test with your example
-    test_texts = [
-        "I want to cwetch someone so hard that they never become opposite of happy!",
-        "This is the worst day ever.",
-        "I'm so excited for the weekend!",
-        "I don't really care either way.",
-        "The tears of happiness from my eyes were like a river flowing down my cheeks.",
-    ]
-    
-    for text in test_texts:
+    for text in TEST_TEXTS:
         print("\n" + "="*50)
         classify_emotion(text)
         print()
 
 if __name__ == "__main__":
+    from script_logging import configure_script_logging
+
+    configure_script_logging()
+
     # Check if torch is available (optional but recommended)
     try:
         import torch
@@ -81,5 +101,5 @@ if __name__ == "__main__":
             print("💻 Using CPU for inference")
     except ImportError:
         print("⚠️  PyTorch not found, using CPU")
-    
+
     main()
\ No newline at end of file
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("depression.memo")
+logger.addHandler(logging.NullHandler())
+
+# MEMO_DB enables the on-disk tier (SQLite file shared by all worker processes)
+MEMO_DB_ENV = "MEMO_DB"
+MEMO_MAXSIZE_ENV = "MEMO_MAXSIZE"
+MEMO_TTL_ENV = "MEMO_TTL"
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL = 24 * 3600.0
+
+
+def normalize_whitespace(text):
+    """Collapse whitespace only (the transformer sees case and punctuation, so they stay)."""
+    return " ".join(str(text).split())
+
+
+class _DiskTier:
+    """SQLite key/value store with expiry, safe for concurrent processes (WAL)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._db().execute("CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                           "expires REAL NOT NULL)")
+
+    def _db(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key, now):
+        row = self._db().execute("SELECT value, expires FROM memo WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < now:
+            return None, None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, expires):
+        self._db().execute("INSERT OR REPLACE INTO memo (key, value, expires) VALUES (?, ?, ?)",
+                           (key, json.dumps(value), expires))
+
+    def purge(self, now):
+        return self._db().execute("DELETE FROM memo WHERE expires < ?", (now,)).rowcount
+
+
+class TextMemo:
+    """
+    LRU + TTL memo for text-model outputs keyed by a hash of the normalized text.
+
+    Lookups go to an in-process LRU first, then to an optional SQLite tier
+    shared by every worker on the host. Values must be JSON-serializable.
+    The key also covers a namespace (which model) and `extra` (backend,
+    model version), so different models never share entries.
+    """
+
+    def __init__(self, namespace, normalize=normalize_whitespace, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL,
+                 disk_path=None):
+        """
+        Args:
+            namespace (str): Model name, part of every key
+            normalize (callable): Text normalization applied before hashing; must map
+                texts to the same key only when the model's output is the same
+            maxsize (int): In-memory entries
+            ttl (float): Seconds an entry stays valid
+            disk_path (str): SQLite file for the shared tier (None = memory only)
+        """
+        self.namespace = namespace
+        self.normalize = normalize
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls, namespace, normalize=normalize_whitespace):
+        """Memo configured by MEMO_MAXSIZE, MEMO_TTL and MEMO_DB."""
+        return cls(namespace, normalize=normalize,
+                   maxsize=int(os.environ.get(MEMO_MAXSIZE_ENV, DEFAULT_MAXSIZE)),
+                   ttl=float(os.environ.get(MEMO_TTL_ENV, DEFAULT_TTL)),
+                   disk_path=os.environ.get(MEMO_DB_ENV) or None)
+
+    def key(self, text, extra=None):
+        normalized = self.normalize(text)
+        return hashlib.sha256(f"{self.namespace}\0{extra}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def _get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+                self.expirations += 1
+        if self._disk is not None:
+            value, expires = self._disk.get(key, now)
+            if expires is not None:
+                self._remember(key, value, expires)
+                with self._lock:
+                    self.disk_hits += 1
+                return True, value
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def _remember(self, key, value, expires):
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _store(self, key, value, now):
+        expires = now + self.ttl
+        self._remember(key, value, expires)
+        if self._disk is not None:
+            self._disk.set(key, value, expires)
+
+    def get_or_compute(self, text, compute, extra=None):
+        """
+        Cached value for `text`, computing (and storing) it on a miss.
+
+        None results (errors) are returned but not cached.
+        """
+        key = self.key(text, extra)
+        now = time.time()
+        found, value = self._get(key, now)
+        if found:
+            return value
+        value = compute(text)
+        if value is not None:
+            self._store(key, value, now)
+        return value
+
+    def get_or_compute_many(self, texts, compute_batch, extra=None):
+        """
+        Batched variant: only the texts that miss are passed to compute_batch, in one call.
+
+        Args:
+            texts (list): Inputs
+            compute_batch (callable): list of texts -> list of values (same order)
+            extra: Extra key component (e.g. backend name)
+
+        Returns:
+            values (list): One value per input text
+        """
+        now = time.time()
+        keys = [self.key(text, extra) for text in texts]
+        values = [None] * len(texts)
+        missing = {}
+        for i, key in enumerate(keys):
+            found, value = self._get(key, now)
+            if found:
+                values[i] = value
+            else:
+                # Duplicates within one batch are computed once
+                missing.setdefault(key, []).append(i)
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            computed = compute_batch([texts[i] for i in first])
+            for (key, indices), value in zip(missing.items(), computed):
+                if value is not None:
+                    self._store(key, value, now)
+                for i in indices:
+                    values[i] = value
+        return values
+
+    def purge_expired(self):
+        """Drop expired entries from both tiers; returns how many disk rows were removed."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires, _) in self._entries.items() if expires < now]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+        return self._disk.purge(now) if self._disk is not None else 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        """
+        Returns:
+            metrics (dict): hits (memory), disk_hits, misses, hit_ratio, size,
+                evictions, expirations
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'namespace': self.namespace,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+_memos = {}
+_memos_lock = threading.Lock()
+
+
+def get_memo(namespace, normalize=normalize_whitespace):
+    """Process-wide memo for a model (configured from the environment on first use)."""
+    with _memos_lock:
+        if namespace not in _memos:
+            _memos[namespace] = TextMemo.from_env(namespace, normalize=normalize)
+        return _memos[namespace]
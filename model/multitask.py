@@ -0,0 +1,300 @@
+import hashlib
+import logging
+import os
+import pickle
+from functools import lru_cache
+
+import numpy as np
+
+from memo import get_memo
+from sentiment import MAX_SEQUENCE_LENGTH, clean_text
+
+logger = logging.getLogger("depression.multitask")
+logger.addHandler(logging.NullHandler())
+
+MODEL_DIR_ENV = "MULTITASK_MODEL_DIR"
+MODEL_FILE = "multitask_model.h5"
+TOKENIZER_FILE = "multitask_tokenizer.pkl"
+LABEL_ENCODER_FILE = "multitask_label_encoder.pkl"
+
+# Same order as runner_emotions.EMOTION_LABELS (j-hartmann DistilRoBERTa)
+EMOTION_LABELS = ('anger', 'disgust', 'fear', 'joy', 'neutral', 'sadness', 'surprise')
+# Optional per-label soft-label columns in the training CSV (emotion_anger, ...)
+EMOTION_COLUMNS = tuple(f"emotion_{label}" for label in EMOTION_LABELS)
+
+# Training hyperparameters, as in test.ipynb
+MAX_NUM_WORDS = 20000
+EMBEDDING_DIM = 100
+BATCH_SIZE = 32
+EPOCHS = 20
+
+
+def emotion_targets(df, teacher_backend=None, batch_size=32, cache_path=None):
+    """
+    Emotion label distribution for every row of the training frame.
+
+    "Combined Data.csv" only has sentiment labels. If the frame carries
+    emotion_<label> columns (soft scores) or an `emotion` column (one label per
+    row) those are used; otherwise the DistilRoBERTa classifier labels the
+    texts and the model learns its distribution (distillation).
+
+    Args:
+        df (pd.DataFrame): Frame with a `text` column
+        teacher_backend (str): emotion_backends backend for the teacher
+        batch_size (int): Teacher batch size
+        cache_path (str): .npy file for teacher labels; labeling the full CSV
+            is slow, so they are reused while the texts and the teacher backend
+            are unchanged (hash stored in <cache_path>.key)
+
+    Returns:
+        targets (np.ndarray): (rows, 7) float32, rows sum to 1
+
+    Raises:
+        ValueError: Unknown `emotion` labels, or emotion_<label> rows that are
+            negative, non-finite or all zero
+    """
+    if all(column in df.columns for column in EMOTION_COLUMNS):
+        targets = df[list(EMOTION_COLUMNS)].to_numpy(dtype=np.float32)
+        totals = targets.sum(axis=1)
+        invalid = ~np.isfinite(totals) | (targets < 0).any(axis=1) | (totals <= 0)
+        if invalid.any():
+            raise ValueError(f"{int(invalid.sum())} rows have negative, missing or all-zero emotion_<label> "
+                             f"scores (first at index {df.index[np.argmax(invalid)]!r}); fix or drop them")
+        return targets / totals[:, None]
+    if "emotion" in df.columns:
+        index = {label: i for i, label in enumerate(EMOTION_LABELS)}
+        labels = df["emotion"].astype(str).str.strip().str.lower()
+        unknown = sorted(set(labels) - set(index))
+        if unknown:
+            raise ValueError(f"Unknown emotion labels {unknown}, expected some of {list(EMOTION_LABELS)}")
+        targets = np.zeros((len(df), len(EMOTION_LABELS)), dtype=np.float32)
+        targets[np.arange(len(df)), labels.map(index).to_numpy(dtype=np.int64)] = 1.0
+        return targets
+
+    from emotion_backends import load_emotion_classifier, resolve_backend
+
+    texts = [str(t) for t in df["text"]]
+    digest = hashlib.sha256()
+    digest.update(f"{resolve_backend(teacher_backend)}\0".encode("utf-8"))
+    for text in texts:
+        digest.update(text.encode("utf-8") + b"\0")
+    key = digest.hexdigest()
+    key_path = f"{cache_path}.key" if cache_path else None
+    if cache_path and os.path.exists(cache_path) and os.path.exists(key_path):
+        with open(key_path) as f:
+            if f.read().strip() == key:
+                logger.info("📦 Reusing teacher emotion labels from %s", cache_path)
+                return np.load(cache_path)
+
+    logger.info("🧠 Labeling %d texts with the emotion classifier (teacher)", len(df))
+    teacher = load_emotion_classifier(teacher_backend)
+    index = {label: i for i, label in enumerate(EMOTION_LABELS)}
+    targets = np.zeros((len(df), len(EMOTION_LABELS)), dtype=np.float32)
+    # The teacher sees the raw text (case, punctuation), truncated like in production
+    for start in range(0, len(texts), 1024):
+        outputs = teacher(texts[start:start + 1024], batch_size=batch_size, truncation=True)
+        for row, emotions in enumerate(outputs, start):
+            for e in emotions:
+                targets[row, index[e['label']]] = e['score']
+    if cache_path:
+        np.save(cache_path, targets)
+        with open(key_path, "w") as f:
+            f.write(key)
+    return targets
+
+
+def build_multitask_model(num_classes, num_words=MAX_NUM_WORDS, embedding_dim=EMBEDDING_DIM):
+    """
+    One shared encoder (the notebook's embedding + Bi-LSTM + dense) with two heads.
+
+    Returns:
+        model (tf.keras.Model): Outputs {'sentiment': (n, num_classes), 'emotion': (n, 7)}
+    """
+    import tensorflow as tf
+    from tensorflow.keras import layers
+
+    inputs = layers.Input(shape=(MAX_SEQUENCE_LENGTH,), name="tokens")
+    x = layers.Embedding(num_words, embedding_dim, name="embedding")(inputs)
+    x = layers.Bidirectional(layers.LSTM(64, dropout=0.3, recurrent_dropout=0.3), name="bidirectional")(x)
+    x = layers.Dense(64, activation="relu", name="shared_dense")(x)
+    x = layers.Dropout(0.5, name="dropout")(x)
+    sentiment = layers.Dense(num_classes, activation="softmax", name="sentiment")(x)
+    emotion = layers.Dense(len(EMOTION_LABELS), activation="softmax", name="emotion")(x)
+    return tf.keras.Model(inputs, {'sentiment': sentiment, 'emotion': emotion}, name="multitask")
+
+
+def split_frame(df):
+    """The notebook's 80/10/10 split (stratified on sentiment, random_state=42)."""
+    from sklearn.model_selection import train_test_split
+
+    train, temp = train_test_split(df, test_size=0.2, stratify=df["sentiment"], random_state=42)
+    val, test = train_test_split(temp, test_size=0.5, stratify=temp["sentiment"], random_state=42)
+    return train, val, test
+
+
+def train_multitask(csv_path, out_dir=".", emotion_weight=0.5, epochs=EPOCHS, batch_size=BATCH_SIZE,
+                    teacher_backend=None):
+    """
+    Train the shared-encoder model on "Combined Data.csv" plus emotion targets.
+
+    Both heads use categorical cross-entropy (soft targets for the emotion
+    head); emotion_weight scales the emotion loss against the sentiment loss.
+
+    Args:
+        csv_path (str): CSV with `text` and `sentiment` columns (optionally emotion labels, see emotion_targets)
+        out_dir (str): Where the model, tokenizer and label encoder are written
+        emotion_weight (float): Emotion loss weight
+        epochs (int): Maximum epochs (early stopping on validation loss)
+        batch_size (int): Training batch size
+        teacher_backend (str): Emotion teacher backend when the CSV has no emotion labels
+
+    Returns:
+        metrics (dict): Test-split sentiment accuracy and emotion top-1 agreement
+    """
+    import pandas as pd
+    import tensorflow as tf
+    from sklearn.preprocessing import LabelEncoder
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    df = pd.read_csv(csv_path).dropna(subset=["text", "sentiment"]).reset_index(drop=True)
+    df["clean_text"] = df["text"].apply(clean_text)
+    emotions = emotion_targets(df, teacher_backend,
+                               cache_path=os.path.join(out_dir, "multitask_emotion_targets.npy"))
+
+    label_encoder = LabelEncoder()
+    sentiment = tf.keras.utils.to_categorical(label_encoder.fit_transform(df["sentiment"]))
+    train, val, test = split_frame(df)
+
+    tokenizer = Tokenizer(num_words=MAX_NUM_WORDS, oov_token="<OOV>")
+    tokenizer.fit_on_texts(train["clean_text"])
+
+    def arrays(part):
+        tokens = pad_sequences(tokenizer.texts_to_sequences(part["clean_text"]),
+                               maxlen=MAX_SEQUENCE_LENGTH, padding="post")
+        return tokens, {'sentiment': sentiment[part.index], 'emotion': emotions[part.index]}
+
+    model = build_multitask_model(len(label_encoder.classes_))
+    model.compile(
+        optimizer="adam",
+        loss={'sentiment': "categorical_crossentropy", 'emotion': "categorical_crossentropy"},
+        loss_weights={'sentiment': 1.0, 'emotion': emotion_weight},
+        metrics={'sentiment': ["accuracy"], 'emotion': ["categorical_accuracy"]},
+    )
+    early_stop = tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=2, restore_best_weights=True)
+    x_train, y_train = arrays(train)
+    model.fit(x_train, y_train, validation_data=arrays(val), epochs=epochs, batch_size=batch_size,
+              callbacks=[early_stop], verbose=1)
+
+    x_test, y_test = arrays(test)
+    predictions = model.predict(x_test, batch_size=256, verbose=0)
+    metrics = {
+        'sentiment_accuracy': float(np.mean(
+            predictions['sentiment'].argmax(axis=1) == y_test['sentiment'].argmax(axis=1))),
+        'emotion_top1_agreement': float(np.mean(
+            predictions['emotion'].argmax(axis=1) == y_test['emotion'].argmax(axis=1))),
+    }
+    logger.info("✅ Test sentiment accuracy %.4f, emotion top-1 agreement %.4f",
+                metrics['sentiment_accuracy'], metrics['emotion_top1_agreement'])
+
+    os.makedirs(out_dir, exist_ok=True)
+    model.save(os.path.join(out_dir, MODEL_FILE))
+    with open(os.path.join(out_dir, TOKENIZER_FILE), "wb") as f:
+        pickle.dump(tokenizer, f)
+    with open(os.path.join(out_dir, LABEL_ENCODER_FILE), "wb") as f:
+        pickle.dump(label_encoder, f)
+    return metrics
+
+
+@lru_cache(maxsize=None)
+def load_multitask_model(model_dir=None):
+    """
+    Load the multi-task model with its tokenizer and label encoder.
+
+    Args:
+        model_dir (str): Directory written by train_multitask; defaults to
+            MULTITASK_MODEL_DIR or the current directory
+
+    Returns:
+        (model, tokenizer, label_encoder)
+    """
+    import tensorflow as tf
+
+    model_dir = model_dir or os.environ.get(MODEL_DIR_ENV, ".")
+    logger.info("🧠 Loading multi-task text model from %s", model_dir)
+    model = tf.keras.models.load_model(os.path.join(model_dir, MODEL_FILE))
+    with open(os.path.join(model_dir, TOKENIZER_FILE), "rb") as f:
+        tokenizer = pickle.load(f)
+    with open(os.path.join(model_dir, LABEL_ENCODER_FILE), "rb") as f:
+        label_encoder = pickle.load(f)
+    return model, tokenizer, label_encoder
+
+
+def predict_multitask_batch(texts, model_dir=None):
+    """
+    Sentiment and emotions for many texts from one tokenization and one forward pass.
+
+    Both heads only see clean_text output, so results are memoized on it (see memo.py).
+
+    Args:
+        texts (list): Raw texts
+        model_dir (str): See load_multitask_model
+
+    Returns:
+        predictions (list): Per text {'sentiment': (label, probability),
+            'emotions': [{'label', 'score'}, ...] sorted by score, like the emotion pipeline}
+    """
+    if not texts:
+        return []
+    model_dir = model_dir or os.environ.get(MODEL_DIR_ENV, ".")
+    memo = get_memo("multitask", normalize=clean_text)
+    results = memo.get_or_compute_many(list(texts), lambda batch: _predict(batch, model_dir),
+                                       extra=os.path.abspath(model_dir))
+    return [{'sentiment': tuple(r['sentiment']), 'emotions': r['emotions']} for r in results]
+
+
+def _predict(texts, model_dir):
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+    model, tokenizer, label_encoder = load_multitask_model(model_dir)
+    seq = tokenizer.texts_to_sequences([clean_text(t) for t in texts])
+    pad = pad_sequences(seq, maxlen=MAX_SEQUENCE_LENGTH, padding="post")
+    outputs = model.predict(pad, batch_size=len(texts), verbose=0)
+    results = []
+    for sentiment, emotion in zip(outputs['sentiment'], outputs['emotion']):
+        label_id = int(np.argmax(sentiment))
+        emotions = sorted(({'label': label, 'score': float(score)} for label, score in zip(EMOTION_LABELS, emotion)),
+                          key=lambda e: e['score'], reverse=True)
+        results.append({'sentiment': [str(label_encoder.classes_[label_id]), float(sentiment[label_id])],
+                        'emotions': emotions})
+    return results
+
+
+def predict_multitask(text, model_dir=None):
+    """Sentiment and emotions for one text (see predict_multitask_batch)."""
+    return predict_multitask_batch([text], model_dir)[0]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Train or query the shared-encoder sentiment + emotion model")
+    parser.add_argument("--train", metavar="CSV", help='Train on this CSV (e.g. "Combined Data.csv")')
+    parser.add_argument("--out-dir", default=os.environ.get(MODEL_DIR_ENV, "."))
+    parser.add_argument("--emotion-weight", type=float, default=0.5)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--teacher-backend", default=None, help="Emotion backend used to label the CSV")
+    parser.add_argument("text", nargs="*", help="Texts to classify")
+    args = parser.parse_args()
+    from script_logging import configure_script_logging
+
+    configure_script_logging()
+
+    if args.train:
+        print(json.dumps(train_multitask(args.train, args.out_dir, args.emotion_weight, args.epochs,
+                                         teacher_backend=args.teacher_backend), indent=2))
+    texts = args.text or ["I feel like dying and have no hope."]
+    for text, prediction in zip(texts, predict_multitask_batch(texts, args.out_dir)):
+        print(text)
+        print(json.dumps(prediction, indent=2))
@@ -1,19 +1,38 @@
+import os
 import random
-from elevenlabs import ElevenLabs
-import google.generativeai as genai
+import time
+from collections import Counter
+from functools import lru_cache
 
 # --- CONFIG ---
-ELEVENLABS_API_KEY = "better_luck_next_time"
-GEMINI_API_KEY = "better_luck_next_time"
+# Keys come from the environment (.env); clients are created on first use
+ELEVENLABS_API_KEY_ENV = "ELEVENLABS_API_KEY"
+GEMINI_API_KEY_ENV = "GEMINI_API_KEY"
+GEMINI_MODEL = "gemini-2.5-pro"
 
-# Initialize ElevenLabs client
-eleven_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-genai.configure(api_key=GEMINI_API_KEY)
+def _require_key(name):
+    key = os.environ.get(name)
+    if not key:
+        raise RuntimeError(f"{name} is not set; add it to your environment or .env file")
+    return key
+
+# ElevenLabs client
+@lru_cache(maxsize=None)
+def get_eleven_client():
+    from elevenlabs import ElevenLabs
+
+    return ElevenLabs(api_key=_require_key(ELEVENLABS_API_KEY_ENV))
+
+@lru_cache(maxsize=None)
+def get_gemini_model():
+    import google.generativeai as genai
+
+    genai.configure(api_key=_require_key(GEMINI_API_KEY_ENV))
+    return genai.GenerativeModel(GEMINI_MODEL)
 
 # Gemini LLM wrapper
 def gemini_chat(prompt):
-    model = genai.GenerativeModel("gemini-2.5-pro")
-    response = model.generate_content(prompt)
+    response = get_gemini_model().generate_content(prompt)
     return response.text if response else "No response"
 
 # --- Mock Models ---
@@ -72,15 +91,162 @@ def process_audio(audio_path):
     agent = decide_agent(outputs)
     return agent, outputs
 
+# --- Cascade (cheap models first, Gemini only when needed) ---
+# Confidence gates; a stage decides on its own only when its signal clears the gate
+CASCADE_GATES = {
+    'sentiment': 0.90,   # LSTM confidence needed to exit after the first stage
+    'emotion': 0.75,     # emotion confidence needed to confirm the sentiment's agent
+    'combined': 0.80,    # mean local confidence needed to skip the LLM
+}
+CASCADE_LEVELS = ("sentiment", "emotion", "llm")
+
+# Local routing per model label (mock and real label sets)
+SENTIMENT_AGENTS = {
+    'suicidal': "EmergencyAgent",
+    'depression': "TherapistAgent",
+    'anxiety': "TherapistAgent",
+    'stress': "TherapistAgent",
+    'bipolar': "TherapistAgent",
+    'personality disorder': "TherapistAgent",
+    'normal': "ChatAgent",
+}
+EMOTION_AGENTS = {
+    'sad': "TherapistAgent", 'sadness': "TherapistAgent",
+    'fearful': "TherapistAgent", 'fear': "TherapistAgent",
+    'angry': "TherapistAgent", 'anger': "TherapistAgent",
+    'disgust': "TherapistAgent",
+    'happy': "ChatAgent", 'joy': "ChatAgent",
+    'neutral': "ChatAgent", 'surprise': "ChatAgent",
+}
+
+def process_audio_cascade(audio_path, gates=None, transcribe=mock_transcribe,
+                          sentiment_model=mock_sentiment_model, emotion_model=mock_emotion_model,
+                          tone_model=mock_tone_model, decide=decide_agent):
+    """
+    Route a user with the cheapest model whose signal is decisive.
+
+    1. Bi-LSTM sentiment: exits when its confidence clears gates['sentiment'].
+    2. Emotion transformer: exits when it agrees with the sentiment's agent, its
+       confidence clears gates['emotion'] and the mean of both clears gates['combined'].
+    3. Otherwise tone is added and Gemini decides (decide_agent).
+
+    Safety: a "Suicidal" sentiment is never routed away from EmergencyAgent
+    locally; below the first gate it always goes on to the next stages.
+
+    Args:
+        audio_path (str): Audio file
+        gates (dict): Overrides for CASCADE_GATES
+        transcribe, sentiment_model, emotion_model, tone_model, decide: Stage callables
+
+    Returns:
+        agent (str), outputs (dict): As process_audio, with 'exit_level' and
+            per-stage 'latency' (seconds); skipped stages are None
+    """
+    gates = {**CASCADE_GATES, **(gates or {})}
+    latency = {}
+
+    def timed(stage, func, *args):
+        start = time.perf_counter()
+        value = func(*args)
+        latency[stage] = time.perf_counter() - start
+        return value
+
+    text = timed('transcribe', transcribe, audio_path)
+    outputs = {"text": text, "sentiment": None, "emotion": None, "tone": None, "latency": latency}
+
+    sentiment = outputs['sentiment'] = timed('sentiment', sentiment_model, text)
+    sentiment_agent = SENTIMENT_AGENTS.get(str(sentiment[0]).lower())
+    if sentiment_agent and sentiment[1] >= gates['sentiment']:
+        outputs['exit_level'] = "sentiment"
+        return sentiment_agent, outputs
+
+    emotion = outputs['emotion'] = timed('emotion', emotion_model, text)
+    emotion_agent = EMOTION_AGENTS.get(str(emotion[0]).lower())
+    combined = (sentiment[1] + emotion[1]) / 2
+    if (sentiment_agent and sentiment_agent == emotion_agent and sentiment_agent != "EmergencyAgent"
+            and emotion[1] >= gates['emotion'] and combined >= gates['combined']):
+        outputs['exit_level'] = "emotion"
+        return sentiment_agent, outputs
+
+    outputs['tone'] = timed('tone', tone_model, audio_path)
+    agent = timed('llm', decide, outputs)
+    outputs['exit_level'] = "llm"
+    return agent, outputs
+
+def cascade_report(audio_paths, gates=None, **stages):
+    """
+    Run the cascade over a set of inputs and summarize where traffic exits.
+
+    Args:
+        audio_paths (list): Inputs to route
+        gates (dict): Overrides for CASCADE_GATES
+        **stages: Stage callables passed to process_audio_cascade
+
+    Returns:
+        report (dict): exit_fractions per level, mean_latency_s, mean_latency_by_level_s
+            (all zero / empty when there are no inputs)
+    """
+    exits = Counter()
+    totals = Counter()
+    n = 0
+    for audio_path in audio_paths:
+        _, outputs = process_audio_cascade(audio_path, gates=gates, **stages)
+        level = outputs['exit_level']
+        exits[level] += 1
+        totals[level] += sum(outputs['latency'].values())
+        n += 1
+    return {
+        'exit_fractions': {level: exits[level] / n if n else 0.0 for level in CASCADE_LEVELS},
+        'mean_latency_s': sum(totals.values()) / n if n else 0.0,
+        'mean_latency_by_level_s': {level: totals[level] / exits[level] for level in CASCADE_LEVELS if exits[level]},
+    }
+
+def _with_latency(func, seconds):
+    # Simulated stage cost for the offline cascade benchmark
+    def stage(*args):
+        time.sleep(seconds)
+        return func(*args)
+    return stage
+
 # --- Text-to-Speech ---
 def speak_text(text):
+    eleven_client = get_eleven_client()
     voices = eleven_client.list_voices()
     voice_id = voices[0].voice_id
     audio = eleven_client.generate(text=text, voice=voice_id)
     eleven_client.play(audio)
 
 # --- CLI ---
+def _fmt(result):
+    return "skipped" if result is None else f"{result[0]} (Confidence: {result[1]})"
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Agentic Audio AI Orchestration (Gemini + ElevenLabs)")
+    parser.add_argument("--cascade", action="store_true", help="Cheap models first; Gemini only when ambiguous")
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="Route N mock inputs with simulated stage costs and report exit levels")
+    for gate, value in CASCADE_GATES.items():
+        parser.add_argument(f"--{gate}-gate", type=float, default=value)
+    args = parser.parse_args()
+    gates = {gate: getattr(args, f"{gate}_gate") for gate in CASCADE_GATES}
+
+    if args.bench:
+        # Typical CPU costs: LSTM ~5 ms, DistilRoBERTa ~40 ms, Gemini round trip ~1.5 s
+        random.seed(0)
+        stages = {
+            'sentiment_model': _with_latency(mock_sentiment_model, 0.005),
+            'emotion_model': _with_latency(mock_emotion_model, 0.040),
+            'decide': _with_latency(lambda outputs: "TherapistAgent", 1.5),
+        }
+        report = cascade_report([f"mock_{i}.wav" for i in range(args.bench)], gates=gates, **stages)
+        for level, fraction in report['exit_fractions'].items():
+            print(f"Exit at {level:>9}: {fraction:6.1%}")
+        print(f"Mean latency: {report['mean_latency_s'] * 1000:.0f} ms "
+              f"(always-LLM: {(0.005 + 0.040 + 1.5) * 1000:.0f} ms)")
+        raise SystemExit(0)
+
     print("Agentic Audio AI Orchestration (Gemini + ElevenLabs)")
     print("Type 'quit' to exit.\n")
 
@@ -89,13 +255,18 @@ if __name__ == "__main__":
         if audio_path.lower() in ["quit", "exit", "q"]:
             break
 
-        agent, outputs = process_audio(audio_path)
+        if args.cascade:
+            agent, outputs = process_audio_cascade(audio_path, gates=gates)
+        else:
+            agent, outputs = process_audio(audio_path)
 
         print("\n--- Analysis ---")
         print(f"Transcribed Text: {outputs['text']}")
-        print(f"Sentiment: {outputs['sentiment'][0]} (Confidence: {outputs['sentiment'][1]})")
-        print(f"Emotion: {outputs['emotion'][0]} (Confidence: {outputs['emotion'][1]})")
-        print(f"Tone: {outputs['tone'][0]} (Confidence: {outputs['tone'][1]})")
+        print(f"Sentiment: {_fmt(outputs['sentiment'])}")
+        print(f"Emotion: {_fmt(outputs['emotion'])}")
+        print(f"Tone: {_fmt(outputs['tone'])}")
+        if 'exit_level' in outputs:
+            print(f"Decided at: {outputs['exit_level']}")
         print(f"Recommended Agent: {agent}\n")
 
         speak_text(f"Recommended agent is {agent}. User text: {outputs['text']}")
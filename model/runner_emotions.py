@@ -1,23 +1,31 @@
 import json
+import logging
 import warnings
+
+import numpy as np
 warnings.filterwarnings('ignore')
 
+# Silent by default; set DEPRESSION_VERBOSE=1 (or run as a script) for console output
+logger = logging.getLogger("depression.emotions")
+logger.addHandler(logging.NullHandler())
+
 try:
     from transformers import pipeline
     import torch
-    print("✅ Transformers imported successfully")
+    logger.debug("✅ Transformers imported successfully")
 except ImportError as e:
-    print(f"❌ Failed to import transformers: {e}")
-    print("Try: pip install transformers torch")
+    logger.error("❌ Failed to import transformers: %s (try: pip install transformers torch)", e)
     exit(1)
 
-# Load model once
-classifier = pipeline(
-    "text-classification",
-    model="j-hartmann/emotion-english-distilroberta-base",
-    top_k=None,
-    device=0 if torch.cuda.is_available() else -1
-)
+from emotion_backends import load_emotion_classifier, resolve_backend
+from memo import get_memo
+
+# Load model once (EMOTION_BACKEND=torch|int8|onnx selects the runtime)
+classifier = load_emotion_classifier()
+
+# Fixed label order for dense score matrices (the model's id2label order)
+EMOTION_LABELS = ('anger', 'disgust', 'fear', 'joy', 'neutral', 'sadness', 'surprise')
+_LABEL_INDEX = {label: i for i, label in enumerate(EMOTION_LABELS)}
 
 emoji_map = {
     'joy': '😊',
@@ -29,41 +37,47 @@ emoji_map = {
     'neutral': '😐'
 }
 
-def classify_emotion(text):
-    """Classify emotions in a given text chunk."""
+def _classify(text):
     emotions = classifier(text)
     # Sort by confidence
     sorted_emotions = sorted(emotions[0], key=lambda x: x['score'], reverse=True)
     return sorted_emotions
 
+def classify_emotion(text):
+    """Classify emotions in a given text chunk (memoized, shared with emotions.classify_emotion)."""
+    return get_memo("emotion").get_or_compute(text, _classify, extra=resolve_backend())
+
+def log_emotion_bars(emotions):
+    """Render per-emotion score bars; only in verbose (DEBUG) mode."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    lines = ["🎭 Emotion Analysis Results:"]
+    for emotion in emotions:
+        confidence = emotion['score']
+        label = emotion['label']
+        emoji = emoji_map.get(label, '❓')
+        bar_length = int(confidence * 20)
+        bar = '█' * bar_length + '░' * (20 - bar_length)
+        lines.append(f"{emoji} {label.capitalize():>8}: {confidence:.4f} |{bar}|")
+    logger.debug("\n".join(lines))
+
 def run_on_json(json_path):
     """Run emotion classification on all chunks in the given JSON file."""
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    print(f"\n📄 Processing Transcript ID: {data['transcriptId']}\n")
+    logger.info("📄 Processing Transcript ID: %s", data['transcriptId'])
     results = []
 
     for chunk in data['chunks']:
         text = chunk['text']
         chunk_id = chunk['id']
 
-        print("="*60)
-        print(f"📝 Analyzing Chunk ID: {chunk_id} (timestamp: {chunk['timestamp']})")
-        print(f"Text: {text}\n")
+        logger.debug("📝 Analyzing Chunk ID: %s (timestamp: %s)\nText: %s",
+                     chunk_id, chunk['timestamp'], text)
 
         emotions = classify_emotion(text)
-
-        # Print bar-like result
-        print("🎭 Emotion Analysis Results:")
-        print("-" * 30)
-        for emotion in emotions:
-            confidence = emotion['score']
-            label = emotion['label']
-            emoji = emoji_map.get(label, '❓')
-            bar_length = int(confidence * 20)
-            bar = '█' * bar_length + '░' * (20 - bar_length)
-            print(f"{emoji} {label.capitalize():>8}: {confidence:.4f} |{bar}|")
+        log_emotion_bars(emotions)
 
         # Save results
         results.append({
@@ -71,11 +85,112 @@ def run_on_json(json_path):
             "text": text,
             "emotions": emotions
         })
-        print()
 
     return results
 
+def emotion_matrix(texts, batch_size=8):
+    """
+    Classify many chunks in one batched call (memo misses only).
+
+    Args:
+        texts (list): Chunk texts
+        batch_size (int): Pipeline batch size
+
+    Returns:
+        scores (np.array): (n_chunks x 7) float32, columns in EMOTION_LABELS order
+    """
+    scores = np.zeros((len(texts), len(EMOTION_LABELS)), dtype=np.float32)
+    if not texts:
+        return scores
+    def classify_batch(batch):
+        return [sorted(emotions, key=lambda x: x['score'], reverse=True)
+                for emotions in classifier(batch, batch_size=batch_size)]
+
+    # Repeated chunks (boilerplate, re-saved entries) come from the memo; only misses hit the model
+    results = get_memo("emotion").get_or_compute_many(list(texts), classify_batch, extra=resolve_backend())
+    for row, emotions in enumerate(results):
+        for e in emotions:
+            scores[row, _LABEL_INDEX[e['label']]] = e['score']
+    return scores
+
+def _chunk_duration(chunk):
+    """Chunk duration in seconds when the transcript carries timing, else None."""
+    if 'duration' in chunk:
+        return float(chunk['duration'])
+    if 'startTime' in chunk and 'endTime' in chunk:
+        return float(chunk['endTime']) - float(chunk['startTime'])
+    return None
+
+def pool_emotions(scores, word_counts, durations=None):
+    """
+    Transcript-level emotions from a chunk score matrix.
+
+    Args:
+        scores (np.array): (n_chunks x 7) matrix from emotion_matrix
+        word_counts (list): Words per chunk
+        durations (list): Seconds per chunk; word counts are used when unknown
+            (constant speaking rate)
+
+    Returns:
+        pooled (dict): word_weighted, duration_weighted and max score vectors (float32)
+    """
+    if len(scores) == 0:
+        empty = np.zeros(len(EMOTION_LABELS), dtype=np.float32)
+        return {'word_weighted': empty, 'duration_weighted': empty, 'max': empty}
+
+    words = np.asarray(word_counts, dtype=np.float32)
+    seconds = words if durations is None else np.asarray(durations, dtype=np.float32)
+
+    def weighted(weights):
+        total = weights.sum()
+        if total <= 0:
+            return scores.mean(axis=0)
+        return (weights @ scores) / total
+
+    return {
+        'word_weighted': weighted(words).astype(np.float32),
+        'duration_weighted': weighted(seconds).astype(np.float32),
+        'max': scores.max(axis=0),
+    }
+
+def run_on_json_dense(json_path, batch_size=8, decimals=4):
+    """
+    Run emotion classification on all chunks and return a compact dense result.
+
+    Instead of a sorted {label, score} list per chunk, scores are one row per
+    chunk in the fixed EMOTION_LABELS column order, plus transcript-level pooled
+    vectors so clients don't need to scan chunks.
+
+    Returns:
+        result (dict): transcriptId, labels, chunk_ids, scores (n_chunks x 7),
+            word_counts, pooled {word_weighted, duration_weighted, max}, top_emotion
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    chunks = data['chunks']
+    logger.info("📄 Processing Transcript ID: %s (%d chunks)", data['transcriptId'], len(chunks))
+    scores = emotion_matrix([chunk['text'] for chunk in chunks], batch_size=batch_size)
+
+    word_counts = [chunk.get('wordCount', len(chunk['text'].split())) for chunk in chunks]
+    durations = [_chunk_duration(chunk) for chunk in chunks]
+    pooled = pool_emotions(scores, word_counts, None if None in durations else durations)
+
+    word_weighted = pooled['word_weighted']
+    return {
+        'transcriptId': data['transcriptId'],
+        'labels': list(EMOTION_LABELS),
+        'chunk_ids': [chunk['id'] for chunk in chunks],
+        'scores': np.round(scores, decimals).tolist(),
+        'word_counts': word_counts,
+        'pooled': {name: np.round(vector, decimals).tolist() for name, vector in pooled.items()},
+        'top_emotion': EMOTION_LABELS[int(np.argmax(word_weighted))] if len(chunks) else None,
+    }
+
 if __name__ == "__main__":
+    from script_logging import configure_script_logging
+
+    configure_script_logging()
     json_file_path = "test.json"   # 👈 Use test.json
     final_results = run_on_json(json_file_path)
 
@@ -83,3 +198,8 @@ if __name__ == "__main__":
     with open("emotion_results.json", 'w', encoding='utf-8') as f:
         json.dump(final_results, f, indent=4, ensure_ascii=False)
     print("\n✅ All chunks processed. Results saved to 'emotion_results.json'")
+
+    # Dense matrix + transcript-level pooled emotions
+    with open("emotion_matrix.json", 'w', encoding='utf-8') as f:
+        json.dump(run_on_json_dense(json_file_path), f, ensure_ascii=False)
+    print("✅ Dense scores saved to 'emotion_matrix.json'")
@@ -0,0 +1,23 @@
+import os
+import sys
+
+# The pipeline logging setup lives in backend/logs.py; the model scripts share it
+# so console output looks the same whichever directory a script is run from
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+from logs import configure_logging, env_verbose  # noqa: E402
+
+
+def configure_script_logging():
+    """
+    Console logging for a model script run from the command line.
+
+    Scripts are verbose by default; DEPRESSION_VERBOSE=0 limits output to
+    warnings and errors.
+
+    Returns:
+        logger (logging.Logger): The configured root pipeline logger
+    """
+    return configure_logging(verbose=env_verbose(default=True))
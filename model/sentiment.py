@@ -0,0 +1,102 @@
+import logging
+import os
+import pickle
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from memo import get_memo
+
+logger = logging.getLogger("depression.sentiment")
+logger.addHandler(logging.NullHandler())
+
+# Artifacts written by test.ipynb
+MODEL_DIR_ENV = "SENTIMENT_MODEL_DIR"
+MODEL_FILE = "mental_health_model.h5"
+TOKENIZER_FILE = "mental_health_model_tokenizer.pkl"
+LABEL_ENCODER_FILE = "mental_health_model_label_encoder.pkl"
+
+# Must match training (test.ipynb)
+MAX_SEQUENCE_LENGTH = 300
+
+
+def clean_text(text):
+    """Normalize text exactly as in training: lowercase, drop URLs, keep only letters."""
+    text = str(text).lower()
+    text = re.sub(r"http\S+", "", text)     # remove urls
+    text = re.sub(r"[^a-z\s]", " ", text)   # keep only letters
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+@lru_cache(maxsize=None)
+def load_sentiment_model(model_dir=None):
+    """
+    Load the Bi-LSTM mental-health classifier with its tokenizer and label encoder.
+
+    Args:
+        model_dir (str): Directory holding the .h5 model and the two .pkl files;
+            defaults to SENTIMENT_MODEL_DIR or the current directory
+
+    Returns:
+        (model, tokenizer, label_encoder)
+    """
+    import tensorflow as tf
+
+    model_dir = model_dir or os.environ.get(MODEL_DIR_ENV, ".")
+    logger.info("🧠 Loading sentiment LSTM from %s", model_dir)
+    model = tf.keras.models.load_model(os.path.join(model_dir, MODEL_FILE))
+    with open(os.path.join(model_dir, TOKENIZER_FILE), "rb") as f:
+        tokenizer = pickle.load(f)
+    with open(os.path.join(model_dir, LABEL_ENCODER_FILE), "rb") as f:
+        label_encoder = pickle.load(f)
+    return model, tokenizer, label_encoder
+
+
+def predict_sentiment_batch(texts, model_dir=None):
+    """
+    Classify many texts in one padded forward pass.
+
+    Results are memoized by a hash of clean_text(text); only misses reach the model.
+
+    Args:
+        texts (list): Raw texts
+        model_dir (str): See load_sentiment_model
+
+    Returns:
+        predictions (list): (label, probability) per text
+    """
+    if not texts:
+        return []
+    model_dir = model_dir or os.environ.get(MODEL_DIR_ENV, ".")
+    # The model only sees clean_text output, so texts with the same cleaned form share an entry
+    memo = get_memo("sentiment", normalize=clean_text)
+    results = memo.get_or_compute_many(list(texts), lambda batch: _predict(batch, model_dir),
+                                       extra=os.path.abspath(model_dir))
+    return [(label, probability) for label, probability in results]
+
+
+def _predict(texts, model_dir):
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+    model, tokenizer, label_encoder = load_sentiment_model(model_dir)
+    seq = tokenizer.texts_to_sequences([clean_text(t) for t in texts])
+    pad = pad_sequences(seq, maxlen=MAX_SEQUENCE_LENGTH, padding="post")
+    probs = model.predict(pad, batch_size=len(texts), verbose=0)
+    label_ids = np.argmax(probs, axis=1)
+    return [[str(label_encoder.classes_[i]), float(p[i])] for i, p in zip(label_ids, probs)]
+
+
+def predict_sentiment(text, model_dir=None):
+    """Classify one text; returns (label, probability)."""
+    return predict_sentiment_batch([text], model_dir)[0]
+
+
+if __name__ == "__main__":
+    from script_logging import configure_script_logging
+
+    configure_script_logging()
+    example = "I feel like dying and have no hope."
+    pred_label, pred_prob = predict_sentiment(example)
+    print("Predicted:", pred_label, "with probability:", pred_prob)
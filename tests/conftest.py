@@ -0,0 +1,9 @@
+import os
+import sys
+
+# backend/ and model/ are flat script directories whose modules import each other by name
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("backend", "model"):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from batch_scoring import check_parity, features_table, score_batch
+from risk_rules import default_rules
+
+
+def test_batch_matches_per_record_scoring_with_missing_cells():
+    assert check_parity(n=2000, seed=0, nan_fraction=0.1) == 0
+
+
+def test_dataframe_nan_cells_match_feature_table():
+    pd = pytest.importorskip("pandas")
+    rules = default_rules()
+    rows = [
+        {'f0_coeff_variation': np.nan, 'pitch_monotony_index': 0.9, 'voiced_ratio': np.nan,
+         'average_silence_duration': 2.0, 'speech_to_silence_ratio': np.nan},
+        {'f0_coeff_variation': 0.1, 'pitch_monotony_index': np.nan, 'voiced_ratio': 0.4,
+         'average_silence_duration': np.nan, 'speech_to_silence_ratio': 1.0},
+    ]
+    records = [{'acoustic_features': {k: row[k] for k in ('f0_coeff_variation', 'pitch_monotony_index', 'voiced_ratio')},
+                'silence_stats': {k: row[k] for k in ('average_silence_duration', 'speech_to_silence_ratio')}}
+               for row in rows]
+
+    frame = score_batch(pd.DataFrame(rows))
+    table = score_batch(features_table(records))
+    for i, record in enumerate(records):
+        single = rules.evaluate(record['acoustic_features'], record['silence_stats'])
+        assert rules.decode(frame['risk_factors'][i]) == single['risk_factors']
+        assert rules.decode(table['risk_factors'][i]) == single['risk_factors']
+        assert frame['overall_risk'][i] == single['overall_risk']
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+import pytest
+
+from batching import MicroBatcher
+
+
+def test_batches_concurrent_submits():
+    async def scenario():
+        batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch=8, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+        await batcher.aclose()
+        return results, batcher.metrics.snapshot()
+
+    results, metrics = asyncio.run(scenario())
+    assert results == [i * 2 for i in range(8)]
+    assert metrics['batch_size_histogram'] == {8: 1}
+
+
+def test_aclose_cancels_in_flight_and_queued_callers():
+    release = threading.Event()
+
+    def slow(items):
+        release.wait(5)
+        return items
+
+    async def scenario():
+        batcher = MicroBatcher(slow, max_batch=2, max_wait_ms=1)
+        # Two fill the in-flight batch, the third stays queued behind it
+        pending = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(batcher.aclose(), 1)
+        release.set()
+        outcomes = await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 1)
+        return outcomes
+
+    outcomes = asyncio.run(scenario())
+    assert all(isinstance(outcome, asyncio.CancelledError) for outcome in outcomes)
+
+
+def test_submit_raises_after_aclose():
+    async def scenario():
+        batcher = MicroBatcher(lambda items: items)
+        assert await batcher.submit("x") == "x"
+        await batcher.aclose()
+        with pytest.raises(RuntimeError):
+            await batcher.submit("y")
+
+    asyncio.run(scenario())
@@ -0,0 +1,29 @@
+import pytest
+
+import emotion_backends
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    calls = []
+    for name in ("_torch_pipeline", "_int8_pipeline", "_onnx_pipeline"):
+        monkeypatch.setattr(emotion_backends, name, lambda *args, name=name: calls.append((name, args)) or object())
+    monkeypatch.delenv(emotion_backends.BACKEND_ENV, raising=False)
+    emotion_backends._load_emotion_classifier.cache_clear()
+    yield calls
+    emotion_backends._load_emotion_classifier.cache_clear()
+
+
+def test_equivalent_arguments_share_one_classifier(loads):
+    load = emotion_backends.load_emotion_classifier
+    assert load(device=-1) is load("torch", device=-1) is load("TORCH", -1)
+    assert load("int8") is load("int8", device=0) is load("int8", onnx_quantize=False)
+    assert load("onnx", device=-1) is load("onnx", device=0)
+    assert [name for name, _ in loads] == ["_torch_pipeline", "_int8_pipeline", "_onnx_pipeline"]
+
+
+def test_distinct_settings_load_separately(loads):
+    load = emotion_backends.load_emotion_classifier
+    assert load("torch", device=-1) is not load("torch", device=0)
+    assert load("onnx") is not load("onnx", onnx_quantize=False)
+    assert len(loads) == 4
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from risk_rules import RiskRuleSet, default_rules
+
+
+def _inclusive_rules():
+    config = dict(default_rules().config)
+    flip = {'<': '<=', '>': '>='}
+    config['rules'] = [dict(rule, op=flip[rule['op']]) for rule in config['rules']]
+    return RiskRuleSet(config)
+
+
+@pytest.mark.parametrize("rules", [default_rules(), _inclusive_rules()], ids=["strict", "inclusive"])
+def test_single_record_path_matches_matrix_path(rules):
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        record = ({}, {})
+        for name, section in zip(rules.feature_names, rules.feature_sections):
+            sections = record[0] if section == 'acoustic_features' else record[1]
+            thresholds = rules.threshold[rules.rule_feature == rules.feature_names.index(name)]
+            sections[name] = rng.choice([None, np.nan, *thresholds, *rng.uniform(0, 3, 4)])
+
+        single = rules.evaluate(*record)
+        scores = rules.evaluate_matrix(rules.feature_vector(*record))
+        assert single['overall_risk'] == scores['overall_risk'][0]
+        assert single['risk_factors'] == rules.decode(scores['risk_factors'][0])
+        assert single['high_risk_count'] == scores['high_risk_count'][0]
+        assert single['moderate_risk_count'] == scores['moderate_risk_count'][0]
+        assert single['risk_score'] == pytest.approx(scores['risk_score'][0])
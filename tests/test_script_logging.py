@@ -0,0 +1,26 @@
+import logging
+
+import pytest
+
+from logs import ROOT_LOGGER, VERBOSE_ENV
+from script_logging import configure_script_logging
+
+
+@pytest.fixture
+def root_logger():
+    logger = logging.getLogger(ROOT_LOGGER)
+    saved = list(logger.handlers), logger.level, logger.propagate
+    yield logger
+    logger.handlers[:], logger.level, logger.propagate = saved
+
+
+@pytest.mark.parametrize("value, level", [(None, logging.DEBUG), ("1", logging.DEBUG), ("0", logging.WARNING)])
+def test_scripts_are_verbose_unless_disabled(root_logger, monkeypatch, value, level):
+    if value is None:
+        monkeypatch.delenv(VERBOSE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(VERBOSE_ENV, value)
+    assert configure_script_logging() is root_logger
+    assert root_logger.level == level
+    configure_script_logging()
+    assert sum(getattr(h, '_depression_handler', False) for h in root_logger.handlers) == 1